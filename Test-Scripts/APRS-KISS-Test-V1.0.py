@@ -1,34 +1,33 @@
 
+import os
+import sys
 import socket
 import time
 
-KISS_FEND = b'\xC0'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from aprspi.kiss import KISSDeframer, CMD_DATA
+from aprspi.ax25 import decode_ax25
 
 HOST = "127.0.0.1"
 PORT = 8001
 
-def decode_ax25(frame):
+def format_ax25(frame):
     try:
-        frame = frame[:-2]
-        dest = ''.join([chr(b >> 1) for b in frame[0:6]]).strip()
-        src = ''.join([chr(b >> 1) for b in frame[7:13]]).strip()
-        info = frame[16:].decode(errors='ignore')
-        return f"{src} > {dest} | {info}"
-    except Exception as e:
+        return str(decode_ax25(frame))
+    except ValueError as e:
         return f"Fehler beim Dekodieren: {e}"
 
 def read_kiss_frames(sock):
-    buffer = b''
+    deframer = KISSDeframer()
     sock.settimeout(1.0)
     last_keepalive = time.time()
 
     while True:
         try:
-            data = sock.recv(1024)
+            data = sock.recv(4096)
             if not data:
                 print("Verbindung geschlossen.")
                 break
-            buffer += data
 
             # Keep-alive alle 5 Sekunden
             if time.time() - last_keepalive > 5:
@@ -38,14 +37,9 @@ def read_kiss_frames(sock):
                     break
                 last_keepalive = time.time()
 
-            while KISS_FEND in buffer:
-                parts = buffer.split(KISS_FEND)
-                for i in range(len(parts) - 1):
-                    frame = parts[i + 1]
-                    if frame and frame[0] == 0x00:
-                        ax25 = frame[1:]
-                        print(decode_ax25(ax25))
-                buffer = parts[-1]
+            for frame in deframer.feed(data):
+                if frame.cmd == CMD_DATA:
+                    print(f"[Port {frame.port}] {format_ax25(frame.data)}")
 
         except socket.timeout:
             continue
@@ -58,13 +52,11 @@ def main():
         print("🔌 Verbinde zu KISS TCP auf 127.0.0.1:8001 ...")
         try:
             with socket.create_connection((HOST, PORT), timeout=5) as sock:
-                print("✅ Verbindung hergestellt. Warte auf APRS Frames...
-")
+                print("✅ Verbindung hergestellt. Warte auf APRS Frames...\n")
                 read_kiss_frames(sock)
         except Exception as e:
             print(f"❌ Verbindung fehlgeschlagen: {e}")
-        print("⏳ Neuer Versuch in 5 Sekunden...
-")
+        print("⏳ Neuer Versuch in 5 Sekunden...\n")
         time.sleep(5)
 
 if __name__ == "__main__":
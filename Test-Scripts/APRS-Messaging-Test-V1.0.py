@@ -0,0 +1,151 @@
+# Test der APRS-Nachrichten (aprspi/messaging.py)
+#
+# Eingehende Nachrichten mit automatischem Ack, Wiederholungen der
+# Gegenstelle nur einmal im Posteingang, eigene Nachrichten mit verkürztem
+# Wiederholungsplan bis Ack, Ablehnung oder Aufgeben, 1000 Nachrichten in
+# einem Heap ohne zusätzliche Threads und zum Schluss Ende zu Ende über
+# KISSListener und den simulierten TNC.
+#
+# Aufruf:  python3 APRS-Messaging-Test-V1.0.py
+
+import time
+import threading
+
+from testlib import check, wait_for, finish
+from aprspi.messaging import Messenger
+from aprspi.aprs import APRSPacket, decode_info
+from aprspi.ax25 import encode_ui, decode_ax25
+from aprspi.endpoints import KISSEndpoint
+from aprspi.listeners import KISSListener
+from aprspi.simulator import KISSServer
+
+MYCALL = "OE5ITH"
+
+class Collector:
+    # Statt KISSListener: merkt sich die Infofelder der gesendeten Frames
+    def __init__(self):
+        self.sent = []
+
+    def transmit(self, data, port=0, endpoint=None):
+        self.sent.append(decode_ax25(data).info.decode("latin-1"))
+
+def message(src, text):
+    return encode_ui(src, "APRS", (), text.encode("latin-1"))
+
+def packet(src, text):
+    return APRSPacket(decode_ax25(message(src, text)))
+
+def wait(messenger, until, timeout=5.0):
+    # run_due() wie im Messenger-Thread, aber im Test-Thread
+    end = time.monotonic() + timeout
+    while not until() and time.monotonic() < end:
+        time.sleep(min(messenger.run_due(), 0.01))
+    return until()
+
+def main():
+    print("=== APRS-Nachrichten ===\n")
+    results = []
+
+    # Eingang: Ack an den Absender, Digipeater-Kopie ohne Ack, Wiederholung nur gezählt
+    tnc = Collector()
+    messenger = Messenger(tnc, MYCALL)
+    now = time.time()
+    messenger.handle(packet("OE5XYZ-7", ":OE5ITH   :Hallo Linz{42"), now)
+    messenger.handle(packet("OE5XYZ-7", ":OE5ITH   :Hallo Linz{42"), now + 2)
+    messenger.handle(packet("OE5XYZ-7", ":OE5ITH   :Hallo Linz{42"), now + 35)
+    messenger.handle(packet("OE5XYZ-7", ":OE5ABC   :nicht für uns{43"))
+    messenger.handle(packet("OE5XYZ-7", ":OE5ITH   :ohne Nummer"))
+    print(f"  gesendet: {tnc.sent}")
+    results.append(check("Automatisches Ack je Aussendung", tnc.sent == [":OE5XYZ-7 :ack42"] * 2))
+    results.append(check("Wiederholung nur einmal im Posteingang", len(messenger.inbox) == 2
+                         and messenger.inbox[1].copies == 2 and messenger.retransmissions == 1
+                         and messenger.unread == 2))
+
+    # Reply-Ack "{MM}AA": Nachricht bekommt ack MM, unsere Nummer AA gilt als bestätigt
+    out = messenger.send("oe5xyz-7", "Antwort")
+    wait(messenger, lambda: out.tries == 1)
+    messenger.handle(packet("OE5XYZ-7", f":OE5ITH   :Danke{{7}}{out.msgno}"))
+    results.append(check("Reply-Ack", tnc.sent[-1] == ":OE5XYZ-7 :ack7" and out.state == "acked"))
+
+    # Ausgang mit verkürztem Plan: Wiederholungen bis zum Ack
+    tnc = Collector()
+    messenger = Messenger(tnc, MYCALL, schedule=(0.05, 0.1, 0.2))
+    out = messenger.send("OE5XYZ", "Test 1")
+    results.append(check("Info-Feld", out.info == ":OE5XYZ   :Test 1{1"
+                         and decode_info("message", "", out.info.encode())["msgno"] == "1"))
+    wait(messenger, lambda: out.tries == 2)
+    messenger.handle(packet("OE5XYZ", ":OE5ITH   :ack1"))
+    time.sleep(0.4)
+    messenger.run_due()
+    results.append(check("Ack beendet Wiederholungen", out.state == "acked" and out.tries == 2
+                         and tnc.sent == [out.info] * 2 and messenger.retries == 1))
+
+    # Ack von einer anderen Station zählt nicht, rej beendet
+    out = messenger.send("OE5XYZ", "Test 2")
+    messenger.handle(packet("OE5ABC", ":OE5ITH   :ack2"))
+    wait(messenger, lambda: out.tries == 1)
+    messenger.handle(packet("OE5XYZ", ":OE5ITH   :rej2"))
+    results.append(check("Fremdes Ack ignoriert, rej", out.state == "rejected"))
+
+    # Ohne Ack: alle Aussendungen nach Plan, dann gescheitert
+    out = messenger.send("OE5XYZ", "Test 3")
+    start = time.monotonic()
+    stamps = []
+    tries = 0
+    while out.state == "pending" and time.monotonic() - start < 3:
+        time.sleep(min(messenger.run_due(), 0.005))
+        if out.tries != tries:
+            tries = out.tries
+            stamps.append(time.monotonic() - start)
+    gaps = [round(b - a, 2) for a, b in zip(stamps, stamps[1:])]
+    print(f"  Abstände: {gaps}, gescheitert nach {time.monotonic() - start:.2f}s")
+    results.append(check("Abnehmende Wiederholrate, dann gescheitert", out.state == "failed" and out.tries == 3
+                         and all(abs(g - s) < 0.03 for g, s in zip(gaps, (0.05, 0.1)))))
+
+    # 1000 Nachrichten: ein Heap, kein Thread je Nachricht
+    tnc = Collector()
+    messenger = Messenger(tnc, MYCALL, schedule=(0.2, 0.4))
+    messenger.outbox_size = 2000
+    threads = threading.active_count()
+    messenger.start()
+    start = time.perf_counter()
+    sent = [messenger.send(f"OE{i % 10}AAA", f"Nr. {i}") for i in range(1000)]
+    while messenger.sent < 1000 and time.perf_counter() - start < 2:
+        time.sleep(0.001)
+    for m in sent[::2]:
+        messenger.handle(packet(m.addressee, f":OE5ITH   :ack{m.msgno}"))
+    busy = (time.perf_counter() - start) * 1000
+    during = threading.active_count()
+    time.sleep(1.0)
+    messenger.stop()
+    messenger.join(2)
+    print(f"  1000 Nachrichten eingereiht und 500 bestätigt in {busy:.0f}ms, {len(tnc.sent)} Aussendungen, "
+          f"{during - threads} zusätzlicher Thread")
+    results.append(check("Ein Thread für alle Wiederholungen", during == threads + 1
+                         and messenger.acked == 500 and messenger.failed == 500
+                         and len(tnc.sent) == 1000 + 500 and messenger.pending() == 0))
+
+    # Ende zu Ende mit Dupe-Fenster: Nachricht vom TNC, Digipeater-Kopie nach
+    # 0,5 s, Wiederholung der Gegenstelle nach 1 s (verkürzter ack_holdoff)
+    original = message("OE5XYZ-7", ":OE5ITH   :Funkcheck{A1")
+    digi = encode_ui("OE5XYZ-7", "APRS", ("OE5XBR-10",), b":OE5ITH   :Funkcheck{A1")
+    tnc = KISSServer(port=0, rate=2, frames=[original, digi, original], limit=3, split=False)
+    tnc.start()
+    listener = KISSListener(MYCALL, endpoints=[KISSEndpoint("direwolf", tnc.host, tnc.port)])
+    listener.messages = messenger = Messenger(listener, MYCALL, ack_holdoff=0.75)
+    listener.start()
+    wait_for(lambda: len(tnc.received) >= 2 and listener.dupes.duplicates >= 2, 5)
+    time.sleep(0.2)
+    listener.stop()
+    listener.join(3)
+    tnc.stop()
+    acks = [decode_ax25(f.data) for f in tnc.received]
+    results.append(check("Ack beim TNC angekommen", len(acks) == 2 and all(
+        str(a.src) == MYCALL and a.info == b":OE5XYZ-7 :ackA1" for a in acks)
+        and len(messenger.inbox) == 1 and messenger.inbox[0].text == "Funkcheck"
+        and messenger.retransmissions == 1 and listener.dupes.duplicates == 2))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
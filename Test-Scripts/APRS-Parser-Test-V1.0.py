@@ -0,0 +1,99 @@
+# Test des APRS-Parsers (aprspi/aprs.py) mit den Beispielen aus der
+# APRS-Spezifikation 1.0.1 und dem Reply-Ack-Zusatz
+#
+# Mic-E (Breite, Länge, Geschwindigkeit, Kurs, Höhe, Statusbits),
+# komprimierte Position mit Kurs/Geschwindigkeit, Objekte und Items mit
+# Lösch-Kennung, Telemetrie "T#", Nachrichten mit ack/rej und Reply-Ack.
+# Jedes Paket läuft als AX.25-Frame durch APRSPacket, also auch durch die
+# Klassifizierung über das Datentyp-Zeichen.
+#
+# Aufruf:  python3 APRS-Parser-Test-V1.0.py
+
+from testlib import check, finish
+from aprspi.aprs import APRSPacket
+from aprspi.ax25 import encode_ui, decode_ax25
+
+KNOTS = 1.852
+
+def packet(info, dest="APRS", src="OE5XYZ-9"):
+    return APRSPacket(decode_ax25(encode_ui(src, dest, (), info)))
+
+def near(a, b, eps=1e-4):
+    return a is not None and abs(a - b) < eps
+
+def position(data, lat, lon, symbol):
+    return near(data.get("lat"), lat) and near(data.get("lon"), lon) and data.get("symbol") == symbol
+
+def main():
+    print("=== APRS-Parser ===\n")
+    results = []
+
+    # Mic-E: Ziel "S32UVT" = 33°25.64' N, Nachrichtenbits 100 (M3 "Returning"),
+    # V = Längen-Offset +100, T = West; Info "(_f" = 112°07.74', "n" + '"' + "O"
+    # = 20 kn, Kurs 251° (Spezifikation Kap. 10), "j/" = Jeep
+    mice = packet(b'`(_fn"Oj/Hallo', dest="S32UVT")
+    data = mice.data
+    print(f"  Mic-E: {dict(data)}")
+    results.append(check("Mic-E Position", mice.kind == "mic-e"
+                         and position(data, 33 + 25.64 / 60, -(112 + 7.74 / 60), "/j")))
+    results.append(check("Mic-E Geschwindigkeit/Kurs", near(data["speed"], 20 * KNOTS) and data["course"] == 251
+                         and data["comment"] == "Hallo"))
+    results.append(check("Mic-E Nachrichtenbits", data["mice_status"] == "Returning"))
+
+    # Ohne gesetzte Nachrichtenbits (Ziffern 0-9) = Emergency; Höhe '"4T}' = 10061 - 10000 m
+    data = packet(b'`(_fn"Oj/"4T}', dest="332UVT").data
+    results.append(check("Mic-E ohne Nachrichtenbits, mit Höhe", data["mice_status"] == "Emergency"
+                         and position(data, 33 + 25.64 / 60, -(112 + 7.74 / 60), "/j")
+                         and data["alt"] == 61 and data["comment"] == ""))
+
+    # Komprimiert: 49°30' N, 72°45' W, Kurs 88°, 36,2 kn (Spezifikation Kap. 9)
+    compressed = packet(b"=/5L!!<*e7>7P[")
+    data = compressed.data
+    results.append(check("Komprimiert Position", compressed.kind == "position"
+                         and position(data, 49.5, -72.75, "/>") and data["messaging"]))
+    results.append(check("Komprimiert Kurs/Geschwindigkeit", data["course"] == 88
+                         and near(data["speed"] / KNOTS, 36.2, 0.05)))
+
+    # Objekt: "*" lebt, "_" gelöscht
+    alive = packet(b";LEADER   *092345z4903.50N/07201.75W>088/036").data
+    killed = packet(b";LEADER   _092345z4903.50N/07201.75W>088/036").data
+    results.append(check("Objekt", alive["name"] == "LEADER" and alive["alive"]
+                         and position(alive, 49 + 3.5 / 60, -(72 + 1.75 / 60), "/>")
+                         and alive["course"] == 88 and near(alive["speed"], 36 * KNOTS)))
+    results.append(check("Objekt gelöscht", killed["name"] == "LEADER" and not killed["alive"]))
+
+    # Item: "!" lebt, "_" gelöscht, Name mit Leerzeichen
+    item = packet(b")AID #2!4903.50N/07201.75WA")
+    killed = packet(b")AID #2_4903.50N/07201.75WA").data
+    results.append(check("Item", item.kind == "item" and item.data["name"] == "AID #2" and item.data["alive"]
+                         and position(item.data, 49 + 3.5 / 60, -(72 + 1.75 / 60), "/A")
+                         and killed["name"] == "AID #2" and not killed["alive"]))
+
+    # Telemetrie: Folgenummer, 5 Analogwerte, 8 Digitalbits
+    telemetry = packet(b"T#005,199,000,255,073,123,01101001")
+    results.append(check("Telemetrie", telemetry.kind == "telemetry" and telemetry.data["seq"] == "005"
+                         and telemetry.data["analog"] == (199, 0, 255, 73, 123)
+                         and telemetry.data["digital"] == "01101001"))
+
+    # Nachrichten, ack und rej
+    message = packet(b":WU2Z     :Testing{003").data
+    ack = packet(b":KB2ICI-14:ack003").data
+    rej = packet(b":KB2ICI-14:rej003").data
+    results.append(check("Nachricht", message["addressee"] == "WU2Z" and message["text"] == "Testing"
+                         and message["msgno"] == "003" and message["msg_type"] == "message"))
+    results.append(check("ack/rej", ack["addressee"] == "KB2ICI-14" and ack["msg_type"] == "ack"
+                         and ack["msgno"] == "003" and rej["msg_type"] == "rej" and rej["msgno"] == "003"))
+
+    # Reply-Ack: "{MM}AA" an der Nachricht, "ackMM}AA" als Bestätigung
+    reply = packet(b":WU2Z     :Testing{MM}AA").data
+    plain = packet(b":WU2Z     :Testing{MM}").data
+    reply_ack = packet(b":KB2ICI-14:ackMM}AA").data
+    results.append(check("Reply-Ack", reply["msgno"] == "MM" and reply["reply_ack"] == "AA"
+                         and reply["text"] == "Testing" and plain["msgno"] == "MM" and "reply_ack" not in plain
+                         and reply_ack["msg_type"] == "ack" and reply_ack["msgno"] == "MM"
+                         and reply_ack["reply_ack"] == "AA"))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# AX.25-Decoder Benchmark: chr(b >> 1)-Join aus V2.3 gegen aprspi.ax25.decode_ax25
+#
+# Aufruf:  python3 AX25-Benchmark-V1.0.py [anzahl_frames]
+
+import sys
+import time
+import random
+
+import testlib  # macht aprspi importierbar
+from aprspi.ax25 import decode_ax25, encode_ui, _CALL_TABLE
+
+PATHS = [(), ("WIDE2-1",), ("WIDE1-1", "WIDE2-1"), ("OE5XBR*", "WIDE2-1"), ("OE5XBR*", "OE5XUL*", "WIDE2*")]
+
+def synth_frames(count):
+    rnd = random.Random(7)
+    frames = []
+    for n in range(count):
+        info = b"!4812.34N/01412.34E>" + bytes(rnd.randrange(0x20, 0x7F) for _ in range(rnd.randrange(0, 40)))
+        frames.append(encode_ui(f"OE{n % 9 + 1}XYZ-{n % 16}", "APDW17", rnd.choice(PATHS), info))
+    return frames
+
+def legacy_decode(ax25):
+    # Nachbau aus KISSListener.run (V2.3), inkl. fester Offsets und FCS-Abschnitt
+    ax25 = ax25[:-2]
+    dest = ''.join([chr(b >> 1) for b in ax25[0:6]]).strip()
+    src = ''.join([chr(b >> 1) for b in ax25[7:13]]).strip()
+    info = ax25[16:].decode(errors='ignore').strip()
+    return src, dest, info
+
+def new_decode(ax25):
+    packet = decode_ax25(ax25)
+    return packet.src.call, packet.dest.call, packet.info
+
+def legacy_calls(ax25):
+    return [''.join([chr(b >> 1) for b in ax25[p:p + 6]]).strip() for p in range(0, 14, 7)]
+
+def table_calls(ax25):
+    text = ax25[:14].translate(_CALL_TABLE).decode("latin-1")
+    return [text[p:p + 6].rstrip() for p in range(0, 14, 7)]
+
+def run(label, func, frames):
+    start = time.perf_counter()
+    for frame in frames:
+        func(frame)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {len(frames) / elapsed:>10.0f} Frames/s  {elapsed / len(frames) * 1e6:6.2f} µs/Frame")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    frames = synth_frames(count)
+    print(f"{count} AX.25-Frames, {sum(len(f) for f in frames) / 1e6:.1f} MB\n")
+    print("Nur Rufzeichen (Ziel + Quelle):")
+    run("chr()-Join", legacy_calls, frames)
+    run("Tabelle", table_calls, frames)
+    print("\nKompletter Frame (V2.3: feste Offsets, V2.4: Pfad, SSIDs, H-Bits, Objekte):")
+    run("chr()-Join", legacy_decode, frames)
+    run("decode_ax25", new_decode, frames)
+
+    # Wie viele Info-Felder hat der alte Decoder falsch abgeschnitten?
+    wrong = sum(1 for f in frames if legacy_decode(f)[2] != decode_ax25(f).info.decode(errors='ignore').strip())
+    print(f"\nInfo-Feld mit alter Methode verfälscht: {wrong} von {count} Frames")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Test: sauberes Beenden mit und ohne --asyncio
+#
+# APRS-Pi läuft headless als eigener Prozess gegen den simulierten TNC und
+# gpsd, zeichnet GPX und das Paketlog auf, verteilt die Frames an einen
+# verbundenen KISS-Client (--fanout) und bekommt nach ein paar Sekunden
+# SIGINT wie bei Strg+C bzw. systemctl stop. Erwartet: Exitcode 0,
+# nichts auf stderr, eine vollständige GPX-Datei und ein lesbares Paketlog in
+# einer einzigen Datei. Die GPX-Punkte stehen bis zum Beenden nur im Puffer
+# (flush_interval 60 s), landen also nur dann auf der Karte, wenn
+# Monitor.stop() bis zu gpx.close() durchläuft.
+#
+# Aufruf:  python3 Asyncio-Shutdown-Test-V1.0.py
+
+import os
+import sys
+import time
+import signal
+import socket
+import tempfile
+import subprocess
+import xml.etree.ElementTree as ET
+
+from testlib import ROOT, check, wait_for, finish, free_port
+from aprspi.simulator import KISSServer, GpsdServer
+from aprspi.packetlog import read_log, log_files
+
+NS = {"g": "http://www.topografix.com/GPX/1/1"}
+
+def run(kiss, gpsd, extra):
+    directory = tempfile.mkdtemp(prefix="aprspi-stop-")
+    logs = tempfile.mkdtemp(prefix="aprspi-log-")
+    fanout = free_port()
+    proc = subprocess.Popen([sys.executable, "-m", "aprspi", "--mode", "headless", "--no-battery",
+                             "--kiss", f"{kiss.host}:{kiss.port}", "--gpsd", f"{gpsd.host}:{gpsd.port}",
+                             "--gpx", directory, "--log", logs, "--messages",
+                             "--fanout", f"127.0.0.1:{fanout}"] + extra,
+                            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    client = None
+
+    def connect():
+        nonlocal client
+        try:
+            client = socket.create_connection(("127.0.0.1", fanout))
+        except OSError:
+            return False
+        return True
+
+    wait_for(connect, 5, interval=0.1)
+    time.sleep(3)
+    proc.send_signal(signal.SIGINT)
+    try:
+        _, err = proc.communicate(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        _, err = proc.communicate()
+    if client is not None:
+        client.close()
+    points = 0
+    for name in os.listdir(directory):
+        try:
+            root = ET.parse(os.path.join(directory, name)).getroot()
+        except ET.ParseError:
+            continue
+        points += len(root.findall(".//g:trkpt", NS))
+    records = sum(1 for _ in read_log(logs))
+    return proc.returncode, err, points, records, len(log_files(logs))
+
+def main():
+    print("=== Beenden mit SIGINT ===\n")
+    results = []
+    kiss = KISSServer(port=0, rate=20)
+    kiss.start()
+    gpsd = GpsdServer(port=0, rate=10)
+    gpsd.start()
+    for label, extra in (("Threads", []), ("asyncio", ["--asyncio"])):
+        code, err, points, records, files = run(kiss, gpsd, extra)
+        print(f"  {label}: Exitcode {code}, {points} GPX-Punkte, {records} Frames in {files} Logdatei(en)")
+        if err.strip():
+            print("  " + err.strip().splitlines()[-1])
+        # Auch ohne Traceback nichts auf stderr (z. B. "Task was destroyed but it is pending!")
+        results.append(check(f"{label}: ohne Fehler beendet", code == 0 and not err.strip()))
+        results.append(check(f"{label}: GPX beim Beenden geschrieben", points > 0))
+        results.append(check(f"{label}: Paketlog geschlossen", records > 0 and files == 1))
+    kiss.stop()
+    gpsd.stop()
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+# Benchmark-Suite: Empfang, Dekodierung, Anzeige, Speicher, Start
+#
+# Misst in einem Lauf
+#   kiss       KISS-Deframing (Frames/s, MB/s) in 1024-Byte-Stücken
+#   decode     AX.25-Dekodierung und APRS-Parser je Frame
+#   latency    Bytes auf dem Socket bis Pixel auf dem Canvas (OLED-Dummy)
+#   render     Zeit je OLED-Seite auf dem luma-Dummy
+#   rss        Speicherbedarf (RSS) unter Dauerlast aus aprspi.simulator
+#   startup    Zeit bis zum ersten Frame je Modus (eigener Prozess)
+# und schreibt die Ergebnisse als JSON. Mit --compare werden zwei Läufe
+# (z.B. vor und nach einer Änderung, V2.4 gegen V2.5) gegenübergestellt;
+# Verschlechterungen über --threshold Prozent werden markiert.
+#
+# Aufruf:  python3 Benchmark-Suite-V1.0.py [--quick] [--only kiss,decode] [--out datei.json]
+#          python3 Benchmark-Suite-V1.0.py --compare alt.json [neu.json]
+
+import os
+import re
+import sys
+import time
+import json
+import socket
+import argparse
+import platform
+import datetime
+import threading
+import statistics
+import subprocess
+
+from testlib import ROOT
+from aprspi.kiss import KISSDeframer, kiss_frame
+from aprspi.ax25 import decode_ax25
+from aprspi.aprs import APRSPacket
+from aprspi.simulator import KISSServer, synth_frames
+
+# Standardablage der Ergebnisse, unabhängig vom aktuellen Verzeichnis (nicht im Git)
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark-results")
+
+# Kennzahlen mit diesen Endungen: größer ist besser, sonst kleiner ist besser
+HIGHER_IS_BETTER = ("_per_s", "_mb_s")
+
+
+def version():
+    # Oberster Abschnitt der Versionsübersicht, dazu der Git-Stand falls vorhanden
+    try:
+        with open(os.path.join(ROOT, "VERSION-HISTORY.txt"), encoding="utf-8") as f:
+            found = re.search(r"^(V\d+\.\d+)", f.read(), re.M)
+    except OSError:
+        found = None
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True).stdout.strip()
+    except OSError:
+        rev = ""
+    return found.group(1) if found else "?", rev
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return {
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95)] * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+def oled_renderer(kiss=None):
+    # Monitor ohne gestartete Listener, Sensorwerte einmal abgefragt
+    from aprspi.core import Monitor
+    from aprspi.render_oled import OLEDRenderer
+    monitor = Monitor(kiss=kiss)
+    monitor.setup_sampler()
+    return monitor, OLEDRenderer(monitor, dummy=True)
+
+
+# === Einzelne Messungen ===
+def bench_kiss(quick):
+    frames = synth_frames(1000)
+    data = b''.join(kiss_frame(f) for f in frames) * (20 if quick else 100)
+    count = len(frames) * (20 if quick else 100)
+    deframer = KISSDeframer()
+    view = memoryview(data)
+    start = time.perf_counter()
+    got = 0
+    for i in range(0, len(data), 1024):
+        got += len(deframer.feed(bytes(view[i:i + 1024])))
+    elapsed = time.perf_counter() - start
+    assert got == count, (got, count)
+    return {"frames_per_s": round(count / elapsed), "throughput_mb_s": round(len(data) / elapsed / 1e6, 2)}
+
+
+def bench_decode(quick):
+    frames = synth_frames(1000) * (20 if quick else 100)
+    start = time.perf_counter()
+    decoded = [decode_ax25(f) for f in frames]
+    t_ax25 = time.perf_counter() - start
+    start = time.perf_counter()
+    for frame in decoded:
+        APRSPacket(frame).data
+    t_aprs = time.perf_counter() - start
+    return {
+        "ax25_us": round(t_ax25 / len(frames) * 1e6, 2),
+        "aprs_us": round(t_aprs / len(frames) * 1e6, 2),
+        "frames_per_s": round(len(frames) / (t_ax25 + t_aprs)),
+    }
+
+
+def bench_latency(quick):
+    # Ein Frame nach dem anderen über ein Socketpaar in KISSListener.feed;
+    # on_packet zeichnet die Stationsseite, gemessen bis nach dem push()
+    monitor, renderer = oled_renderer()
+    listener = monitor.aprs
+    a, b = socket.socketpair()
+    done = threading.Event()
+    stamp = [0.0]
+
+    def on_packet(packet, own):
+        renderer.show(4)
+        stamp[0] = time.perf_counter()
+        done.set()
+
+    def reader():
+        while True:
+            data = b.recv(4096)
+            if not data:
+                return
+            listener.feed(data)
+
+    listener.on_packet = on_packet
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    samples = []
+    for frame in synth_frames(200 if quick else 1000):
+        done.clear()
+        start = time.perf_counter()
+        a.sendall(kiss_frame(frame))
+        if done.wait(2):
+            samples.append(stamp[0] - start)
+    a.close()
+    thread.join(2)
+    b.close()
+    return dict(percentiles(samples), frames=len(samples))
+
+
+def bench_render(quick):
+    monitor, renderer = oled_renderer()
+    for frame in synth_frames(100):
+        monitor.aprs.feed(kiss_frame(frame))
+    runs = 50 if quick else 300
+    result = {}
+    for page in range(renderer.pages):
+        renderer.show(page)
+        start = time.perf_counter()
+        for _ in range(runs):
+            renderer.show(page)
+        result[f"page{page + 1}_ms"] = round((time.perf_counter() - start) / runs * 1000, 3)
+    # Seitenwechsel: jeder Frame eine andere Seite, SPI-Bytes wie auf dem Pi
+    sent = renderer.renderer.bytes_sent
+    for i in range(runs):
+        renderer.show(i % renderer.pages)
+    result["rotate_bytes"] = round((renderer.renderer.bytes_sent - sent) / runs)
+    return result
+
+
+def bench_rss(quick, seconds=None, rate=2000):
+    # Simulator mit fester Rate, Listener und Scheduler wie im Betrieb
+    from aprspi.display import DisplayScheduler
+    seconds = seconds or (6 if quick else 60)
+    from aprspi.endpoints import KISSEndpoint
+    server = KISSServer(port=0, rate=rate)
+    server.start()
+    monitor, renderer = oled_renderer([KISSEndpoint(None, server.host, server.port)])
+    scheduler = DisplayScheduler(renderer.show, renderer.pages, rotate=renderer.rotate)
+    monitor.aprs.on_packet = scheduler.packet
+    monitor.aprs.start()
+    scheduler.start()
+    samples = []
+    start = time.monotonic()
+    while time.monotonic() - start < seconds:
+        time.sleep(0.5)
+        samples.append((time.monotonic() - start, rss_mb()))
+    monitor.aprs.stop()
+    scheduler.stop()
+    server.stop()
+    # Anstieg über die zweite Hälfte (nach dem Aufwärmen), lineare Regression
+    tail = samples[len(samples) // 2:]
+    mean_t = statistics.fmean(t for t, _ in tail)
+    mean_r = statistics.fmean(r for _, r in tail)
+    slope = (sum((t - mean_t) * (r - mean_r) for t, r in tail)
+             / (sum((t - mean_t) ** 2 for t, _ in tail) or 1))
+    return {
+        "rss_start_mb": round(samples[0][1], 1),
+        "rss_end_mb": round(samples[-1][1], 1),
+        "rss_max_mb": round(max(r for _, r in samples), 1),
+        "growth_mb_per_min": round(slope * 60, 2),
+        "frames": server.frames_sent,
+        "renders": scheduler.renders,
+    }
+
+
+STARTUP = {
+    "headless": ["--mode", "headless", "--no-battery", "--once"],
+    "console": ["--mode", "console", "--no-battery", "--once"],
+    "oled": ["--mode", "oled", "--dummy", "--no-battery", "--once"],
+}
+
+
+def bench_startup(quick):
+    runs = 3 if quick else 7
+    result = {}
+    for mode, args in STARTUP.items():
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-m", "aprspi"] + args, cwd=ROOT, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+        result[f"{mode}_ms"] = round(statistics.median(times) * 1000, 1)
+    return result
+
+
+BENCHMARKS = {
+    "kiss": bench_kiss,
+    "decode": bench_decode,
+    "latency": bench_latency,
+    "render": bench_render,
+    "rss": bench_rss,
+    "startup": bench_startup,
+}
+
+
+# === Vergleich ===
+def compare(old, new, threshold):
+    print(f"{'':<28} {old['version']:>12} {new['version']:>12}")
+    regressions = 0
+    for group, metrics in new["results"].items():
+        for name, value in metrics.items():
+            before = old["results"].get(group, {}).get(name)
+            if not isinstance(value, (int, float)) or not isinstance(before, (int, float)) or not before:
+                continue
+            change = (value - before) / abs(before) * 100
+            worse = -change if name.endswith(HIGHER_IS_BETTER) else change
+            # Speicheranstieg schwankt um 0, dort nur absolute Werte vergleichen
+            flag = ""
+            if worse > threshold and name not in ("frames", "renders", "growth_mb_per_min"):
+                flag = "  <- schlechter"
+                regressions += 1
+            print(f"{group + '.' + name:<28} {before:>12} {value:>12} {change:+7.1f} %{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="APRS Pi Benchmark-Suite")
+    parser.add_argument("--quick", action="store_true", help="kürzere Läufe (ca. 20 s statt 2 min)")
+    parser.add_argument("--only", help="Kommagetrennte Auswahl: " + ",".join(BENCHMARKS))
+    parser.add_argument("--out", help="JSON-Datei (Standard: benchmark-results/benchmark-VERSION-REV-DATUM.json)")
+    parser.add_argument("--compare", nargs="+", metavar="JSON", help="alt.json [neu.json] gegenüberstellen")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Verschlechterung in Prozent")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) == 2:
+        reports = []
+        for path in args.compare:
+            with open(path, encoding="utf-8") as f:
+                reports.append(json.load(f))
+        sys.exit(1 if compare(*reports, args.threshold) else 0)
+
+    release, rev = version()
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    report = {
+        "version": release,
+        "git": rev,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "quick": args.quick,
+        "results": {},
+    }
+    for name in names:
+        print(f"{name} ...", end=" ", flush=True)
+        start = time.perf_counter()
+        try:
+            result = BENCHMARKS[name](args.quick)
+        except ImportError as e:
+            # Ohne luma/PIL fehlen nur die Anzeige-Messungen
+            print(f"übersprungen ({e})")
+            continue
+        report["results"][name] = result
+        print(f"{time.perf_counter() - start:.1f} s  " + "  ".join(f"{k}={v}" for k, v in result.items()))
+
+    out = args.out
+    if not out:
+        os.makedirs(RESULTS, exist_ok=True)
+        out = os.path.join(RESULTS, f"benchmark-{release}-{rev or 'local'}-{datetime.date.today():%Y%m%d}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nErgebnis: {out}")
+    if args.compare:
+        print()
+        with open(args.compare[0], encoding="utf-8") as f:
+            sys.exit(1 if compare(json.load(f), report, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
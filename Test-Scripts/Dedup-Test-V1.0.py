@@ -0,0 +1,89 @@
+# Test der Duplikaterkennung (aprspi/dedup.py)
+#
+# Dasselbe Paket direkt und über zwei Digipeater gehört zählt einmal, die
+# Kopien landen als Pfad bei der Station. Nach dem Fenster gilt es wieder als
+# neu, der Speicher bleibt bei max_entries begrenzt. Dazu die Einbindung in
+# KISSListener.feed (Stationszähler, Paketlog, Verteiler) und die Zeit je
+# Prüfung.
+#
+# Aufruf:  python3 Dedup-Test-V1.0.py
+
+import time
+
+from testlib import check, finish
+from aprspi.ax25 import encode_ui, decode_ax25
+from aprspi.dedup import DupeCache, relayed_by
+from aprspi.kiss import kiss_frame
+from aprspi.listeners import KISSListener
+from aprspi.simulator import synth_frames
+
+def ui(path, info=b"!4814.12N/01418.30E>Test", src="OE5XYZ-9"):
+    return encode_ui(src, "APRS", path, info)
+
+class FakeLog:
+    def __init__(self):
+        self.frames = []
+
+    def append(self, data, port):
+        self.frames.append(data)
+
+class FakeFanout:
+    def __init__(self):
+        self.frames = []
+
+    def publish(self, endpoint, port, data):
+        self.frames.append(data)
+
+def main():
+    print("=== Duplikaterkennung ===\n")
+    results = []
+
+    direct = ui(("WIDE1-1", "WIDE2-1"))
+    via1 = ui(("OE5XBL-10*", "WIDE1*", "WIDE2-1"))
+    via2 = ui(("OE5XBL-10*", "WIDE1*", "OE5XOL*", "WIDE2*"))
+    results.append(check("Digipeater aus dem Pfad", relayed_by(decode_ax25(via2).path) == ("OE5XBL-10", "OE5XOL")))
+
+    cache = DupeCache(window=30.0)
+    counts = [cache.check(decode_ax25(f), now=t).count for f, t in ((direct, 0.0), (via1, 2.0), (via2, 3.5))]
+    results.append(check("Kopien über Digipeater erkannt", counts == [1, 2, 3] and cache.duplicates == 2))
+    other = cache.check(decode_ax25(ui(("WIDE1-1",), info=b">anderer Status")), now=4.0)
+    results.append(check("Anderer Inhalt ist neu", other.count == 1 and len(cache) == 2))
+    again = cache.check(decode_ax25(direct), now=31.0)
+    results.append(check("Nach dem Fenster wieder neu", again.count == 1 and len(cache) == 2))
+
+    small = DupeCache(window=30.0, max_entries=100)
+    frames = [decode_ax25(f) for f in synth_frames(1000)]
+    for f in frames:
+        small.check(f, now=1.0)
+    results.append(check("Speicher begrenzt", len(small) == 100 and small.evicted == 900))
+
+    # Einbindung in den Listener
+    listener = KISSListener("OE5ITH")
+    listener.log = FakeLog()
+    listener.fanout = fanout = FakeFanout()
+    packets = []
+    listener.on_packet = lambda packet, own: packets.append(packet)
+    for f in (direct, via1, via2):
+        listener.feed(kiss_frame(f))
+    station = listener.stations.get("OE5XYZ-9")
+    results.append(check("Einmal gezählt, Kopien als Pfad", station.count == 1 and station.duplicates == 2
+                         and station.digis == {"OE5XBL-10": 2, "OE5XOL": 1}))
+    results.append(check("Kein zweites Paket, kein zweiter Logeintrag", len(packets) == 1
+                         and listener.log.frames == [direct] and listener.stations.total == 1))
+    results.append(check("Verteiler bekommt jede Kopie", fanout.frames == [direct, via1, via2]))
+    results.append(check("Zähler je Kanal", listener.channel(listener.endpoints[0], 0).duplicates == 2))
+
+    # Zeit je Prüfung bei vollem Cache, ein Paket pro Takt
+    cache = DupeCache(window=30.0)
+    start = time.perf_counter()
+    for i in range(50):
+        for n, f in enumerate(frames):
+            cache.check(f, now=i * 10.0 + n * 0.01)
+    per = (time.perf_counter() - start) / (50 * len(frames)) * 1e6
+    print(f"  {per:.2f}µs je Prüfung, {len(cache)} Einträge")
+    results.append(check("Prüfung unter 5µs", per < 5))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Test des ereignisgesteuerten Display-Schedulers (aprspi/display.py)
+#
+# Läuft mit simulierter Uhr über step(now), ohne Display und ohne GPIO.
+# Zum Schluss ein Durchlauf im Thread mit echter Uhr: Latenz von
+# notify() bis zum Neuzeichnen.
+
+import time
+import threading
+
+from testlib import check, finish
+from aprspi.display import DisplayScheduler
+
+class Recorder:
+    def __init__(self):
+        self.pages = []
+        self.times = []
+
+    def __call__(self, page):
+        self.pages.append(page)
+        self.times.append(time.monotonic())
+
+def main():
+    print("=== Display-Scheduler ===\n")
+    results = []
+
+    render = Recorder()
+    display = DisplayScheduler(render, pages=5, rotate=10, hold=30, min_interval=0.25)
+    delay = display.step(0.0)
+    results.append(check("Erste Seite sofort", render.pages == [0] and delay == 10))
+
+    # Ohne Ereignisse: Seitenwechsel alle 10 s
+    for t in (10.0, 20.0, 30.0):
+        display.step(t)
+    results.append(check("Auto-Rotation alle 10 s", render.pages == [0, 1, 2, 3]))
+
+    # Eigenes Frame: sofort auf Seite 1 (Index 0) und dort 30 s stehen bleiben
+    display.packet(None, own=True)
+    display.step(31.0)
+    results.append(check("Eigenes Frame springt sofort auf Startseite", render.pages[-1] == 0))
+    renders = display.renders
+    display.step(45.0)
+    results.append(check("Seite bleibt nach eigenem Frame stehen", display.renders == renders))
+
+    # Paketflut: 200 Frames in 2 s -> höchstens ein Neuzeichnen je 0,25 s
+    renders = display.renders
+    t = 50.0
+    while t < 52.0:
+        display.packet(None, own=False)
+        display.step(t)
+        t += 0.01
+    display.step(52.5)
+    drawn = display.renders - renders
+    print(f"  200 Frames in 2 s -> {drawn} Neuzeichnungen")
+    results.append(check("Paketflut wird zusammengefasst", 1 <= drawn <= 9))
+
+    # Taster: jede Flanke schaltet weiter, auch wenn zwei im selben Fenster liegen
+    page = display.page
+    display.button(17)
+    display.step(53.0)
+    display.button(17)
+    display.button(17)
+    display.step(53.1)
+    display.step(53.3)
+    results.append(check("Drei Tastendrücke = drei Seiten weiter", display.page == (page + 3) % 5))
+    results.append(check("Nach Tastendruck keine Rotation für 30 s",
+                         display.step(60.0) > 20 and display.page == (page + 3) % 5))
+
+    # Fix-Wechsel zeichnet die aktuelle Seite neu
+    renders = display.renders
+    display.fix_changed(True)
+    display.step(61.0)
+    results.append(check("Fix-Wechsel zeichnet neu", display.renders == renders + 1))
+
+    # Echte Uhr im Thread: Latenz notify -> render
+    render = Recorder()
+    display = DisplayScheduler(render, pages=5, rotate=10, min_interval=0.05)
+    display.start()
+    time.sleep(0.1)
+    latencies = []
+    for _ in range(10):
+        count = len(render.times)
+        start = time.monotonic()
+        display.packet(None, own=True)
+        while len(render.times) == count:
+            time.sleep(0.001)
+        latencies.append(render.times[-1] - start)
+        time.sleep(0.06)
+    display.stop()
+    print(f"  Latenz Frame -> Anzeige: max {max(latencies) * 1000:.1f} ms (vorher bis 40 s)")
+    results.append(check("Neuzeichnen unter 100 ms", max(latencies) < 0.1))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Test des eingebauten gpsd-Clients (GPSListener) gegen einen lokalen Fake-gpsd
+#
+# Prüft ?WATCH, TPV/SKY/PPS-Auswertung, Fix-Alter, Meldungsrate sowie
+# Reconnect mit Backoff, wenn der Server wegfällt. Kein echtes gpsd nötig.
+
+import json
+import time
+import socket
+import threading
+
+from testlib import check, finish
+from aprspi.listeners import GPSListener
+
+TPV = {"class": "TPV", "device": "/dev/ttyS0", "mode": 3, "lat": 48.3069, "lon": 14.2858, "alt": 266.0}
+SKY = {"class": "SKY", "satellites": [{"PRN": 1, "used": True}, {"PRN": 2, "used": False}, {"PRN": 3, "used": True}]}
+PPS = {"class": "PPS", "real_sec": 1, "clock_sec": 1}
+
+class FakeGpsd(threading.Thread):
+    def __init__(self, rate=20):
+        super().__init__(daemon=True)
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+        self.rate = rate
+        self.watch = None
+        self.running = True
+
+    def run(self):
+        conn, _ = self.server.accept()
+        with conn:
+            conn.sendall(b'{"class":"VERSION","release":"3.22","proto_major":3,"proto_minor":14}\r\n')
+            self.watch = conn.recv(1024)
+            while self.running:
+                for report in (TPV, SKY, PPS):
+                    line = json.dumps(report).replace(", ", ",").replace(": ", ":")
+                    # Absichtlich in zwei TCP-Segmente geteilt
+                    data = (line + "\r\n").encode()
+                    try:
+                        conn.sendall(data[:17])
+                        conn.sendall(data[17:])
+                    except OSError:
+                        return
+                time.sleep(1 / self.rate)
+
+    def stop(self):
+        self.running = False
+        self.server.close()
+
+def main():
+    print("=== gpsd-Client gegen Fake-gpsd ===\n")
+    server = FakeGpsd()
+    server.start()
+    listener = GPSListener(port=server.port)
+    listener.start()
+    time.sleep(12)
+
+    results = [
+        check("?WATCH gesendet", server.watch is not None and server.watch.startswith(b'?WATCH=')),
+        check("TPV empfangen", listener.last_tpv is not None and listener.last_tpv.lat == TPV["lat"]),
+        check("SKY empfangen", listener.last_sky is not None
+              and sum(1 for s in listener.last_sky.satellites if s.used) == 2),
+        check("PPS empfangen", listener.last_pps is not None),
+        check(f"Fix-Alter {listener.fix_age:.2f}s", listener.fix_age is not None and listener.fix_age < 1),
+        check(f"Meldungsrate {listener.message_rate:.1f}/s", listener.message_rate > 30),
+        check("VERSION übersprungen", listener.stream.skipped >= 1),
+    ]
+
+    # Server weg: Client muss mit Backoff neu verbinden und darf dabei nicht rechnen
+    server.stop()
+    start = time.process_time()
+    time.sleep(4)
+    cpu = time.process_time() - start
+    results.append(check(f"Reconnects {listener.reconnects}", listener.reconnects >= 1))
+    results.append(check(f"CPU-Zeit ohne gpsd {cpu * 1000:.0f} ms in 4 s", cpu < 0.2))
+
+    # Zweiter Fake-gpsd (neuer Port): Listener muss sich wieder verbinden
+    server = FakeGpsd()
+    server.start()
+    listener.port = server.port
+    listener.backoff.reset()
+    time.sleep(5)
+    results.append(check("Wiederverbunden", listener.fix_age is not None and listener.fix_age < 1))
+    server.stop()
+    listener.stop()
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# Test der GPX-Aufzeichnung (aprspi/gpx.py)
+#
+# Simulierte Fahrt mit 1 Hz: 5 Minuten geradeaus, Rechtskurve, 2 Minuten
+# nach Süden, Stillstand mit GPS-Rauschen, Fixverlust, Weiterfahrt über
+# Mitternacht. Geprüft werden Punktzahl nach der Vereinfachung, Abweichung
+# vom Original, gültiges GPX nach jedem Schreiben, Segmente, Tageswechsel,
+# Fortsetzen nach Neustart und gebündelte Schreibvorgänge.
+#
+# Aufruf:  python3 GPX-Logger-Test-V1.0.py
+
+import os
+import math
+import random
+import tempfile
+import datetime
+import xml.etree.ElementTree as ET
+
+from testlib import check, finish
+from aprspi.gpx import GPXLogger
+from aprspi.gpsd import GPSReport
+from aprspi.geo import distance_bearing
+
+NS = {"g": "http://www.topografix.com/GPX/1/1"}
+START = datetime.datetime(2026, 10, 18, 23, 48, tzinfo=datetime.timezone.utc)
+
+def drive():
+    # (Sekunde, lat, lon) der simulierten Fahrt; Fixverlust = Lücke in den Sekunden
+    rng = random.Random(3)
+    lat, lon = 48.3069, 14.2858
+    t = 0
+    track = []
+
+    def move(seconds, speed, heading, noise=0.0):
+        nonlocal lat, lon, t
+        for _ in range(seconds):
+            step = speed + rng.gauss(0, noise)
+            lat += step * math.cos(math.radians(heading)) / 111195
+            lon += step * math.sin(math.radians(heading)) / (111195 * math.cos(math.radians(lat)))
+            t += 1
+            jitter = (rng.gauss(0, noise) / 111195, rng.gauss(0, noise) / 111195) if noise else (0, 0)
+            track.append((t, lat + jitter[0], lon + jitter[1]))
+
+    move(300, 15, 90)
+    move(120, 15, 180)
+    move(120, 0, 0, noise=1.5)
+    t += 60
+    move(300, 20, 45)
+    return track
+
+def tpv(t, lat, lon):
+    when = (START + datetime.timedelta(seconds=t)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    return GPSReport({"class": "TPV", "mode": 3, "time": when, "lat": lat, "lon": lon, "altMSL": 270.0})
+
+def points(path):
+    root = ET.parse(path).getroot()
+    return [[(float(p.get("lat")), float(p.get("lon"))) for p in seg.findall("g:trkpt", NS)]
+            for seg in root.iterfind(".//g:trkseg", NS)]
+
+def deviation(track, segments):
+    # Größter Abstand eines Originalpunkts zur vereinfachten Linie in Metern
+    # (ebene Näherung, für wenige km genau genug)
+    lat0 = track[0][1]
+
+    def xy(lat, lon):
+        return lon * 111195 * math.cos(math.radians(lat0)), lat * 111195
+
+    lines = [(xy(*a), xy(*b)) for seg in segments for a, b in zip(seg, seg[1:])]
+    worst = 0.0
+    for _, lat, lon in track:
+        px, py = xy(lat, lon)
+        best = float("inf")
+        for (ax, ay), (bx, by) in lines:
+            dx, dy = bx - ax, by - ay
+            u = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy or 1.0)))
+            best = min(best, math.hypot(px - ax - u * dx, py - ay - u * dy))
+        worst = max(worst, best)
+    return worst
+
+def main():
+    print("=== GPX-Aufzeichnung ===\n")
+    results = []
+    track = drive()
+    directory = tempfile.mkdtemp(prefix="aprspi-gpx-")
+    gpx = GPXLogger(directory, flush_points=20)
+    valid = True
+    for t, lat, lon in track:
+        gpx.add(tpv(t, lat, lon))
+        if gpx.flushes and t % 97 == 0 and gpx.path:
+            try:
+                points(gpx.path)
+            except ET.ParseError:
+                valid = False
+    gpx.close()
+    results.append(check("Datei nach jedem Schreiben gültiges GPX", valid))
+
+    files = sorted(os.listdir(directory))
+    print(f"  Dateien: {', '.join(files)}")
+    results.append(check("Eine Datei je UTC-Tag", files == ["track-20261018.gpx", "track-20261019.gpx"]))
+    day1, day2 = (points(os.path.join(directory, f)) for f in files)
+    kept = [p for seg in day1 + day2 for p in seg]
+    print(f"  {gpx.points_received} Fixes -> {len(kept)} Punkte, {gpx.bytes_written} Byte, "
+          f"{gpx.flushes} Schreibvorgänge, {gpx.fsyncs} fsync")
+    results.append(check("Vereinfachung unter 10 % der Punkte", len(kept) < gpx.points_received * 0.1
+                         and len(kept) == gpx.points_written))
+    corner = track[299]
+    results.append(check("Kurvenpunkt behalten", min(distance_bearing(corner[1], corner[2], a, b)[0]
+                                                       for a, b in kept) * 1000 < 20))
+    # Letzte Sekunde vor Tageswechsel und erster Punkt danach verbinden die Dateien
+    worst = deviation(track, day1 + [day1[-1][-1:] + day2[0]])
+    print(f"  größte Abweichung von der Linie: {worst:.1f} m")
+    results.append(check("Abweichung unter 25 m", worst < 25))
+    results.append(check("Fixverlust beginnt neues Segment", len(day1) == 2 and len(day2) == 1))
+    results.append(check("Gebündelt geschrieben", gpx.flushes <= len(kept) // 5 + 3 and gpx.fsyncs <= 3))
+
+    # Neustart am selben Tag: neues Segment in derselben Datei
+    path = os.path.join(directory, files[1])
+    before = points(path)
+    gpx = GPXLogger(directory)
+    for t, lat, lon in track[-10:]:
+        gpx.add(tpv(t + 30, lat + 0.01, lon))
+    gpx.close()
+    after = points(path)
+    results.append(check("Fortsetzung nach Neustart", after[:len(before)] == before and len(after) == len(before) + 1))
+
+    # Abgeschnittene Datei (Stromausfall) bleibt unangetastet
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 10)
+    gpx = GPXLogger(directory)
+    gpx.add(tpv(track[-1][0] + 60, 48.5, 14.5))
+    gpx.close()
+    results.append(check("Abgeschnittene Datei nicht überschrieben", os.path.basename(gpx.path) == "track-20261019-1.gpx"
+                         and len(points(gpx.path)[0]) == 1))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
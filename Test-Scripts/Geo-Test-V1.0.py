@@ -0,0 +1,90 @@
+# Test von Entfernung, Richtung und Umkreissuche (aprspi/geo.py)
+#
+# Vergleicht die Gitter-Abfragen "nächste N" und "im Umkreis R" mit einer
+# Berechnung über alle Stationen, prüft, dass erst eine echte Bewegung neu
+# rechnen lässt, und spielt Positionen und TPV durch Monitor/Listener.
+#
+# Aufruf:  python3 Geo-Test-V1.0.py
+
+import time
+import random
+
+from testlib import check, finish
+from aprspi.geo import GeoIndex, distance_bearing, compass
+from aprspi.gpsd import GPSReport
+from aprspi.core import Monitor
+from aprspi.ax25 import encode_ui
+from aprspi.kiss import kiss_frame
+
+LINZ = (48.3069, 14.2858)
+WIEN = (48.2082, 16.3738)
+
+def brute(stations, origin):
+    return sorted((distance_bearing(*origin, lat, lon)[0], call) for call, (lat, lon) in stations.items())
+
+def main():
+    print("=== Entfernung & Umkreis ===\n")
+    results = []
+
+    dist, bearing = distance_bearing(*LINZ, *WIEN)
+    print(f"  Linz -> Wien: {dist:.1f} km, {bearing:.1f}° {compass(bearing)}")
+    results.append(check("Haversine und Peilung", abs(dist - 155.0) < 0.5 and 90 < bearing < 100
+                         and compass(bearing) == "O"))
+
+    rng = random.Random(7)
+    stations = {f"OE{i}": (LINZ[0] + rng.uniform(-2, 2), LINZ[1] + rng.uniform(-3, 3)) for i in range(2000)}
+    geo = GeoIndex()
+    geo.set_origin(*LINZ)
+    for call, pos in stations.items():
+        geo.update(call, *pos)
+    # Einige Stationen verschwinden, einige ziehen um
+    for i in range(0, 2000, 7):
+        geo.remove(f"OE{i}")
+        del stations[f"OE{i}"]
+    for i in range(1, 2000, 11):
+        stations[f"OE{i}"] = (LINZ[0] + rng.uniform(-0.5, 0.5), LINZ[1] + rng.uniform(-0.5, 0.5))
+        geo.update(f"OE{i}", *stations[f"OE{i}"])
+    ref = brute(stations, LINZ)
+    near = geo.nearest(10)
+    results.append(check("Nächste 10 wie Vollsuche", [c for c, _, _ in near] == [c for _, c in ref[:10]]
+                         and all(abs(d - r) < 1e-6 for (_, d, _), (r, _) in zip(near, ref))))
+    inside = geo.within(25)
+    results.append(check("Umkreis 25 km wie Vollsuche", sorted(c for c, _, _ in inside)
+                         == sorted(c for d, c in ref if d <= 25)))
+    results.append(check("Peilung je Station", abs(near[0][2] - distance_bearing(*LINZ, *stations[near[0][0]])[1]) < 1e-6))
+
+    before = geo.recomputes
+    geo.set_origin(LINZ[0] + 0.001, LINZ[1])
+    results.append(check("Kleine Bewegung: nichts neu gerechnet", geo.recomputes == before))
+    geo.set_origin(*WIEN)
+    ref = brute(stations, WIEN)
+    results.append(check("Ortswechsel: alles neu gerechnet", geo.recomputes == before + 1
+                         and [c for c, _, _ in geo.nearest(5)] == [c for _, c in ref[:5]]))
+
+    start = time.perf_counter()
+    for i in range(200):
+        geo.set_origin(LINZ[0] + (i % 2), LINZ[1])
+    recompute = (time.perf_counter() - start) / 200 * 1e3
+    geo.set_origin(*LINZ)
+    start = time.perf_counter()
+    for _ in range(1000):
+        geo.nearest(8)
+    query = (time.perf_counter() - start) / 1000 * 1e6
+    print(f"  {len(geo)} Stationen: Neuberechnung {recompute:.3f} ms, nächste 8 in {query:.0f} µs")
+    results.append(check("Abfrage unter 1 ms", query < 1000))
+
+    # Monitor: Positionen aus Frames, eigene Position aus gpsd
+    monitor = Monitor("OE5ITH")
+    monitor.aprs.feed(kiss_frame(encode_ui("OE5ABC-9", "APRS", ("WIDE1-1",), b"!4812.49N/01622.43E>Wien")))
+    monitor.aprs.feed(kiss_frame(encode_ui("OE5DEF", "APRS", (), b"!4818.41N/01417.15E-Linz")))
+    results.append(check("Ohne Fix keine Entfernungen", monitor.geo.nearest(5) == []))
+    monitor.gps.handle_report(GPSReport({"class": "TPV", "mode": 3, "lat": LINZ[0], "lon": LINZ[1]}))
+    near = monitor.geo.nearest(5)
+    print("  " + ", ".join(f"{c} {d:.1f}km {compass(b)}" for c, d, b in near))
+    results.append(check("TPV setzt Standort, Stationen sortiert", [c for c, _, _ in near] == ["OE5DEF", "OE5ABC-9"]
+                         and near[0][1] < 1 and abs(near[1][1] - 155) < 1))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Test der Akku-Auswertung (aprspi/battery.py) ohne INA219
+#
+# add_sample() bekommt synthetische Messwerte wie vom Sampler: Ruhe bei
+# 3,9 V (Startwert aus der Spannung), 36 s Entladen mit 500 mA bei 10 Hz,
+# 300 s Laden mit 800 mA bei 1 Hz und zum Schluss kaum noch Ladestrom bei
+# voller Spannung. Geprüft werden die Coulomb-Zählung nach der Trapezregel,
+# der Ladezustand mit Neuanker bei 100 %, die Restlaufzeit, die gleitenden
+# Mittelwerte und der Verlauf für die Grafik.
+#
+# Aufruf:  python3 INA219-Battery-Test-V1.0.py
+
+from testlib import check, finish
+from aprspi.battery import INA219Battery, voltage_percent, MAX_GAP
+
+CAPACITY = 1000.0
+
+def near(a, b, eps=1e-6):
+    return a is not None and abs(a - b) < eps
+
+def main():
+    print("=== INA219-Akku ===\n")
+    results = []
+    battery = INA219Battery(None, window=10, capacity_mah=CAPACITY, history_len=4, history_interval=60.0)
+
+    # Ruhe: nach 10 Messungen (Fenster voll) Startwert aus der Spannung
+    for i in range(10):
+        battery.add_sample(3.9, 0.0, now=i / 10)
+    start = voltage_percent(3.9)
+    results.append(check("Startwert aus der Ruhespannung", near(battery.percent, start, 1e-4)
+                         and battery.charge_mah == 0.0 and battery.runtime_hours() is None))
+
+    # Entladen mit 500 mA, 10 Hz: nach 5 Messungen halbes Fenster
+    for k in range(5):
+        battery.add_sample(3.8, -500.0, now=(10 + k) / 10)
+    results.append(check("Gleitende Mittelwerte im halb gefüllten Fenster",
+                         near(battery.current, -250.0, 1e-3) and near(battery.voltage, 3.85, 1e-5)))
+    for k in range(5, 360):
+        battery.add_sample(3.8, -500.0, now=(10 + k) / 10)
+    # Trapez: erster Schritt (0 + -500) / 2 über 0,1 s, dann 359 x 500 mA über 0,1 s
+    discharged = (250 * 0.1 + 500 * 0.1 * 359) / 3600
+    end = start - discharged / CAPACITY * 100
+    print(f"  Entladen: {battery.charge_mah:.4f} mAh, {battery.percent:.4f}%, "
+          f"Restlaufzeit {battery.runtime_hours():.3f} h")
+    results.append(check("Coulomb-Zählung beim Entladen", near(battery.charge_mah, -discharged)
+                         and near(battery.percent, end, 1e-4)))
+    results.append(check("Mittelwerte und Restlaufzeit", near(battery.current, -500.0, 1e-3)
+                         and near(battery.voltage, 3.8, 1e-5)
+                         and near(battery.runtime_hours(), end / 100 * CAPACITY / 500, 1e-6)))
+
+    # Laden mit 800 mA, 1 Hz ab t=38 s (Übergang -500 -> 800 über 1,1 s)
+    expected = {}
+    for t in range(38, 338):
+        battery.add_sample(4.18, 800.0, now=float(t))
+        expected[t] = end + (150 * 1.1 + 800 * (t - 38)) / 3600 / CAPACITY * 100
+    print(f"  Geladen: {battery.percent:.4f}%, erwartet {expected[337]:.4f}%")
+    results.append(check("Coulomb-Zählung beim Laden, kein Anker bei hohem Ladestrom",
+                         near(battery.percent, expected[337], 1e-4) and battery.runtime_hours() is None))
+
+    # Lücke über MAX_GAP wird nicht integriert
+    before = battery.charge_mah
+    battery.add_sample(4.18, 800.0, now=337 + MAX_GAP + 1)
+    results.append(check("Lücke nicht integriert", battery.charge_mah == before))
+
+    # Voll: Spannung oben, Ladestrom unter 50 mA im ganzen Fenster -> 100 %, Zählung neu
+    for t in range(10):
+        battery.add_sample(4.19, 20.0, now=344.0 + t)
+        if t == 8:
+            # 9 von 10 Werten mit 20 mA, Mittel noch über 50 mA
+            results.append(check("Kein Anker vor vollem Fenster", battery.percent < 100.0))
+    print(f"  Voll: {battery.percent:.1f}%, {battery.charge_mah:.4f} mAh seit Anker")
+    results.append(check("Neuanker bei 100 %", battery.percent == 100.0 and battery.charge_mah == 0.0))
+
+    # Verlauf alle 60 s (t = 0, 60, ..., 300), Ring mit 4 Plätzen: die letzten vier, älteste zuerst
+    history = battery.history()
+    print(f"  Verlauf: {[round(p, 3) for p in history]}")
+    results.append(check("Verlauf", len(history) == 4
+                         and all(near(p, expected[t], 1e-4) for p, t in zip(history, (120, 180, 240, 300)))))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# KISS-Deframer Benchmark: alter split()-Puffer gegen aprspi.kiss.KISSDeframer
+#
+# Aufruf:  python3 KISS-Benchmark-V1.0.py [capture.kiss] [chunkgröße]
+# Ohne Capture-Datei wird ein synthetischer Mitschnitt (~4 MB) erzeugt.
+
+import sys
+import time
+import random
+
+import testlib  # macht aprspi importierbar
+from aprspi.kiss import KISSDeframer, kiss_frame
+
+def encode_call(call, last=False):
+    name, _, ssid = call.partition("-")
+    out = bytes((ord(c) << 1) for c in name.ljust(6))
+    return out + bytes((0x60 | (int(ssid or 0) << 1) | (1 if last else 0),))
+
+def synth_capture(size):
+    rnd = random.Random(42)
+    calls = [f"OE{n}ABC-{n % 16}" for n in range(1, 10)]
+    chunks = []
+    total = 0
+    while total < size:
+        info = bytes(rnd.randrange(0x20, 0x7F) for _ in range(rnd.randrange(20, 80)))
+        if rnd.random() < 0.2:
+            # Bytes, die im KISS-Strom escaped werden müssen
+            info += b'\xC0\xDB'
+        ax25 = (encode_call("APRS") + encode_call(rnd.choice(calls))
+                + encode_call("WIDE1-1") + encode_call("WIDE2-1", last=True)
+                + b'\x03\xF0' + info)
+        frame = kiss_frame(ax25)
+        chunks.append(frame)
+        total += len(frame)
+    return b''.join(chunks), len(chunks)
+
+def legacy_deframe(data, chunk):
+    # Nachbau der Schleife aus KISSListener.run (V2.3)
+    frames = 0
+    buffer = b''
+    for i in range(0, len(data), chunk):
+        buffer += data[i:i + chunk]
+        parts = buffer.split(b'\xC0')
+        for part in parts[:-1]:
+            if part and part[0] == 0x00:
+                frames += 1
+        buffer = parts[-1]
+    return frames
+
+def new_deframe(data, chunk):
+    deframer = KISSDeframer()
+    frames = 0
+    view = memoryview(data)
+    for i in range(0, len(data), chunk):
+        frames += len(deframer.feed(bytes(view[i:i + chunk])))
+    return frames
+
+def run(label, func, data, chunk):
+    start = time.perf_counter()
+    frames = func(data, chunk)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {frames:>8} Frames  {elapsed:7.3f} s  "
+          f"{frames / elapsed:>10.0f} Frames/s  {len(data) / elapsed / 1e6:6.1f} MB/s")
+
+def main():
+    chunk = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    if len(sys.argv) > 1 and sys.argv[1] != "-":
+        with open(sys.argv[1], "rb") as f:
+            data = f.read()
+        print(f"Capture: {sys.argv[1]} ({len(data) / 1e6:.1f} MB)")
+    else:
+        data, count = synth_capture(4 * 1024 * 1024)
+        print(f"Synthetischer Mitschnitt: {count} Frames, {len(data) / 1e6:.1f} MB")
+    print(f"Chunkgröße: {chunk} Byte\n")
+    run("split()", legacy_deframe, data, chunk)
+    run("Deframer", new_deframe, data, chunk)
+
+    # Rauschen ohne FEND: der alte Puffer wächst unbegrenzt und wird bei
+    # jedem recv() komplett neu durchsucht (quadratisch)
+    noise = bytes(random.Random(1).randrange(0x00, 0xC0) for _ in range(2 * 1024 * 1024))
+    print(f"\nRauschen ohne FEND: {len(noise) / 1e6:.1f} MB")
+    run("split()", legacy_deframe, noise, chunk)
+    run("Deframer", new_deframe, noise, chunk)
+
+if __name__ == "__main__":
+    main()
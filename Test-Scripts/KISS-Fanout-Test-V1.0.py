@@ -0,0 +1,160 @@
+# Test des KISS-Verteilers (aprspi/fanout.py)
+#
+# Ein Simulator spielt Direwolf, APRS-Pi hält die Verbindung und verteilt
+# die dekodierbaren Frames an mehrere Clients. Geprüft wird, dass schnelle
+# Clients alles in Reihenfolge bekommen, ein Client, der nie liest, Frames
+# verliert und getrennt wird, ohne den Empfang aufzuhalten, und dass Frames
+# von Clients beim TNC ankommen (0xFF = KISS-Modus verlassen wird geblockt).
+# Zum Schluss dasselbe in Kurzform mit asyncio.
+#
+# Aufruf:  python3 KISS-Fanout-Test-V1.0.py
+
+import time
+import socket
+import asyncio
+import threading
+
+from testlib import check, wait_for, finish
+from aprspi.simulator import KISSServer, synth_frames
+from aprspi.endpoints import KISSEndpoint
+from aprspi.listeners import KISSListener
+from aprspi.fanout import KISSFanout
+from aprspi.kiss import KISSDeframer, kiss_frame, CMD_RETURN
+from aprspi import aio
+
+FRAMES = 3000
+
+class Client(threading.Thread):
+    # Liest alle Frames vom Verteiler mit
+    def __init__(self, port):
+        super().__init__(daemon=True)
+        self.sock = socket.create_connection(("127.0.0.1", port))
+        self.frames = []
+
+    def run(self):
+        deframer = KISSDeframer()
+        try:
+            while True:
+                data = self.sock.recv(65536)
+                if not data:
+                    return
+                self.frames.extend(f.data for f in deframer.feed(data))
+        except OSError:
+            pass
+
+def slow_client(port):
+    # Kleiner Empfangspuffer und nie recv(): die Warteschlange läuft voll
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect(("127.0.0.1", port))
+    return sock
+
+def closed_by_peer(sock):
+    sock.settimeout(5)
+    try:
+        while sock.recv(65536):
+            pass
+        return True
+    except OSError:
+        return True
+    except socket.timeout:
+        return False
+
+def main():
+    print("=== KISS-Verteiler ===\n")
+    results = []
+
+    # Jedes 100. Frame ist kein AX.25 und darf nicht verteilt werden
+    frames = [b'kein ax25' if i % 100 == 99 else f for i, f in enumerate(synth_frames(FRAMES))]
+    valid = [f for f in frames if f != b'kein ax25']
+
+    # 2000 Frames/s: der Empfang läuft länger als max_stall
+    direwolf = KISSServer(port=0, rate=2000, frames=frames, limit=FRAMES)
+    direwolf.start()
+    listener = KISSListener("OE5ITH", endpoints=[KISSEndpoint("direwolf", direwolf.host, direwolf.port)])
+    # Erst verbinden, wenn alle Clients da sind: der Simulator startet bei Verbindung
+    listener.endpoints[0].retry_at = time.monotonic() + 1.0
+    fanout = KISSFanout(listener, port=0, max_queue=64, max_stall=0.5)
+    received = []
+    listener.on_packet = lambda packet, own: received.append(packet)
+    listener.start()
+    wait_for(lambda: fanout.port != 0, 5)
+
+    clients = [Client(fanout.port), Client(fanout.port)]
+    for c in clients:
+        c.start()
+    slow = slow_client(fanout.port)
+    wait_for(lambda: len(fanout.clients) == 3, 5)
+    # Auch der Sendepuffer auf Serverseite klein, sonst nimmt loopback alles auf
+    fanout.clients[2].sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    results.append(check("Drei Clients angenommen", fanout.accepted == 3))
+
+    wait_for(lambda: len(received) >= len(valid), 20)
+    wait_for(lambda: all(len(c.frames) >= len(valid) for c in clients), 10)
+    results.append(check("Empfang vollständig trotz langsamem Client", len(received) == len(valid)))
+    results.append(check("Schnelle Clients: alle Frames in Reihenfolge", all(c.frames == valid for c in clients)))
+    results.append(check("Ungültige Frames nicht verteilt", listener.frames_rejected == FRAMES // 100))
+    print(f"  verworfen für langsamen Client: {fanout.dropped}")
+    results.append(check("Langsamer Client verliert Frames", fanout.dropped > 0))
+    results.append(check("Langsamer Client getrennt", fanout.slow_disconnects == 1 and len(fanout.clients) == 2
+                         and closed_by_peer(slow)))
+    slow.close()
+
+    # Sendepfad: ein Client schickt eine Bake an den TNC
+    beacon = frames[0]
+    clients[0].sock.sendall(kiss_frame(beacon, 0) + kiss_frame(b'', 0x0F, CMD_RETURN))
+    wait_for(lambda: direwolf.received, 5)
+    time.sleep(0.2)
+    results.append(check("Client-Frame beim TNC angekommen", [f.data for f in direwolf.received] == [beacon]
+                         and listener.endpoints[0].frames_sent == 1))
+    results.append(check("KISS-Modus verlassen (0xFF) geblockt", fanout.tx_rejected == 1))
+
+    listener.stop()
+    listener.join(3)
+    results.append(check("Listener beendet, Clients getrennt", not listener.is_alive()
+                         and all(closed_by_peer(c.sock) for c in clients)))
+    direwolf.stop()
+
+    results.append(check("asyncio-Betrieb", asyncio.run(run_asyncio(frames))))
+
+    finish(results)
+
+async def run_asyncio(frames):
+    direwolf = KISSServer(port=0, rate=0, frames=frames, limit=500)
+    direwolf.start()
+    listener = KISSListener("OE5ITH", endpoints=[KISSEndpoint("direwolf", direwolf.host, direwolf.port)])
+    fanout = KISSFanout(listener, port=0)
+    server = asyncio.create_task(aio.fanout_task(fanout))
+    while fanout.port == 0:
+        await asyncio.sleep(0.01)
+    reader, writer = await asyncio.open_connection("127.0.0.1", fanout.port)
+    while not fanout.clients:
+        await asyncio.sleep(0.01)
+    kiss = asyncio.create_task(aio.kiss_task(listener))
+
+    deframer = KISSDeframer()
+    got = []
+    expected = [f for f in frames[:500] if f != b'kein ax25']
+    try:
+        while len(got) < len(expected):
+            data = await asyncio.wait_for(reader.read(65536), 10)
+            got.extend(f.data for f in deframer.feed(data))
+        writer.write(kiss_frame(frames[1], 0))
+        await writer.drain()
+        for _ in range(250):
+            if direwolf.received:
+                break
+            await asyncio.sleep(0.02)
+    except asyncio.TimeoutError:
+        pass
+    print(f"  asyncio: {len(got)} Frames verteilt, {len(direwolf.received)} gesendet")
+    ok = got == expected and [f.data for f in direwolf.received] == [frames[1]]
+    writer.close()
+    for task in (kiss, server):
+        task.cancel()
+    await asyncio.gather(kiss, server, return_exceptions=True)
+    direwolf.stop()
+    return ok
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# Test mehrerer KISS-Endpunkte in einem KISSListener (aprspi/endpoints.py)
+#
+# Zwei Simulatoren per TCP (einer mit zwei Funkkanälen wie Direwolf mit
+# zwei Radios) und ein pty als serieller TNC, dazu ein Endpunkt ohne
+# Gegenstelle. Geprüft wird, dass ein einziger Thread alle bedient, jedes
+# Frame mit Endpunkt und Kanal markiert ist, die Zähler je Kanal stimmen
+# und ein abgebrochener Endpunkt die anderen nicht aufhält. Unter asyncio
+# wartet der Reconnect wie im Thread mit dem Backoff des Endpunkts.
+#
+# Aufruf:  python3 KISS-Multi-Endpoint-Test-V1.0.py
+
+import os
+import asyncio
+import threading
+from collections import Counter
+
+from testlib import check, wait_for, finish, free_port
+from aprspi.simulator import KISSServer, synth_frames
+from aprspi.endpoints import KISSEndpoint, parse_endpoint
+from aprspi.listeners import KISSListener
+from aprspi.kiss import kiss_frame
+from aprspi import aio
+
+async def run_asyncio(frames):
+    # Wie KISSListener: Wartezeit je Endpunkt 1, 2, 4 ... s, nach gelesenen Daten wieder 1 s
+    tnc = KISSServer(port=0, rate=0, frames=frames, limit=len(frames))
+    tnc.start()
+    live = KISSEndpoint("live", tnc.host, tnc.port)
+    for _ in range(4):
+        # Wie nach mehreren Fehlversuchen: nächste Wartezeit 16 s
+        live.backoff.next()
+    gone = KISSEndpoint("weg", "127.0.0.1", free_port())
+    listener = KISSListener("OE5ITH", endpoints=[live, gone])
+    received = []
+    listener.on_packet = lambda packet, own: received.append(packet)
+    task = asyncio.create_task(aio.kiss_task(listener))
+    await asyncio.sleep(3.5)
+    failures = gone.connect_failures
+    tnc.stop()
+    await asyncio.sleep(3.5)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    return len(received), failures, live
+
+def main():
+    print("=== Mehrere KISS-Endpunkte ===\n")
+    results = []
+
+    results.append(check("Endpunkt-Syntax", all((
+        parse_endpoint("127.0.0.1:8001").port == 8001,
+        parse_endpoint("vhf=10.0.0.5:8001").name == "vhf",
+        parse_endpoint(":8002").host == "127.0.0.1",
+        parse_endpoint("/dev/ttyUSB0@1200").baud == 1200,
+        parse_endpoint("hf=/dev/pts/3").serial,
+    ))))
+
+    # Jeder Endpunkt eigene Frames, sonst fängt die Duplikaterkennung sie ab
+    frames = synth_frames(4220)
+    direwolf = KISSServer(port=0, rate=0, frames=frames[:3000], limit=3000, channels=2)
+    tnc2 = KISSServer(port=0, rate=0, frames=frames[3000:4000], limit=1000, seed=2)
+    frames = frames[4000:]
+    direwolf.start()
+    tnc2.start()
+    master, slave = os.openpty()
+    endpoints = [
+        KISSEndpoint("direwolf", direwolf.host, direwolf.port),
+        KISSEndpoint("tnc2", tnc2.host, tnc2.port),
+        KISSEndpoint("serial", device=os.ttyname(slave)),
+        KISSEndpoint("weg", "127.0.0.1", free_port()),
+    ]
+    listener = KISSListener("OE5ITH", endpoints=endpoints)
+    tags = Counter()
+    listener.on_packet = lambda packet, own: tags.update([(packet.endpoint, packet.channel)])
+    before = set(threading.enumerate())
+    listener.start()
+    # Erst schreiben, wenn der Listener das pty in den Rohmodus geschaltet hat
+    wait_for(lambda: endpoints[2].connected, 5)
+    new = [t for t in threading.enumerate() if t not in before and "process_request" not in t.name]
+    results.append(check("Ein Thread für alle Endpunkte", new == [listener]))
+
+    # Serieller TNC auf KISS-Port 3, in kleinen Stücken wie über eine UART
+    data = b''.join(kiss_frame(f, 3) for f in frames[:200])
+    for i in range(0, len(data), 50):
+        os.write(master, data[i:i + 50])
+    wait_for(lambda: sum(tags.values()) >= 4200, 20)
+    print("  " + ", ".join(f"{e}:{c}={n}" for (e, c), n in sorted(tags.items())))
+    results.append(check("Frames mit Endpunkt und Kanal markiert", tags == Counter(
+        {("direwolf", 0): 1500, ("direwolf", 1): 1500, ("tnc2", 0): 1000, ("serial", 3): 200})))
+    stats = listener.channels
+    results.append(check("Zähler je Kanal", stats[("direwolf", 1)].frames == 1500
+                         and stats[("serial", 3)].decoded == 200 and not stats[("tnc2", 0)].rejected))
+    results.append(check("Fehlender Endpunkt blockiert nicht", endpoints[3].connect_failures >= 1
+                         and not endpoints[3].connected))
+
+    # Direwolf neu gestartet: Verbindung bricht ab, die anderen laufen weiter
+    direwolf.stop()
+    wait_for(lambda: endpoints[0].reconnects >= 1, 5)
+    before = tags[("serial", 3)]
+    os.write(master, b''.join(kiss_frame(f, 3) for f in frames[200:220]))
+    wait_for(lambda: tags[("serial", 3)] >= before + 20, 5)
+    results.append(check("Abbruch eines Endpunkts gezählt", endpoints[0].reconnects == 1 and listener.reconnects == 1))
+    results.append(check("Übrige Endpunkte empfangen weiter", tags[("serial", 3)] == before + 20))
+
+    listener.stop()
+    listener.join(3)
+    tnc2.stop()
+    os.close(master)
+    os.close(slave)
+    results.append(check("Listener beendet", not listener.is_alive()))
+
+    # asyncio: Reconnect mit dem Backoff des Endpunkts statt fester 5 s
+    received, failures, live = asyncio.run(run_asyncio(frames[:100]))
+    print(f"  asyncio: {received} Frames, {failures} Fehlversuche in 3,5 s, "
+          f"nach Abbruch {live.connect_failures} Fehlversuche in 3,5 s")
+    results.append(check("asyncio: Backoff bei Fehlversuchen", received == 100 and failures == 3))
+    results.append(check("asyncio: Backoff nach Empfang zurückgesetzt", live.reconnects == 1
+                         and live.connect_failures == 2))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# Test des NTP-Status-Clients (aprspi/ntp.py) gegen lokale UDP-Stand-ins
+#
+# Ein Fake-ntpd beantwortet Mode-6 READSTAT/READVAR (READVAR absichtlich in
+# zwei Fragmenten), ein Fake-chronyd die cmdmon-Anfrage TRACKING.
+# Weder ntpd noch chronyd müssen installiert sein.
+
+import time
+import struct
+import socket
+import threading
+
+from testlib import check, finish, free_port
+from aprspi import ntp
+
+PEER_VARS = b'srcadr=127.127.28.0, refid="GPS", stratum=0, offset=-0.042, jitter=0.113'
+
+class FakeNtpd(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+        self.requests = []
+        self.syspeer = True
+
+    def reply(self, addr, opcode, seq, assoc, status, data, offset=0, more=False):
+        flags = ntp.FLAG_RESPONSE | (ntp.FLAG_MORE if more else 0) | opcode
+        packet = ntp.MODE6_HEADER.pack(0x16, flags, seq, status, assoc, offset, len(data)) + data
+        self.sock.sendto(packet + b'\0' * (-len(packet) % 4), addr)
+
+    def run(self):
+        while True:
+            try:
+                packet, addr = self.sock.recvfrom(1024)
+            except OSError:
+                return
+            _, op, seq, _, assoc, _, _ = ntp.MODE6_HEADER.unpack_from(packet)
+            self.requests.append(op)
+            select = ntp.SEL_SYSPEER if self.syspeer else 4
+            if op == ntp.OP_READSTAT:
+                data = struct.pack("!HHHH", 101, 4 << 8, 102, select << 8)
+                self.reply(addr, op, seq, 0, 0, data)
+            elif op == ntp.OP_READVAR:
+                status = (select << 8) if assoc == 102 else (4 << 8)
+                self.reply(addr, op, seq, assoc, status, PEER_VARS[:20], 0, more=True)
+                self.reply(addr, op, seq, assoc, status, PEER_VARS[20:], 20)
+
+def chrony_encode(value, exp=-10):
+    coef = round(value * 2.0 ** (25 - exp))
+    return (exp & 0x7F) << 25 | (coef & 0x1FFFFFF)
+
+class FakeChronyd(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+        self.short_requests = 0
+
+    def run(self):
+        while True:
+            try:
+                packet, addr = self.sock.recvfrom(1024)
+            except OSError:
+                return
+            fields = ntp.CHRONY_REQ.unpack_from(packet)
+            if len(packet) < ntp.TRACKING_REPLY_LEN:
+                self.short_requests += 1
+                continue
+            data = b'PPS\0' + b'\0' * 16 + struct.pack("!HHHH", 0, 0, 1, 0) + b'\0' * 12
+            data += struct.pack("!III", 0, chrony_encode(0.000123), chrony_encode(0.000045))
+            data += b'\0' * (76 - len(data))
+            header = ntp.CHRONY_REPLY.pack(ntp.CHRONY_VERSION, 2, 0, 0, fields[4], ntp.RPY_TRACKING,
+                                           0, 0, 0, 0, fields[6], 0, 0)
+            self.sock.sendto(header + data, addr)
+
+def main():
+    print("=== NTP-Client gegen UDP-Stand-ins ===\n")
+    results = []
+
+    ntpd = FakeNtpd()
+    ntpd.start()
+    client = ntp.NTPQuery(port=ntpd.port, chrony_port=free_port(socket.SOCK_DGRAM), ttl=0)
+    start = time.perf_counter()
+    result = client.query()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"ntpd: {result} in {elapsed:.2f} ms")
+    results.append(check("Systempeer SHM(0) erkannt", result == ("*SHM(0)", "GPS", "-0.042", "0.113")))
+    results.append(check("Backend ntpd (READVAR aus 2 Fragmenten)", client.backend == "ntpd"))
+
+    # Zweite Abfrage: Peer ist gemerkt, daher nur READVAR
+    ntpd.requests.clear()
+    client.query()
+    results.append(check("Peer aus Cache (nur READVAR)", ntpd.requests == [ntp.OP_READVAR]))
+
+    # TTL-Cache: innerhalb der TTL kein Netzwerkverkehr
+    client.ttl = 60
+    client.query()
+    ntpd.requests.clear()
+    client.query()
+    results.append(check("Ergebnis-Cache innerhalb TTL", ntpd.requests == []))
+
+    # Peer verliert Sync -> NoSync
+    ntpd.syspeer = False
+    client.ttl = 0
+    results.append(check("Kein Systempeer -> NoSync", client.query() == ntp.NO_SYNC))
+
+    chronyd = FakeChronyd()
+    chronyd.start()
+    client = ntp.NTPQuery(port=free_port(socket.SOCK_DGRAM), chrony_port=chronyd.port, ttl=0)
+    result = client.query()
+    print(f"chrony: {result}")
+    results.append(check("chrony-Fallback", client.backend == "chrony" and result[0] == "*PPS"))
+    results.append(check("chrony-Offset/Jitter", result[2] == "0.123" and result[3] == "0.045"))
+    results.append(check("Anfrage auf Antwortlänge gepolstert", chronyd.short_requests == 0))
+
+    client = ntp.NTPQuery(port=free_port(socket.SOCK_DGRAM), chrony_port=free_port(socket.SOCK_DGRAM),
+                          ttl=0, timeout=0.2)
+    results.append(check("Kein Dienst -> NTP ?", client.query() == ntp.FAILED))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# OLED-Render Benchmark: canvas(device) mit Vollbild gegen aprspi.oled.DiffRenderer
+#
+# Läuft ohne Hardware: der echte luma-ssd1309-Treiber bekommt ein Fake-SPI,
+# das die gesendeten Bytes zählt und das GDDRAM des Controllers nachbildet.
+# So lässt sich auch prüfen, dass die Teil-Updates das richtige Bild ergeben.
+#
+# Aufruf:  python3 OLED-Render-Benchmark-V1.0.py [frames]
+
+import sys
+import time
+
+import testlib  # macht aprspi importierbar
+from PIL import ImageFont
+from luma.core.render import canvas
+from luma.core.device import dummy
+from luma.oled.device import ssd1309
+from aprspi.oled import DiffRenderer, to_pages
+
+font = ImageFont.load_default()
+
+class FakeSPI:
+    # Zählt Bytes und schreibt Daten wie der SSD1309 im horizontalen Modus ins GDDRAM
+    def __init__(self):
+        self.bytes = 0
+        self.gddram = [bytearray(128) for _ in range(8)]
+        self.cols = (0, 127)
+        self.pages = (0, 7)
+        self.col = 0
+        self.page = 0
+
+    def command(self, *cmd):
+        self.bytes += len(cmd)
+        i = 0
+        while i < len(cmd):
+            if cmd[i] == 0x21:
+                self.cols = (cmd[i + 1], cmd[i + 2])
+                self.col = cmd[i + 1]
+                i += 3
+            elif cmd[i] == 0x22:
+                self.pages = (cmd[i + 1], cmd[i + 2])
+                self.page = cmd[i + 1]
+                i += 3
+            else:
+                i += 1
+
+    def data(self, data):
+        self.bytes += len(data)
+        for value in data:
+            self.gddram[self.page][self.col] = value
+            self.col += 1
+            if self.col > self.cols[1]:
+                self.col = self.cols[0]
+                self.page = self.page + 1 if self.page < self.pages[1] else self.pages[0]
+
+    def cleanup(self):
+        pass
+
+def draw_status_page(draw, n):
+    # Wie Seite 1: statische Labels, nur wenige Ziffern ändern sich
+    draw.text((0, 0), f"CPU:{n % 7 + 3}% T:48.{n % 10}'C", font=font, fill=255)
+    draw.text((0, 10), "RAM:23% DSK:41%", font=font, fill=255)
+    draw.text((0, 20), "GPS:OK Sats:9", font=font, fill=255)
+    draw.text((0, 30), "BAT:87% 4.05V", font=font, fill=255)
+    draw.text((0, 40), "OE5ITH-9 RX", font=font, fill=255)
+    draw.text((0, 50), f"Uptime:01:{n // 60 % 60:02d}:{n % 60:02d}", font=font, fill=255)
+
+def bench_legacy(frames):
+    spi = FakeSPI()
+    device = ssd1309(spi, width=128, height=64)
+    spi.bytes = 0
+    start = time.perf_counter()
+    for n in range(frames):
+        with canvas(device) as draw:
+            draw_status_page(draw, n)
+    return time.perf_counter() - start, spi.bytes
+
+def bench_diff(frames):
+    spi = FakeSPI()
+    device = ssd1309(spi, width=128, height=64)
+    spi.bytes = 0
+    renderer = DiffRenderer(device, full_refresh=0)
+    start = time.perf_counter()
+    for n in range(frames):
+        with renderer.canvas() as draw:
+            draw_status_page(draw, n)
+    elapsed = time.perf_counter() - start
+    ok = [bytes(p) for p in spi.gddram] == to_pages(renderer.image)
+    return elapsed, spi.bytes, renderer, ok
+
+def bench_dummy(frames):
+    device = dummy(width=128, height=64, mode="1")
+    renderer = DiffRenderer(device, full_refresh=0)
+    start = time.perf_counter()
+    for n in range(frames):
+        with renderer.canvas() as draw:
+            draw_status_page(draw, n)
+    return time.perf_counter() - start, renderer
+
+def report(label, elapsed, frames, sent):
+    print(f"{label:<22} {frames / elapsed:8.0f} Frames/s  {elapsed / frames * 1000:6.2f} ms/Frame  "
+          f"{sent / frames:7.1f} Byte/Frame über SPI")
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{frames} Frames Statusseite (128x64, 1 Bit)\n")
+    elapsed, sent = bench_legacy(frames)
+    report("canvas(device)", elapsed, frames, sent)
+    elapsed, sent, renderer, ok = bench_diff(frames)
+    report("DiffRenderer ssd1309", elapsed, frames, sent)
+    elapsed, dummy_renderer = bench_dummy(frames)
+    report("DiffRenderer dummy", elapsed, frames, dummy_renderer.bytes_sent)
+    print(f"\nGeänderte Pages je Frame: {renderer.pages_sent / frames:.2f} von 8, "
+          f"unveränderte Frames: {renderer.unchanged}")
+    print(f"GDDRAM nach Teil-Updates identisch mit Bild: {'OK' if ok else 'FEHLER'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# OLED-Text Benchmark: draw.text() gegen aprspi.oled.TextCache
+#
+# Setzt die Statusseite (Seite 1) auf dem luma-dummy zusammen, einmal wie
+# bisher mit draw.text() und einmal aus dem Label-Cache. Vorher wird
+# geprüft, dass beide Varianten Pixel für Pixel dasselbe Bild liefern.
+# Gemessen werden Seitenaufbau allein und Seitenaufbau inkl. push().
+# Beide Fonts: load_default() ist ab Pillow 10.1 ein FreeType-Font,
+# ältere Versionen (z. B. Raspberry Pi OS) liefern den Bitmap-Font.
+#
+# Aufruf:  python3 OLED-Text-Benchmark-V1.0.py [frames]
+
+import sys
+import time
+
+from testlib import check, finish
+from PIL import Image, ImageDraw, ImageFont
+from luma.core.device import dummy
+from aprspi.oled import DiffRenderer, TextCache
+
+def status_lines(n):
+    # Wie Seite 1: Label statisch, Werte ändern sich langsam, Uhrzeit jede Sekunde
+    return [
+        ("CPU:", f"{n % 7 + 3}% T:48.{n % 10}'C"),
+        ("RAM:", "23% DSK:41%"),
+        ("GPS:", "OK Sats:9"),
+        ("BAT:", f"{87 - n // 600}% 4.05V"),
+        ("", "OE5ITH-9 > APRS | Hello"),
+        ("Uptime:", f"01:{n // 60 % 60:02d}:{n % 60:02d}"),
+    ]
+
+def page_draw_text(draw, font, n):
+    for i, (label, value) in enumerate(status_lines(n)):
+        draw.text((0, i * 10), label + value, font=font, fill=255)
+
+def page_text_cache(draw, texts, n):
+    for i, (label, value) in enumerate(status_lines(n)):
+        texts.text(draw, (0, i * 10), label, value)
+
+def identical(font, texts, frames):
+    # Jede Sekunde der Uptime einmal, damit auch die Cache-Treffer verglichen werden
+    for n in range(0, frames, 7):
+        images = [Image.new("1", (128, 64)) for _ in range(2)]
+        page_draw_text(ImageDraw.Draw(images[0]), font, n)
+        page_text_cache(ImageDraw.Draw(images[1]), texts, n)
+        if images[0].tobytes() != images[1].tobytes():
+            return False
+    return True
+
+def bench(renderer, compose, frames, push):
+    draw = renderer.draw
+    start = time.perf_counter()
+    for n in range(frames):
+        draw.rectangle((0, 0) + renderer.image.size, fill=0)
+        compose(draw, n)
+        if push:
+            renderer.push()
+    return (time.perf_counter() - start) / frames * 1e6
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    fonts = [("load_default()", ImageFont.load_default())]
+    if hasattr(ImageFont, "load_default_imagefont"):
+        fonts.append(("Bitmap-Font", ImageFont.load_default_imagefont()))
+    print(f"{frames} Frames Statusseite auf luma-dummy (128x64)\n")
+    checks = []
+    for name, font in fonts:
+        checks.append(check(f"{name}: pixelgleich mit draw.text", identical(font, TextCache(font), 600)))
+    print(f"\n{'Font':<16} {'Variante':<12} {'Aufbau':>10} {'inkl. push':>12}")
+    for name, font in fonts:
+        texts = TextCache(font)
+        variants = [
+            ("draw.text", lambda draw, n: page_draw_text(draw, font, n)),
+            ("TextCache", lambda draw, n: page_text_cache(draw, texts, n)),
+        ]
+        results = []
+        for label, compose in variants:
+            device = dummy(width=128, height=64, mode="1")
+            renderer = DiffRenderer(device, full_refresh=0)
+            only = bench(renderer, compose, frames, push=False)
+            total = bench(renderer, compose, frames, push=True)
+            results.append(only)
+            print(f"{name:<16} {label:<12} {only:8.0f} µs {total:10.0f} µs")
+        print(f"{'':<16} Faktor {results[0] / results[1]:.1f}x, Cache-Treffer "
+              f"{texts.hits / max(texts.hits + texts.misses, 1) * 100:.1f}%\n")
+
+    finish(checks)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# Test des Paketlogs (aprspi/packetlog.py)
+#
+# Schreibt synthetische Frames mit Rotation und einem Uhrsprung rückwärts
+# in ein temporäres Verzeichnis und prüft Zeitfenster gegen einen
+# vollständigen Durchlauf. Misst Suche per Index gegen lineares Lesen.
+#
+# Aufruf:  python3 Packet-Log-Test-V1.0.py [frames]
+
+import os
+import sys
+import time
+import random
+import socket
+import datetime
+import tempfile
+import functools
+import subprocess
+
+from testlib import ROOT, check, wait_for, finish
+from aprspi.ax25 import AX25Address, encode_ui
+from aprspi.kiss import KISSDeframer
+from aprspi.packetlog import PacketLog, LogFile, log_files, read_log, replay
+from aprspi.simulator import KISSServer
+
+def make_frame(i):
+    src = AX25Address.parse(f"OE{i % 9 + 1}ABC-{i % 16}")
+    return encode_ui(src, AX25Address.parse("APRS"), (AX25Address.parse("WIDE1-1"),),
+                     f"!4812.34N/01402.34E>Test {i}".encode())
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print("=== Paketlog ===\n")
+    results = []
+    directory = tempfile.mkdtemp(prefix="aprspi-log-")
+    log = PacketLog(directory, max_bytes=512 * 1024, max_files=1000)
+
+    # Frames im Abstand 0,5-3 s; nach der Hälfte springt die Uhr 1 h zurück
+    written = []
+    now = 1_790_000_000.0
+    start = time.perf_counter()
+    for i in range(count):
+        if i == count // 2:
+            now -= 3600
+        now += random.uniform(0.5, 3.0)
+        frame = make_frame(i)
+        log.append(frame, port=i % 2, now=now)
+        written.append((now, i % 2, frame))
+    log.close()
+    elapsed = time.perf_counter() - start
+    files = log_files(directory)
+    size = sum(os.path.getsize(f) for f in files)
+    print(f"  {count} Frames in {elapsed:.2f} s geschrieben, {len(files)} Dateien, {size / count:.1f} Byte/Frame")
+    results.append(check("Rotation nach Größe", len(files) > 2))
+    results.append(check("Jede Datei zeitlich sortiert", all(
+        [lf.entry(i)[0] for i in range(lf.count)] == sorted(lf.entry(i)[0] for i in range(lf.count))
+        for lf in map(LogFile, files))))
+
+    everything = list(read_log(directory))
+    results.append(check("Alle Frames zurückgelesen", sorted(everything) == sorted(written)))
+
+    ok = True
+    for _ in range(50):
+        a, b = sorted(random.uniform(written[0][0] - 100, written[-1][0] + 3700) for _ in range(2))
+        expected = sorted(r for r in written if a <= r[0] < b)
+        ok = ok and sorted(read_log(directory, a, b)) == expected
+    results.append(check("50 zufällige Zeitfenster wie Volldurchlauf", ok))
+
+    # Suche per mmap-Index gegen Lesen von vorne
+    window = (written[count // 4][0], written[count // 4][0] + 60)
+    start = time.perf_counter()
+    for _ in range(20):
+        indexed = list(read_log(directory, *window))
+    t_index = (time.perf_counter() - start) / 20 * 1000
+    start = time.perf_counter()
+    linear = [r for r in read_log(directory) if window[0] <= r[0] < window[1]]
+    t_linear = (time.perf_counter() - start) * 1000
+    print(f"  1 Minute aus {count} Frames: Index {t_index:.2f} ms, linear {t_linear:.1f} ms")
+    results.append(check("Index liefert dasselbe wie linear", bool(indexed) and indexed == linear))
+
+    # Replay: Abstände werden durch speed geteilt
+    pauses = []
+    replay(written[:5], speed=10, sink=lambda *r: None, sleep=pauses.append)
+    expected = [(written[i + 1][0] - written[i][0]) / 10 for i in range(4)]
+    results.append(check("Replay mit 10-facher Geschwindigkeit", all(abs(p - e) < 1e-9 for p, e in zip(pauses, expected))))
+
+    # Abgeschnittener letzter Satz (Stromausfall) stört das Lesen nicht
+    last = files[-1]
+    with open(last, "r+b") as f:
+        f.truncate(os.path.getsize(last) - 5)
+    results.append(check("Abgeschnittene Datei lesbar", len(list(read_log(directory))) == count - 1))
+
+    begin = datetime.datetime.fromtimestamp(written[100][0])
+    end = begin + datetime.timedelta(seconds=30)
+    out = subprocess.run([sys.executable, "-m", "aprspi.packetlog", "dump", directory,
+                          "--from", begin.isoformat(), "--to", end.isoformat()],
+                         cwd=ROOT, capture_output=True, text=True)
+    lines = out.stdout.splitlines()
+    print("  CLI dump: " + (lines[0] if lines else out.stderr.strip()[-80:]))
+    results.append(check("CLI dump", out.returncode == 0 and lines and all(">APRS,WIDE1-1:" in l for l in lines)))
+
+    # Simulator mit --replay: jeder Client bekommt das ganze Log
+    server = KISSServer(port=0, records=functools.partial(read_log, directory), speed=0, split=False)
+    server.start()
+    clients = [socket.create_connection((server.host, server.port)) for _ in range(2)]
+    received = [[] for _ in clients]
+    deframers = [KISSDeframer() for _ in clients]
+
+    def receive():
+        for sock, deframer, frames in zip(clients, deframers, received):
+            sock.settimeout(0.05)
+            try:
+                frames.extend(f.data for f in deframer.feed(sock.recv(65536)))
+            except socket.timeout:
+                pass
+        return all(len(frames) >= count - 1 for frames in received)
+
+    wait_for(receive, 30, interval=0)
+    for sock in clients:
+        sock.close()
+    server.stop()
+    print(f"  Replay an 2 Clients: {[len(frames) for frames in received]} Frames")
+    results.append(check("Replay je Client vollständig", all(
+        frames == [bytes(data) for _, _, data in read_log(directory)] for frames in received)))
+
+    for f in os.listdir(directory):
+        os.remove(os.path.join(directory, f))
+    os.rmdir(directory)
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# Test des Sensor-Samplers (aprspi/sampler.py)
+#
+# Eine Quelle blockiert wie ntpq bis zum Timeout (1 s), daneben läuft eine
+# 10-Hz-Quelle wie der INA219 mit own_thread=True. Deren Abstände dürfen
+# durch die hängende Abfrage nicht wachsen, weder mit Threads noch unter
+# asyncio.
+#
+# Aufruf:  python3 Sampler-Test-V1.0.py
+
+import time
+import asyncio
+
+from testlib import check, finish
+from aprspi.sampler import Sampler
+from aprspi import aio
+
+def setup():
+    sampler = Sampler()
+    stamps = []
+    sampler.add("ntp", lambda: time.sleep(1.0), 1.5)
+    sampler.add("ina219", lambda: stamps.append(time.monotonic()), 0.1, own_thread=True)
+    return sampler, stamps
+
+def gaps(stamps):
+    return [b - a for a, b in zip(stamps, stamps[1:])]
+
+async def run_asyncio(sampler, seconds):
+    task = asyncio.create_task(aio.sampler_task(sampler))
+    await asyncio.sleep(seconds)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+def main():
+    print("=== Sampler ===\n")
+    results = []
+
+    sampler, stamps = setup()
+    sampler.start()
+    time.sleep(3.0)
+    sampler.stop()
+    sampler.join(2)
+    worst = max(gaps(stamps))
+    print(f"  Threads: {len(stamps)} Messungen in 3 s, größter Abstand {worst * 1000:.0f}ms, "
+          f"ntp {sampler.sources['ntp'].runs}x")
+    results.append(check("10 Hz trotz hängender Abfrage", worst < 0.15 and len(stamps) >= 28
+                         and sampler.sources["ntp"].runs >= 2))
+    count = len(stamps)
+    time.sleep(0.3)
+    results.append(check("stop() beendet auch den eigenen Thread", len(stamps) == count))
+
+    sampler, stamps = setup()
+    asyncio.run(run_asyncio(sampler, 3.0))
+    worst = max(gaps(stamps))
+    print(f"  asyncio: {len(stamps)} Messungen in 3 s, größter Abstand {worst * 1000:.0f}ms")
+    results.append(check("asyncio: 10 Hz trotz hängender Abfrage", worst < 0.15 and len(stamps) >= 28))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Lasttest der Listener mit aprspi.simulator
+#
+# Startet KISS- und gpsd-Simulator auf freien Ports, verbindet echte
+# KISSListener/GPSListener und misst empfangene Frames/s bei steigender
+# Rate. Frames kommen in zufällig zerteilten TCP-Segmenten, mit
+# Digipeater-Pfaden und KISS-Escapes; gezählt wird, ob alle gesendeten
+# Frames dekodiert ankommen. Der Simulator wiederholt seinen Vorrat von
+# 1000 Frames im Kreis, innerhalb des 30-s-Dupe-Fensters kommt also nur
+# die erste Runde als Paket an, jede weitere zählt als Duplikat. Zum
+# Schluss eine Flut auf den DisplayScheduler: trotz tausender Frames/s darf
+# er nur begrenzt neu zeichnen.
+#
+# Aufruf:  python3 Simulator-Load-Test-V1.0.py [sekunden je Stufe]
+
+import sys
+import time
+
+from testlib import check, wait_for, finish
+from aprspi.simulator import KISSServer, GpsdServer, synth_frames
+from aprspi.listeners import KISSListener, GPSListener
+from aprspi.display import DisplayScheduler
+from aprspi.ax25 import decode_ax25
+
+def kiss_stage(rate, seconds, split=True):
+    server = KISSServer(port=0, rate=rate, split=split, limit=int(rate * seconds) if rate else 20000)
+    server.start()
+    listener = KISSListener("OE5ITH", server.host, server.port)
+    received = []
+    listener.on_packet = lambda packet, own: received.append(packet)
+    listener.start()
+    start = time.monotonic()
+    wait_for(lambda: server.limit and server.frames_sent >= server.limit
+             and len(received) + listener.dupes.duplicates >= server.frames_sent, seconds * 3 + 10)
+    elapsed = time.monotonic() - start
+    listener.stop()
+    server.stop()
+    return server, received, listener.dupes.duplicates, elapsed
+
+def complete(server, received, dupes, frames):
+    # Erste Runde vollständig als Pakete, alle Wiederholungen als Duplikate
+    unique = min(server.frames_sent, len(frames))
+    return len(received) == unique and len(received) + dupes == server.frames_sent
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    print("=== Simulator-Lasttest ===\n")
+    results = []
+
+    frames = synth_frames()
+    escaped = sum(1 for f in frames if 0xC0 in f or 0xDB in f)
+    digis = sum(1 for f in frames if decode_ax25(f).path)
+    print(f"  Vorrat: {len(frames)} Frames, {digis} mit Digipeater-Pfad, {escaped} mit Escape-Bytes")
+    results.append(check("Vorrat enthält Pfade und Escapes", escaped > 0 and digis > len(frames) // 2))
+
+    ok = True
+    for rate in (100, 1000, 5000, 0):
+        server, received, dupes, elapsed = kiss_stage(rate, seconds)
+        label = f"{rate}/s" if rate else "Maximum"
+        intact = all(bytes(p.frame.info) == bytes(decode_ax25(frames[i]).info) for i, p in enumerate(received))
+        print(f"  {label:>8}: {server.frames_sent:>6} gesendet, {len(received):>6} Pakete + {dupes:>6} Duplikate, "
+              f"{(len(received) + dupes) / elapsed:8.0f} Frames/s, {server.bytes_sent / elapsed / 1024:7.0f} KiB/s")
+        ok = ok and complete(server, received, dupes, frames) and intact
+    results.append(check("Alle Frames vollständig und in Reihenfolge", ok))
+
+    server, received, dupes, _ = kiss_stage(1000, seconds / 2, split=False)
+    results.append(check("Ohne Segmentierung", complete(server, received, dupes, frames)))
+
+    # gpsd: ?WATCH, dann TPV/SKY/PPS mit 10 Hz
+    gpsd = GpsdServer(port=0, rate=10)
+    gpsd.start()
+    gps = GPSListener(gpsd.host, gpsd.port)
+    fixes = []
+    gps.on_fix = fixes.append
+    gps.start()
+    got_fix = wait_for(lambda: gps.last_tpv is not None and gps.last_sky is not None, 10)
+    time.sleep(1)
+    gps.stop()
+    gpsd.stop()
+    sats = gps.last_sky.satellites if got_fix else []
+    print(f"  gpsd: {gpsd.reports_sent} Zyklen, Position {gps.last_tpv.lat if got_fix else '-'}, "
+          f"{sum(1 for s in sats if s.used)}/{len(sats)} Satelliten genutzt")
+    results.append(check("GPS-Fix vom Simulator", got_fix and gps.last_tpv.mode == 3 and fixes[:1] == [True]))
+    results.append(check("SKY mit Satelliten", len(sats) == gpsd.satellites))
+    results.append(check("PPS empfangen", gps.last_pps is not None))
+
+    # Flut auf den Scheduler: Neuzeichnen durch min_interval begrenzt
+    server = KISSServer(port=0, rate=0, limit=20000)
+    server.start()
+    renders = []
+    scheduler = DisplayScheduler(lambda page: renders.append(page), 5, min_interval=0.25)
+    listener = KISSListener("OE5ITH", server.host, server.port)
+    listener.on_packet = scheduler.packet
+    scheduler.start()
+    listener.start()
+    start = time.monotonic()
+    wait_for(lambda: scheduler.events + listener.dupes.duplicates >= server.limit, 30)
+    elapsed = time.monotonic() - start
+    listener.stop()
+    scheduler.stop()
+    server.stop()
+    print(f"  Scheduler: {scheduler.events} Ereignisse und {listener.dupes.duplicates} Duplikate "
+          f"in {elapsed:.2f} s, {len(renders)} Mal gezeichnet")
+    results.append(check("Neuzeichnen unter Last begrenzt", scheduler.events == len(frames)
+                         and scheduler.events + listener.dupes.duplicates >= server.limit
+                         and len(renders) <= elapsed / 0.25 + 3))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# Test der eigenen Baken (aprspi/beacon.py)
+#
+# SmartBeaconing gegen simulierte Fahrten (Stand, Stadt mit Abbiegen,
+# Landstraße, Autobahn), komprimierte Position hin und zurück, vorab
+# kodierter Kopf gleich encode_ui und zum Schluss eine Bake über
+# KISSListener bis zum simulierten TNC.
+#
+# Aufruf:  python3 SmartBeacon-Test-V1.0.py
+
+import time
+
+from testlib import check, wait_for, finish
+from aprspi.beacon import SmartBeacon, Beacon, BEACON_DEST
+from aprspi.aprs import encode_compressed, decode_info
+from aprspi.ax25 import encode_ui, decode_ax25
+from aprspi.kiss import KISSDeframer, kiss_frame
+from aprspi.gpsd import GPSReport
+from aprspi.endpoints import KISSEndpoint
+from aprspi.listeners import KISSListener
+from aprspi.simulator import KISSServer
+
+def run(smart, track):
+    # track: Liste von (Sekunden, km/h, Kurs) je Abschnitt, 1 Hz; liefert Sendezeitpunkte
+    sent = []
+    t = 0
+    for seconds, speed, course in track:
+        for _ in range(seconds):
+            if smart.due(t, speed, course):
+                sent.append(t)
+            t += 1
+    return sent
+
+def gaps(sent):
+    return [b - a for a, b in zip(sent, sent[1:])]
+
+class Collector:
+    def __init__(self):
+        self.frames = []
+
+    def send_kiss(self, frame, endpoint=None):
+        self.frames.append(frame)
+
+def main():
+    print("=== SmartBeaconing ===\n")
+    results = []
+
+    # Stand: erste Bake sofort, dann alle 30 Minuten
+    sent = run(SmartBeacon(), [(7200, 0, None)])
+    results.append(check("Stand: alle slow_rate", sent == [0, 1800, 3600, 5400]))
+
+    # Autobahn geradeaus
+    sent = run(SmartBeacon(), [(600, 120, 90)])
+    results.append(check("Autobahn: alle fast_rate", set(gaps(sent)) == {60}))
+
+    # Landstraße 45 km/h: fast_rate * fast_speed / Tempo = 120 s
+    sent = run(SmartBeacon(), [(600, 45, 90)])
+    results.append(check("Landstraße: Intervall nach Tempo", set(gaps(sent)) == {120}))
+
+    # Stadt: 40 km/h, alle 30 s rechts abbiegen (90°) -> Corner Pegging
+    city = [(30, 40, (i * 90) % 360) for i in range(10)]
+    sent = run(SmartBeacon(), city)
+    print(f"  Stadt: Baken bei {sent}")
+    results.append(check("Abbiegen löst Bake aus", sent == [i * 30 for i in range(10)]))
+
+    # Schnelles Zickzack: nie öfter als turn_time
+    zigzag = [(5, 40, 0 if i % 2 else 90) for i in range(40)]
+    sent = run(SmartBeacon(), zigzag)
+    results.append(check("Mindestabstand turn_time", min(gaps(sent)) >= 15))
+
+    # Leichte Kurve bei Tempo: 20° liegt unter 30 + 410/100
+    sent = run(SmartBeacon(), [(20, 100, 90), (40, 100, 110)])
+    results.append(check("Kleine Richtungsänderung ignoriert", sent == [0]))
+
+    # Komprimierte Position hin und zurück
+    info = encode_compressed(48.3069, 14.2858, "/>", 93, 72.5)
+    data = decode_info("position", "", info)
+    print(f"  {info.decode()} -> {data['lat']:.5f} {data['lon']:.5f} {data['course']}° {data['speed']:.1f} km/h")
+    results.append(check("Komprimierte Position", len(info) == 14 and abs(data["lat"] - 48.3069) < 1e-5
+                         and abs(data["lon"] - 14.2858) < 1e-5 and abs(data["course"] - 93) <= 2
+                         and abs(data["speed"] - 72.5) < 72.5 * 0.05))
+
+    # Vorab kodierter Kopf: gleiches KISS-Frame wie encode_ui + kiss_frame
+    collector = Collector()
+    beacon = Beacon(collector, "OE5ITH-9", ("WIDE1-1", "WIDE2-1"), comment=" APRS Pi")
+    beacon.position(48.3069, 14.2858, 93, 72.5)
+    expected = kiss_frame(encode_ui("OE5ITH-9", BEACON_DEST, ("WIDE1-1", "WIDE2-1"), info + b" APRS Pi"))
+    results.append(check("Vorab kodierter Kopf", collector.frames == [expected]))
+    # FEND/FESC im Kommentar (latin-1) müssen escaped beim TNC ankommen
+    raw = beacon.frame(info + b"\xc0\xdb")
+    back = KISSDeframer().feed(raw)
+    results.append(check("KISS-Escaping", len(back) == 1 and decode_ax25(back[0].data).info == info + b"\xc0\xdb"))
+
+    start = time.perf_counter()
+    for i in range(10000):
+        beacon.frame(encode_compressed(48.3, 14.28, "/>", 90, 50))
+    per = (time.perf_counter() - start) / 10000 * 1e6
+    print(f"  {per:.1f}µs je Bake")
+
+    # Ende zu Ende: TPV -> Beacon -> KISSListener -> simulierter TNC
+    tnc = KISSServer(port=0, rate=0, frames=[], limit=0)
+    tnc.start()
+    listener = KISSListener("OE5ITH", endpoints=[KISSEndpoint("direwolf", tnc.host, tnc.port)])
+    listener.start()
+    beacon = Beacon(listener, "OE5ITH-9", ())
+    wait_for(lambda: listener.endpoints[0].connected, 5)
+    beacon.update(GPSReport({"class": "TPV", "mode": 3, "lat": 48.3069, "lon": 14.2858, "speed": 12.5, "track": 180.0}))
+    beacon.update(GPSReport({"class": "TPV", "mode": 3, "lat": 48.3070, "lon": 14.2858, "speed": 12.5, "track": 180.0}))
+    wait_for(lambda: tnc.received, 5)
+    time.sleep(0.2)
+    listener.stop()
+    listener.join(3)
+    tnc.stop()
+    frame = decode_ax25(tnc.received[0].data) if tnc.received else None
+    results.append(check("Bake beim TNC angekommen", len(tnc.received) == 1 and str(frame.src) == "OE5ITH-9"
+                         and decode_info("position", "", frame.info)["course"] == 180))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
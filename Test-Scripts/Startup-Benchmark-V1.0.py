@@ -0,0 +1,57 @@
+# Startzeit-Benchmark: Zeit bis zum ersten gezeichneten Frame je Modus
+#
+# Startet "python3 -m aprspi --mode ... --once" mehrfach als eigenen Prozess
+# und misst die Zeit vom Prozessstart bis nach der ersten Seite. Zusätzlich
+# wird angezeigt, welche schweren Module im jeweiligen Modus geladen wurden.
+# Läuft ohne Hardware (OLED über --dummy, Akku über --no-battery).
+#
+# Aufruf:  python3 Startup-Benchmark-V1.0.py [läufe]
+
+import sys
+import time
+import statistics
+import subprocess
+
+from testlib import ROOT
+
+HEAVY = ("PIL", "luma", "psutil", "smbus", "RPi", "numpy")
+
+CHILD = f"""
+import sys, time
+from aprspi.app import main
+main(sys.argv[1:])
+print(time.time(), " ".join(m for m in {HEAVY!r} if m in sys.modules), file=sys.stderr)
+"""
+
+MODES = [
+    ("headless", ["--mode", "headless", "--no-battery", "--once"]),
+    ("console", ["--mode", "console", "--no-battery", "--once"]),
+    ("oled (dummy)", ["--mode", "oled", "--dummy", "--no-battery", "--once"]),
+]
+
+def run_once(args):
+    start = time.time()
+    proc = subprocess.run([sys.executable, "-c", CHILD] + args, cwd=ROOT,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    stamp, _, modules = proc.stderr.strip().splitlines()[-1].partition(" ")
+    return (float(stamp) - start) * 1000, modules
+
+def baseline(runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"Zeit bis zum ersten Frame, Median aus {runs} Läufen\n")
+    print(f"{'Python ohne Code':<16} {baseline(runs):8.0f} ms")
+    for label, args in MODES:
+        results = [run_once(args) for _ in range(runs)]
+        median = statistics.median(ms for ms, _ in results)
+        print(f"{label:<16} {median:8.0f} ms   geladen: {results[-1][1] or '-'}")
+
+if __name__ == "__main__":
+    main()
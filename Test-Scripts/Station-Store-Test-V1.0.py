@@ -0,0 +1,69 @@
+# Test der Stationstabelle (aprspi/stations.py)
+#
+# Kleine Tabelle (8 Frames im Ring, höchstens 3 Stationen), gefüllt über
+# max_stations hinaus: verdrängt wird die am längsten nicht gehörte Station,
+# mit Position auch aus dem GeoIndex. Dazu die Buckets nach Paketanzahl
+# hinter most_active(), der Ringpuffer nach dem Überlauf und rate().
+#
+# Aufruf:  python3 Station-Store-Test-V1.0.py
+
+from testlib import check, finish
+from aprspi.aprs import APRSPacket
+from aprspi.ax25 import encode_ui, decode_ax25
+from aprspi.stations import StationStore
+
+START = 1_800_000_000.0
+
+def packet(src, info=b"!4814.12N/01418.30E>Test"):
+    return APRSPacket(decode_ax25(encode_ui(src, "APRS", (), info)))
+
+def calls(stations):
+    return [s.call for s in stations]
+
+def main():
+    print("=== Stationstabelle ===\n")
+    results = []
+
+    store = StationStore(capacity=8, max_stations=3)
+    store.geo.set_origin(48.3, 14.3)
+    # Zeitpunkt = START + 10 s je Frame; OE5B sendet nur Status (keine Position)
+    heard = ["OE5A", "OE5B", "OE5C", "OE5A", "OE5D", "OE5E", "OE5E", "OE5E", "OE5D"]
+    for i, call in enumerate(heard):
+        store.add(packet(call, b">nur Status" if call == "OE5B" else b"!4814.12N/01418.30E>Test"),
+                  now=START + i * 10)
+        if i == 4:
+            # OE5D verdrängt OE5B (am längsten nicht gehört, ohne Position)
+            results.append(check("Verdrängt nach letztem Empfang", calls(store.most_recent(5))
+                                 == ["OE5D", "OE5A", "OE5C"] and store.get("OE5B") is None
+                                 and len(store.geo) == 3))
+    nearest = [call for call, _, _ in store.geo.nearest(10)]
+    print(f"  Stationen: {calls(store.most_recent(5))}, GeoIndex: {nearest}")
+    results.append(check("Verdrängte Station auch aus dem GeoIndex", len(store) == 3 and store.get("OE5C") is None
+                         and store.geo.get("OE5C") is None and sorted(nearest) == ["OE5A", "OE5D", "OE5E"]))
+
+    # Anzahlen: OE5E 3, OE5D 2 (zuletzt auf 2 gekommen), OE5A 2; Verdrängte in keinem Bucket
+    active = store.most_active(5)
+    print(f"  Am aktivsten: {[(s.call, s.count) for s in active]}")
+    results.append(check("most_active nach Anzahl, bei Gleichstand zuletzt gehört zuerst",
+                         calls(active) == ["OE5E", "OE5D", "OE5A"] and calls(store.most_active(2)) == ["OE5E", "OE5D"]))
+    results.append(check("Buckets ohne verdrängte Stationen", store._counts == [2, 3]
+                         and {c: list(b) for c, b in store._buckets.items()} == {2: ["OE5A", "OE5D"], 3: ["OE5E"]}))
+
+    # Ring: 9 Frames in 8 Plätzen, das erste (OE5A) ist überschrieben
+    frames = store.recent_frames(20)
+    results.append(check("Ringpuffer nach Überlauf", store.total == 9
+                         and [p.source for _, p in frames] == heard[:0:-1]
+                         and [ts for ts, _ in frames] == [START + i * 10 for i in range(8, 0, -1)]
+                         and [p.source for _, p in store.recent_frames(3)] == ["OE5D", "OE5E", "OE5E"]))
+
+    # rate(): Frames im Fenster, höchstens so viele wie der Ring hält
+    now = START + 80
+    print(f"  Rate: {store.rate(60, now):.1f}/min (60 s), {store.rate(30, now):.1f}/min (30 s), "
+          f"{store.rate(1000, now):.2f}/min (1000 s)")
+    results.append(check("rate()", store.rate(60, now) == 7.0 and store.rate(30, now) == 8.0
+                         and store.rate(1000, now) == 8 * 60 / 1000))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# Test des Terminal-Renderers (aprspi/terminal.py)
+#
+# Die Ausgabe von Screen wird in einen minimalen virtuellen Terminal-
+# Emulator (Cursorposition, Löschen, Text) eingespielt und mit dem
+# erwarteten Bild verglichen. Danach der Vergleich der Kosten gegen
+# os.system("clear") + Vollausgabe wie in der Konsolenversion bis V2.2.
+
+import io
+import os
+import re
+import time
+import subprocess
+
+from testlib import check, finish
+from aprspi.ax25 import AX25Address, decode_ax25, encode_ui
+from aprspi.aprs import APRSPacket
+from aprspi.terminal import Screen, PacketPane, layout
+
+class TTY(io.StringIO):
+    def isatty(self):
+        return True
+
+class VirtualTerminal:
+    TOKEN = re.compile(r"\x1b\[(\d+);(\d+)H|\x1b\[2J|\x1b\[\?\d+[hl]|([^\x1b]+)")
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.clear()
+
+    def clear(self):
+        self.grid = [[" "] * self.width for _ in range(self.height)]
+        self.x = self.y = 0
+
+    def feed(self, text):
+        for m in self.TOKEN.finditer(text):
+            if m.group(1):
+                self.y, self.x = int(m.group(1)) - 1, int(m.group(2)) - 1
+            elif m.group(3):
+                for ch in m.group(3):
+                    self.grid[self.y][self.x] = ch
+                    self.x += 1
+            elif m.group(0) == "\x1b[2J":
+                self.clear()
+
+    def lines(self):
+        return ["".join(row).rstrip() for row in self.grid]
+
+def page_lines(n):
+    # Ähnlich Seite 1 der Konsole: wenige Ziffern ändern sich je Sekunde
+    return [
+        "=== Seite 1: System & Status ===",
+        f"CPU: {n % 13 + 2:.1f}% | Temp: 48.{n % 10}'C",
+        "RAM: 23% | Disk: 41%",
+        "GPS: OK | Sats: 9",
+        f"Uptime: 01:{n // 60 % 60:02d}:{n % 60:02d}",
+        "-" * 50,
+    ]
+
+def main():
+    print("=== Terminal-Renderer ===\n")
+    results = []
+    size = (80, 24)
+    out = TTY()
+    screen = Screen(out)
+    term = VirtualTerminal(*size)
+
+    ok = True
+    for n in range(50):
+        lines = page_lines(n) * 3
+        out.seek(0)
+        out.truncate()
+        screen.render(lines, size)
+        term.feed(out.getvalue())
+        expected = [l[:80] for l in lines] + [""] * (24 - len(lines))
+        ok = ok and term.lines() == expected
+    results.append(check("Bildschirm nach 50 Diff-Frames korrekt", ok))
+
+    out.seek(0)
+    out.truncate()
+    screen.render(lines, size)
+    results.append(check("Unveränderter Frame schreibt nichts", out.getvalue() == ""))
+
+    out.seek(0)
+    out.truncate()
+    screen.render(page_lines(50) * 3, size)
+    print(f"  Sekundenwechsel: {len(out.getvalue())} Byte statt {sum(len(l) + 1 for l in lines)} Byte Vollausgabe")
+    results.append(check("Nur geänderte Zellen geschrieben", len(out.getvalue()) < 150))
+
+    # Größenänderung: kompletter Neuaufbau
+    out.seek(0)
+    out.truncate()
+    screen.render(lines, (60, 10))
+    term = VirtualTerminal(60, 10)
+    term.feed(out.getvalue())
+    results.append(check("Neue Terminalgröße zeichnet komplett neu",
+                         out.getvalue().startswith("\x1b[2J") and term.lines() == [l[:60] for l in lines[:9]] + [lines[9][:59]]))
+
+    # Breites Terminal: Seiten nebeneinander
+    wide = layout([page_lines(0), page_lines(1), page_lines(2)], 160)
+    results.append(check("Layout 160 Spalten: 3 Seiten nebeneinander", len(wide) == 6 and "Uptime" in wide[4]))
+
+    # Live-Pakete: Steuerzeichen aus dem Funk dürfen das Terminal nicht steuern
+    pane = PacketPane()
+    frame = encode_ui(AX25Address.parse("OE5XYZ-9"), AX25Address.parse("APRS"), (),
+                      b">evil \x1b[2J\x07 status")
+    pane.add(APRSPacket(decode_ax25(frame)))
+    rendered = pane.render(5, 80)
+    results.append(check("Steuerzeichen aus Paketen entschärft", "\x1b" not in "".join(rendered) and "OE5XYZ-9>APRS" in rendered[1]))
+    # Auch Seitenzeilen (Rufzeichen, latest_frame) gehen nur entschärft ans Terminal
+    out = TTY()
+    Screen(out).render(["OE5\x1bXYZ > APRS | \x1b]0;pwned\x07\x1b[2J"], (40, 3))
+    written = out.getvalue()
+    results.append(check("Screen.render entschärft jede Zeile", written.count("\x1b") == 2
+                         and "OE5.XYZ > APRS | .]0;pwned..[2J" in written))
+
+    # Kosten: Diff-Renderer gegen clear + print
+    frames = 200
+    out = TTY()
+    screen = Screen(out)
+    start = time.process_time()
+    for n in range(frames):
+        blocks = [page_lines(n + i) for i in range(5)]
+        screen.render(layout(blocks, 120), (120, 40))
+    diff_cpu = (time.process_time() - start) / frames * 1000
+    diff_bytes = screen.bytes_written / frames
+    start = time.perf_counter()
+    for _ in range(20):
+        subprocess.run(["clear"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    clear_ms = (time.perf_counter() - start) / 20 * 1000
+    full_bytes = sum(len(l) + 1 for i in range(5) for l in page_lines(i))
+    print(f"\n  Diff-Renderer: {diff_cpu:.3f} ms CPU/Frame, {diff_bytes:.0f} Byte/Frame")
+    print(f"  Bisher:        {clear_ms:.2f} ms für clear-Prozess + {full_bytes} Byte/Frame")
+    results.append(check("Diff-Frame unter 1 ms CPU", diff_cpu < 1))
+
+    finish(results)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 import shutil
 import importlib.util
 import socket
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
 def check_module(name):
     result = importlib.util.find_spec(name) is not None
@@ -33,22 +37,35 @@ def check_i2c_device(addr):
         print(f"I2C-Gerät bei 0x{addr:02X}: FEHLT ({e})")
         return False
 
+def check_ntp_status():
+    from aprspi.ntp import NTPQuery, FAILED
+    client = NTPQuery()
+    result = client.query()
+    ok = result != FAILED
+    print(f"NTP-Status ({client.backend or 'ntpd/chrony'}): {'OK ' + ' '.join(result) if ok else 'FEHLT'}")
+    return ok
+
 def main():
     print("=== Systemvoraussetzungen für OLED-Monitor prüfen ===\n")
 
-    modules = ['gps', 'smbus', 'psutil', 'PIL', 'luma.core', 'luma.oled']
+    modules = ['smbus', 'psutil', 'PIL', 'luma.core', 'luma.oled', 'numpy']
     for mod in modules:
         check_module(mod)
 
     print()
-    programmes = ['gpxlogger', 'ntpq']
-    for prog in programmes:
-        check_program(prog)
+    # GPX zeichnet APRS-Pi selbst auf (--gpx DIR), gpxlogger ist nur noch optional
+    if not check_program('gpxlogger'):
+        print("  optional: python3 -m aprspi --gpx DIR zeichnet den Track selbst auf")
 
     print()
-    check_port("127.0.0.1", 2947, "gpsd")
+    gpsd = check_port("127.0.0.1", 2947, "gpsd")
+    check_ntp_status()
     check_port("127.0.0.1", 8000, "AGWPE-Port (Direwolf)")
+    kiss = check_port("127.0.0.1", 8001, "KISS-TCP (Direwolf)")
     check_i2c_device(0x43)
+    if not (gpsd and kiss):
+        print("\nOhne GPS/Funkgerät testen: python3 -m aprspi.simulator "
+              "(Ports 8001/2947), dann python3 -m aprspi")
 
     print("\n=== Prüfung abgeschlossen ===")
 
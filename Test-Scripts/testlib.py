@@ -0,0 +1,46 @@
+# APRS Pi – gemeinsame Hilfsfunktionen der Test-Scripts
+#
+# Wird von den Test-Scripts als erstes importiert und macht dabei das
+# Paket aprspi aus dem Repository importierbar (ohne Installation):
+#
+#   from testlib import check, wait_for, finish
+#   from aprspi.dedup import DupeCache
+#
+# Jede Prüfung gibt "<Text>: OK" bzw. "<Text>: FEHLER" aus, finish() fasst
+# zusammen und beendet mit Exitcode 0 nur, wenn alle bestanden sind.
+
+import os
+import sys
+import time
+import socket
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def check(label, ok):
+    print(f"{label}: {'OK' if ok else 'FEHLER'}")
+    return ok
+
+
+def finish(results):
+    print(f"\n=== {sum(results)}/{len(results)} Prüfungen bestanden ===")
+    sys.exit(0 if all(results) else 1)
+
+
+def wait_for(condition, timeout, interval=0.02):
+    # Pollt condition() bis sie wahr ist oder timeout Sekunden vergangen sind
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(interval)
+    return condition()
+
+
+def free_port(kind=socket.SOCK_STREAM):
+    # Freier Port auf 127.0.0.1 für Dienste, die Port 0 nicht annehmen
+    with socket.socket(socket.AF_INET, kind) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
@@ -0,0 +1,3 @@
+# APRS Pi – gemeinsame Bausteine für OLED- und Konsolenversion
+
+__version__ = "2.4"
@@ -0,0 +1,3 @@
+from aprspi.app import main
+
+main()
@@ -0,0 +1,216 @@
+# APRS Pi – asyncio-Laufzeit
+#
+# KISS-TCP, gpsd, Sensorabfrage und Anzeige laufen als Coroutinen in einer
+# einzigen Event-Loop. Die Listener-Objekte aus aprspi/listeners.py werden
+# dabei nur als Zustandsspeicher benutzt, ihre Threads nicht gestartet.
+
+import signal
+import asyncio
+
+from aprspi.gpsd import GPSD_WATCH
+
+
+async def kiss_task(listener):
+    # Je Endpunkt eine Coroutine, alle in derselben Event-Loop
+    loop = asyncio.get_running_loop()
+    writers = {}
+
+    def flush():
+        # Sendepfad: transmit() kann aus anderen Threads kommen
+        for endpoint in listener.endpoints:
+            writer = writers.get(endpoint)
+            if writer is not None:
+                while endpoint.tx:
+                    writer.write(endpoint.tx.popleft())
+                    endpoint.frames_sent += 1
+            elif endpoint.serial and endpoint.connected:
+                try:
+                    pending = endpoint.write_pending()
+                except OSError:
+                    continue
+                if pending:
+                    loop.call_later(0.05, flush)
+
+    # Nach dem Ende der Loop (stop() im finally von app.run) wieder der alte Weckweg
+    wake = listener.wake
+    listener.wake = lambda: loop.call_soon_threadsafe(flush)
+    try:
+        await asyncio.gather(*(kiss_endpoint_task(listener, e, writers, flush) for e in listener.endpoints))
+    finally:
+        listener.wake = wake
+
+
+async def kiss_endpoint_task(listener, endpoint, writers, flush):
+    while True:
+        if endpoint.serial:
+            await kiss_serial(listener, endpoint, flush)
+            continue
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(endpoint.host, endpoint.port), timeout=10)
+        except (OSError, asyncio.TimeoutError):
+            listener.connection_failed(endpoint)
+            # Wartezeit wächst wie im KISSListener bis 30 s
+            await asyncio.sleep(endpoint.backoff.next())
+            continue
+        endpoint.deframer.reset()
+        endpoint.connected = True
+        writers[endpoint] = writer
+        flush()
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                endpoint.backoff.reset()
+                listener.feed(data, endpoint)
+        except OSError:
+            pass
+        finally:
+            endpoint.connected = False
+            del writers[endpoint]
+            writer.close()
+        listener.connection_lost(endpoint)
+        await asyncio.sleep(endpoint.backoff.next())
+
+
+async def kiss_serial(listener, endpoint, flush):
+    # Serielle Schnittstelle/pty: Dateideskriptor direkt in der Event-Loop
+    loop = asyncio.get_running_loop()
+    try:
+        fd = endpoint.open()
+    except OSError:
+        listener.connection_failed(endpoint)
+        await asyncio.sleep(endpoint.backoff.next())
+        return
+    lost = loop.create_future()
+
+    def readable():
+        try:
+            data = endpoint.read()
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if data:
+            endpoint.backoff.reset()
+            listener.feed(data, endpoint)
+        elif not lost.done():
+            lost.set_result(None)
+
+    loop.add_reader(fd, readable)
+    flush()
+    try:
+        await lost
+    finally:
+        loop.remove_reader(fd)
+        # retry_at gilt nur für den Selector-Thread, hier wartet die Coroutine
+        endpoint.close(delay=0)
+    listener.connection_lost(endpoint)
+    await asyncio.sleep(endpoint.backoff.next())
+
+
+async def fanout_task(fanout):
+    await fanout.serve()
+
+
+async def gpsd_task(listener):
+    while True:
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(listener.host, listener.port), timeout=10)
+        except (OSError, asyncio.TimeoutError):
+            await asyncio.sleep(listener.backoff.next())
+            continue
+        listener.stream.reset()
+        try:
+            writer.write(GPSD_WATCH)
+            await writer.drain()
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                listener.backoff.reset()
+                listener.feed(data)
+        except OSError:
+            pass
+        finally:
+            writer.close()
+        listener.reconnects += 1
+        await asyncio.sleep(listener.backoff.next())
+
+
+async def sampler_task(sampler):
+    # Einzelne Quellen können noch blockieren (ntpq, I2C), daher im Executor
+    await asyncio.gather(_sampler_heap(sampler), *(_sampler_fixed(sampler, s) for s in sampler.dedicated))
+
+
+async def _sampler_heap(sampler):
+    while True:
+        delay = await asyncio.to_thread(sampler.run_due)
+        await asyncio.sleep(delay)
+
+
+async def _sampler_fixed(sampler, source):
+    # Quellen mit eigenem Thread: eigene Coroutine, hängt nicht an run_due()
+    loop = asyncio.get_running_loop()
+    due = loop.time()
+    while True:
+        await asyncio.to_thread(sampler.sample, source.name)
+        now = loop.time()
+        due = max(due + source.interval, now)
+        await asyncio.sleep(due - now)
+
+
+async def messages_task(messenger):
+    # Wiederholungen aus dem Heap des Messengers; höchstens 1 s schlafen,
+    # damit neu eingereihte Nachrichten nicht auf eine lange Wartezeit warten
+    while True:
+        delay = messenger.run_due()
+        await asyncio.sleep(min(delay, 1.0))
+
+
+async def display_task(render, interval):
+    while True:
+        render()
+        await asyncio.sleep(interval)
+
+
+async def scheduler_task(scheduler):
+    # DisplayScheduler ohne eigenen Thread; Ereignisse aus anderen Threads
+    # (GPIO-Callback) wecken die Loop über call_soon_threadsafe
+    loop = asyncio.get_running_loop()
+    wakeup = asyncio.Event()
+    wake = scheduler.wake
+    scheduler.wake = lambda: loop.call_soon_threadsafe(wakeup.set)
+    try:
+        while True:
+            wakeup.clear()
+            delay = scheduler.step()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        scheduler.wake = wake
+
+
+async def _main(coros):
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    tasks = [asyncio.create_task(c) for c in coros]
+    waiter = asyncio.create_task(stop.wait())
+    # Ende bei Signal oder wenn eine Coroutine mit Fehler aussteigt
+    await asyncio.wait(tasks + [waiter], return_when=asyncio.FIRST_COMPLETED)
+    for task in tasks + [waiter]:
+        task.cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+
+def run(*coros):
+    asyncio.run(_main(coros))
@@ -0,0 +1,185 @@
+# APRS Pi – gemeinsamer Start für OLED, Konsole und Headless
+#
+#   python3 -m aprspi --mode oled|console|headless [--dummy] [--asyncio]
+#
+# Renderer und Hardware-Backends werden erst nach Wahl des Modus
+# importiert: die Konsole braucht weder luma noch PIL, ohne UPS-HAT oder
+# smbus läuft alles außer der Akku-Seite. Auch asyncio (Import allein 50-80 ms,
+# mehr als der restliche Start) wird nur mit --asyncio geladen.
+
+import sys
+import argparse
+import importlib
+
+from aprspi.core import Monitor, MYCALL
+from aprspi.display import DisplayScheduler
+from aprspi.endpoints import parse_endpoint
+from aprspi.hardware import open_battery
+
+RENDERERS = {
+    "oled": ("aprspi.render_oled", "OLEDRenderer"),
+    "console": ("aprspi.render_console", "ConsoleRenderer"),
+    "headless": ("aprspi.render_headless", "HeadlessRenderer"),
+}
+
+
+def load_renderer(mode):
+    module, name = RENDERERS[mode]
+    return getattr(importlib.import_module(module), name)
+
+
+def address(text):
+    # "HOST:PORT", "HOST" oder ":PORT"
+    host, _, port = text.rpartition(":") if ":" in text else (text, "", "")
+    try:
+        return host or "127.0.0.1", int(port) if port else None
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ungültige Adresse: {text}")
+
+
+def endpoint(text):
+    try:
+        return parse_endpoint(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def parse_args(argv, mode):
+    parser = argparse.ArgumentParser(prog="aprspi", description="APRS Pi Monitor")
+    parser.add_argument("--mode", choices=RENDERERS, default=mode)
+    parser.add_argument("--mycall", default=MYCALL)
+    parser.add_argument("--dummy", action="store_true", help="OLED: luma-dummy statt SPI-Display")
+    parser.add_argument("--asyncio", action="store_true", help="eine Event-Loop statt Listener-Threads")
+    parser.add_argument("--no-battery", action="store_true", help="INA219 nicht abfragen")
+    parser.add_argument("--kiss", type=endpoint, action="append", metavar="[NAME=]HOST:PORT|DEVICE[@BAUD]",
+                        help="KISS-TNC, mehrfach möglich (Standard 127.0.0.1:8001)")
+    parser.add_argument("--gpsd", type=address, default=("127.0.0.1", 2947), metavar="HOST:PORT",
+                        help="gpsd (Standard 127.0.0.1:2947)")
+    parser.add_argument("--metrics", type=address, metavar="[HOST:]PORT",
+                        help="Prometheus-Kennzahlen unter http://HOST:PORT/metrics (Standard-Port 9110)")
+    parser.add_argument("--fanout", type=address, metavar="[HOST:]PORT",
+                        help="KISS-TCP für weitere Programme anbieten (Standard-Port 8101)")
+    parser.add_argument("--dupe-window", type=float, default=30.0, metavar="SEK",
+                        help="Kopien desselben Pakets innerhalb SEK nur als Pfad zählen (0 = aus)")
+    parser.add_argument("--beacon", action="store_true", help="eigene Position mit SmartBeaconing senden")
+    parser.add_argument("--beacon-path", default="WIDE1-1,WIDE2-1", metavar="PFAD",
+                        help="Digipeater-Pfad der Baken und Nachrichten (leer = direkt)")
+    parser.add_argument("--beacon-symbol", default="/>", metavar="SYM", help="APRS-Symbol, Tabelle und Code")
+    parser.add_argument("--beacon-comment", default="", metavar="TEXT", help="Kommentar hinter der Position")
+    parser.add_argument("--messages", action="store_true",
+                        help="Nachrichten an MYCALL anzeigen und bestätigen, eigene wiederholen bis zum Ack")
+    parser.add_argument("--send", action="append", default=[], metavar="CALL:TEXT",
+                        help="Nachricht beim Start senden (mehrfach möglich, schaltet --messages ein)")
+    parser.add_argument("--gpx", metavar="DIR", help="GPS-Track als GPX in DIR aufzeichnen, eine Datei je Tag")
+    parser.add_argument("--log", metavar="DIR", help="empfangene Frames in DIR mitschreiben (aprspi.packetlog)")
+    parser.add_argument("--once", action="store_true", help="erste Seite zeichnen und beenden (Startzeit)")
+    return parser.parse_args(argv)
+
+
+def build(args):
+    battery = None if args.no_battery else open_battery()
+    gpsd = (args.gpsd[0], args.gpsd[1] or 2947)
+    monitor = Monitor(args.mycall, battery, args.kiss, gpsd)
+    if args.dupe_window > 0:
+        monitor.aprs.dupes.window = args.dupe_window
+    else:
+        monitor.aprs.dupes = None
+    if args.log:
+        from aprspi.packetlog import PacketLog
+        monitor.aprs.log = PacketLog(args.log)
+    if args.gpx:
+        from aprspi.gpx import GPXLogger
+        monitor.gpx = GPXLogger(args.gpx)
+        monitor.gps.tpv_handlers.append(monitor.gpx.add)
+    path = tuple(p for p in args.beacon_path.split(",") if p)
+    if args.beacon:
+        from aprspi.beacon import Beacon
+        if len(args.beacon_symbol) != 2:
+            raise SystemExit("--beacon-symbol: zwei Zeichen, z.B. /> oder /[")
+        monitor.beacon = Beacon(monitor.aprs, args.mycall, path, args.beacon_symbol, args.beacon_comment)
+        monitor.gps.tpv_handlers.append(monitor.beacon.update)
+    if args.messages or args.send:
+        from aprspi.messaging import Messenger
+        monitor.messages = monitor.aprs.messages = Messenger(monitor.aprs, args.mycall, path)
+        for item in args.send:
+            call, sep, text = item.partition(":")
+            try:
+                if not sep:
+                    raise ValueError("Format CALL:TEXT")
+                monitor.messages.send(call, text)
+            except ValueError as e:
+                raise SystemExit(f"--send {item}: {e}")
+    if args.fanout:
+        from aprspi.fanout import KISSFanout, FANOUT_PORT
+        host, port = args.fanout
+        KISSFanout(monitor.aprs, host, port or FANOUT_PORT)
+    options = {"dummy": args.dummy} if args.mode == "oled" else {}
+    renderer = load_renderer(args.mode)(monitor, **options)
+    return monitor, renderer
+
+
+def connect(monitor, renderer, scheduler):
+    # Neue Frames und Fix-Wechsel lösen sofort ein Neuzeichnen aus
+    packet = getattr(renderer, "packet", None)
+
+    def on_packet(pkt, own):
+        if packet:
+            packet(pkt, own)
+        scheduler.packet(pkt, own)
+
+    monitor.aprs.on_packet = on_packet
+    monitor.gps.on_fix = scheduler.fix_changed
+    if monitor.messages is not None:
+        monitor.messages.on_message = scheduler.message
+
+
+def run(monitor, renderer, use_asyncio=False, metrics=None):
+    monitor.setup_sampler()
+    scheduler = DisplayScheduler(renderer.show, renderer.pages, rotate=renderer.rotate,
+                                 inbox=getattr(renderer, "inbox_page", None))
+    if getattr(renderer, "events", True):
+        connect(monitor, renderer, scheduler)
+    if metrics:
+        from aprspi.metrics import MetricsServer, METRICS_PORT
+        host, port = metrics
+        MetricsServer(monitor, scheduler, renderer, host, port or METRICS_PORT).start()
+    renderer.start(scheduler)
+    try:
+        if use_asyncio:
+            from aprspi import aio
+            tasks = [
+                aio.kiss_task(monitor.aprs),
+                aio.gpsd_task(monitor.gps),
+                aio.sampler_task(monitor.sampler),
+                aio.scheduler_task(scheduler),
+            ]
+            if monitor.aprs.fanout is not None:
+                tasks.append(aio.fanout_task(monitor.aprs.fanout))
+            if monitor.messages is not None:
+                tasks.append(aio.messages_task(monitor.messages))
+            aio.run(*tasks)
+        else:
+            monitor.start()
+            scheduler.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.stop()
+        renderer.stop()
+
+
+def first_frame(monitor, renderer):
+    # Für die Startzeitmessung: wie run(), aber nach der ersten Seite Ende
+    monitor.setup_sampler()
+    monitor.start()
+    renderer.show(0)
+    monitor.stop()
+
+
+def main(argv=None, mode="console"):
+    args = parse_args(sys.argv[1:] if argv is None else argv, mode)
+    monitor, renderer = build(args)
+    if args.once:
+        first_frame(monitor, renderer)
+    else:
+        run(monitor, renderer, args.asyncio, args.metrics)
@@ -0,0 +1,351 @@
+# APRS Pi – APRS-Infofeld-Parser (Position, komprimiert, Mic-E, Nachrichten,
+# Objekte, Status, Telemetrie)
+#
+# APRSPacket klassifiziert nur anhand des Datentyp-Zeichens (DTI). Die
+# eigentliche Dekodierung passiert erst beim ersten Zugriff auf .data bzw.
+# die Properties und wird für identische Nutzlasten (Baken!) zwischengespeichert.
+
+import re
+import math
+from functools import lru_cache
+from types import MappingProxyType
+
+# === Klassifizierung über das Datentyp-Zeichen ===
+_DTI_KINDS = {
+    "!": "position", "=": "position", "/": "position", "@": "position",
+    "`": "mic-e", "'": "mic-e", "\x1c": "mic-e", "\x1d": "mic-e",
+    ":": "message",
+    ";": "object",
+    ")": "item",
+    ">": "status",
+    "T": "telemetry",
+    "_": "weather",
+    "$": "nmea",
+    "}": "third-party",
+    "<": "capabilities",
+    "?": "query",
+}
+
+MICE_MESSAGES = ["Emergency", "Priority", "Special", "Committed",
+                 "Returning", "In Service", "En Route", "Off Duty"]
+
+_EMPTY = MappingProxyType({})
+
+_UNCOMPRESSED = re.compile(
+    r"(\d[\d ]{3}\.[\d ]{2})([NS])(.)(\d[\d ]{4}\.[\d ]{2})([EW])(.)")
+_CSE_SPD = re.compile(r"(\d{3})/(\d{3})")
+_ALTITUDE = re.compile(r"/A=(-?\d{5,6})")
+_TIMESTAMP = re.compile(r"\d{6}[zh/]")
+
+
+def classify(info):
+    if not info:
+        return "empty"
+    return _DTI_KINDS.get(chr(info[0]), "other")
+
+
+# === Einzelne Formate ===
+def _base91(text):
+    value = 0
+    for ch in text:
+        value = value * 91 + ord(ch) - 33
+    return value
+
+
+def _parse_uncompressed(text):
+    m = _UNCOMPRESSED.match(text)
+    if not m:
+        raise ValueError("ungültige Positionsangabe")
+    lat_s, ns, table, lon_s, ew, code = m.groups()
+    # Positionsmehrdeutigkeit: Leerzeichen stehen für unbekannte Stellen
+    lat_s = lat_s.replace(" ", "0")
+    lon_s = lon_s.replace(" ", "0")
+    lat = int(lat_s[:2]) + float(lat_s[2:]) / 60
+    lon = int(lon_s[:3]) + float(lon_s[3:]) / 60
+    fields = {
+        "lat": -lat if ns == "S" else lat,
+        "lon": -lon if ew == "W" else lon,
+        "symbol": table + code,
+    }
+    comment = text[19:]
+    ext = _CSE_SPD.match(comment)
+    if ext:
+        fields["course"] = int(ext.group(1))
+        fields["speed"] = int(ext.group(2)) * 1.852
+        comment = comment[7:]
+    return fields, comment
+
+
+def _parse_compressed(text):
+    if len(text) < 13:
+        raise ValueError("komprimierte Position zu kurz")
+    fields = {
+        "lat": 90 - _base91(text[1:5]) / 380926,
+        "lon": -180 + _base91(text[5:9]) / 190463,
+        "symbol": text[0] + text[9],
+    }
+    c, s, t = text[10], text[11], text[12]
+    if c != " ":
+        cs = ord(c) - 33
+        if (ord(t) - 33) & 0x18 == 0x10:
+            # GGA-Quelle: cs enthält die Höhe in Fuß
+            fields["alt"] = 1.002 ** _base91(c + s) * 0.3048
+        elif 0 <= cs <= 89:
+            fields["course"] = cs * 4
+            fields["speed"] = (1.08 ** (ord(s) - 33) - 1) * 1.852
+    return fields, text[13:]
+
+
+def _parse_position(text):
+    if text[:1].isdigit():
+        return _parse_uncompressed(text)
+    return _parse_compressed(text)
+
+
+def _finish(fields, comment):
+    alt = _ALTITUDE.search(comment)
+    if alt and "alt" not in fields:
+        fields["alt"] = int(alt.group(1)) * 0.3048
+    fields["comment"] = comment.strip()
+    return fields
+
+
+def _decode_position(text):
+    dti = text[0]
+    body = text[8:] if dti in "/@" else text[1:]
+    fields, comment = _parse_position(body)
+    fields["messaging"] = dti in "=@"
+    return _finish(fields, comment)
+
+
+def _decode_mice(dest, text):
+    if len(dest) < 6 or len(text) < 9:
+        raise ValueError("Mic-E zu kurz")
+    digits = []
+    bits = 0
+    custom = False
+    for i, ch in enumerate(dest[:6]):
+        if "0" <= ch <= "9":
+            digits.append(ord(ch) - 48)
+        elif "A" <= ch <= "J":
+            digits.append(ord(ch) - 65)
+            custom = True
+        elif "P" <= ch <= "Y":
+            digits.append(ord(ch) - 80)
+        elif ch in "KLZ":
+            digits.append(0)
+        else:
+            raise ValueError("ungültiges Mic-E-Zielfeld")
+        if i < 3:
+            bits = bits << 1 | ("A" <= ch <= "K" or "P" <= ch <= "Z")
+    lat = digits[0] * 10 + digits[1] + (digits[2] * 10 + digits[3] + (digits[4] * 10 + digits[5]) / 100) / 60
+    north = "P" <= dest[3] <= "Z"
+    lon_offset = "P" <= dest[4] <= "Z"
+    west = "P" <= dest[5] <= "Z"
+
+    d = ord(text[1]) - 28 + (100 if lon_offset else 0)
+    if 180 <= d <= 189:
+        d -= 80
+    elif 190 <= d <= 199:
+        d -= 190
+    m = ord(text[2]) - 28
+    if m >= 60:
+        m -= 60
+    h = ord(text[3]) - 28
+    lon = d + (m + h / 100) / 60
+
+    sp = ord(text[4]) - 28
+    dc = ord(text[5]) - 28
+    se = ord(text[6]) - 28
+    speed = sp * 10 + dc // 10
+    course = (dc % 10) * 100 + se
+    if speed >= 800:
+        speed -= 800
+    if course >= 400:
+        course -= 400
+
+    status = MICE_MESSAGES[bits]
+    fields = {
+        "lat": lat if north else -lat,
+        "lon": -lon if west else lon,
+        "symbol": text[8] + text[7],
+        "course": course,
+        "speed": speed * 1.852,
+        "mice_status": f"Custom-{bits}" if custom else status,
+    }
+    comment = text[9:]
+    # Höhe: drei Base91-Zeichen gefolgt von "}" (optional nach Typ-Byte)
+    brace = comment.find("}", 0, 5)
+    if brace >= 3:
+        fields["alt"] = _base91(comment[brace - 3:brace]) - 10000
+        comment = comment[:brace - 3] + comment[brace + 1:]
+    return _finish(fields, comment)
+
+
+def _reply_ack(fields, msgno):
+    # Reply-Ack "MM}AA": MM ist die eigene Nummer, AA bestätigt eine Nachricht der Gegenseite
+    msgno, _, reply = msgno.partition("}")
+    fields["msgno"] = msgno.strip()
+    if reply.strip():
+        fields["reply_ack"] = reply.strip()
+
+
+def _decode_message(text):
+    if len(text) < 11 or text[10] != ":":
+        raise ValueError("ungültige Nachricht")
+    body = text[11:]
+    fields = {"addressee": text[1:10].strip()}
+    head, sep, msgno = body.rpartition("{")
+    if sep:
+        body = head
+        _reply_ack(fields, msgno)
+    if body[:3] in ("ack", "rej") and "msgno" not in fields:
+        fields["msg_type"] = body[:3]
+        _reply_ack(fields, body[3:])
+    elif body.startswith(("PARM.", "UNIT.", "EQNS.", "BITS.")):
+        fields["msg_type"] = "telemetry-def"
+    else:
+        fields["msg_type"] = "message"
+    fields["text"] = body
+    return fields
+
+
+def _decode_object(text):
+    if len(text) < 18:
+        raise ValueError("Objekt zu kurz")
+    fields, comment = _parse_position(text[18:])
+    fields["name"] = text[1:10].rstrip()
+    fields["alive"] = text[10] == "*"
+    return _finish(fields, comment)
+
+
+def _decode_item(text):
+    end = min((i for i in (text.find("!", 1), text.find("_", 1)) if i > 0), default=-1)
+    if end < 4:
+        raise ValueError("ungültiges Item")
+    fields, comment = _parse_position(text[end + 1:])
+    fields["name"] = text[1:end]
+    fields["alive"] = text[end] == "!"
+    return _finish(fields, comment)
+
+
+def _decode_status(text):
+    body = text[1:]
+    if _TIMESTAMP.match(body):
+        body = body[7:]
+    return {"status": body.strip()}
+
+
+def _decode_telemetry(text):
+    if not text.startswith("T#"):
+        raise ValueError("ungültige Telemetrie")
+    parts = text[2:].split(",")
+    if len(parts) < 6:
+        raise ValueError("Telemetrie zu kurz")
+    return {
+        "seq": parts[0],
+        "analog": tuple(float(v) if v else None for v in parts[1:6]),
+        "digital": parts[6][:8] if len(parts) > 6 else "",
+    }
+
+
+_DECODERS = {
+    "position": _decode_position,
+    "message": _decode_message,
+    "object": _decode_object,
+    "item": _decode_item,
+    "status": _decode_status,
+    "telemetry": _decode_telemetry,
+}
+
+
+@lru_cache(maxsize=512)
+def decode_info(kind, dest, info):
+    # Ergebnis wird zwischen Paketen geteilt, daher nur lesbar. dest wird nur
+    # für Mic-E gebraucht und sonst als "" übergeben (bessere Trefferquote).
+    text = info.decode("latin-1")
+    try:
+        if kind == "mic-e":
+            fields = _decode_mice(dest, text)
+        elif kind in _DECODERS:
+            fields = _DECODERS[kind](text)
+        else:
+            return _EMPTY
+    except (ValueError, IndexError) as e:
+        return MappingProxyType({"error": str(e)})
+    return MappingProxyType(fields)
+
+
+# === Kodierung (eigene Baken) ===
+def _base91_encode(value, width):
+    chars = []
+    for _ in range(width):
+        value, digit = divmod(value, 91)
+        chars.append(chr(digit + 33))
+    return "".join(reversed(chars))
+
+
+def encode_compressed(lat, lon, symbol="/>", course=None, speed=None, messaging=False):
+    # Komprimierte Position (13 Zeichen statt 19+7): Breite/Länge je 4 Zeichen
+    # Base91, Kurs/Geschwindigkeit (km/h) in 2 Zeichen; Gegenstück zu _parse_compressed
+    y = round(380926 * (90 - max(-90.0, min(90.0, lat))))
+    x = round(190463 * (180 + max(-180.0, min(180.0, lon))))
+    if course is not None and speed is not None:
+        knots = max(speed, 0.0) / 1.852
+        cs = chr(33 + round(course / 4) % 90) + chr(33 + min(round(math.log(knots + 1) / math.log(1.08)), 89))
+        # Typ-Byte: aktueller Fix, NMEA-Quelle RMC (Kurs/Geschwindigkeit)
+        cst = cs + chr(33 + 0x20 + 0x18)
+    else:
+        cst = "   "
+    text = ("=" if messaging else "!") + symbol[0] + _base91_encode(y, 4) + _base91_encode(x, 4) + symbol[1] + cst
+    return text.encode("latin-1")
+
+
+# === Paket ===
+class APRSPacket:
+    __slots__ = ("frame", "kind", "endpoint", "channel", "_data")
+
+    def __init__(self, frame, endpoint=None, channel=0):
+        self.frame = frame
+        self.kind = classify(frame.info)
+        # Herkunft: Name des KISS-Endpunkts und KISS-Port (Funkkanal)
+        self.endpoint = endpoint
+        self.channel = channel
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            dest = self.frame.dest.call if self.kind == "mic-e" else ""
+            self._data = decode_info(self.kind, dest, self.frame.info)
+        return self._data
+
+    @property
+    def source(self):
+        return str(self.frame.src)
+
+    @property
+    def position(self):
+        data = self.data
+        if "lat" in data:
+            return data["lat"], data["lon"]
+        return None
+
+    @property
+    def comment(self):
+        return self.data.get("comment", "")
+
+    @property
+    def text(self):
+        # Kurzer Anzeigetext, wie bisher aus dem Infofeld
+        data = self.data
+        if "text" in data:
+            return f"@{data['addressee']}: {data['text']}"
+        if data.get("status"):
+            return data["status"]
+        if data.get("comment"):
+            return data["comment"]
+        return self.frame.info.decode(errors="ignore").strip()
+
+    def __repr__(self):
+        return f"APRSPacket({self.kind}, {self.frame!s})"
@@ -0,0 +1,112 @@
+# APRS Pi – AX.25 UI-Frame-Decoder mit Digipeater-Pfad
+#
+# Direwolf liefert über KISS Frames ohne FCS: Adressfeld (Ziel, Quelle,
+# bis zu 8 Digipeater à 7 Byte), Control, PID, Info.
+
+ADDR_LEN = 7
+MAX_DIGIS = 8
+CTRL_UI = 0x03
+PID_NO_L3 = 0xF0
+
+# Callsign-Bytes sind um ein Bit nach links verschoben: einmalig vorberechnete
+# Tabelle statt chr(b >> 1) für jedes einzelne Byte
+_CALL_TABLE = bytes(i >> 1 for i in range(256))
+
+
+class AX25Address:
+    __slots__ = ("call", "ssid", "repeated")
+
+    def __init__(self, call, ssid=0, repeated=False):
+        self.call = call
+        self.ssid = ssid
+        self.repeated = repeated
+
+    def __str__(self):
+        name = f"{self.call}-{self.ssid}" if self.ssid else self.call
+        return name + "*" if self.repeated else name
+
+    def __repr__(self):
+        return f"AX25Address({str(self)!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, AX25Address):
+            return NotImplemented
+        return (self.call, self.ssid, self.repeated) == (other.call, other.ssid, other.repeated)
+
+    def __hash__(self):
+        return hash((self.call, self.ssid, self.repeated))
+
+    @classmethod
+    def parse(cls, text):
+        # "WIDE1-1*" -> AX25Address("WIDE1", 1, True)
+        repeated = text.endswith("*")
+        call, _, ssid = text.rstrip("*").partition("-")
+        return cls(call.upper(), int(ssid or 0), repeated)
+
+
+class AX25Frame:
+    __slots__ = ("dest", "src", "path", "control", "pid", "info")
+
+    def __init__(self, dest, src, path, control, pid, info):
+        self.dest = dest
+        self.src = src
+        self.path = path
+        self.control = control
+        self.pid = pid
+        self.info = info
+
+    def __str__(self):
+        # TNC2-Monitorformat: SRC>DEST,DIGI1*,DIGI2:info
+        head = f"{self.src}>{self.dest.call}" + (f"-{self.dest.ssid}" if self.dest.ssid else "")
+        if self.path:
+            head += "," + ",".join(str(d) for d in self.path)
+        return head + ":" + self.info.decode("latin-1")
+
+    def __repr__(self):
+        return f"AX25Frame({str(self)!r})"
+
+
+def decode_ax25(data):
+    # Wirft ValueError für alles, was kein gültiger UI-Frame ist
+    size = len(data)
+    if size < 2 * ADDR_LEN + 2:
+        raise ValueError("AX.25-Frame zu kurz")
+    if data[ADDR_LEN - 1] & 0x01:
+        raise ValueError("AX.25-Adressfeld ohne Quelle")
+    # Ende-Bit suchen: letztes Byte jeder 7-Byte-Adresse
+    end = 2 * ADDR_LEN - 1
+    while not data[end] & 0x01:
+        end += ADDR_LEN
+        if end >= size or end > (2 + MAX_DIGIS) * ADDR_LEN:
+            raise ValueError("AX.25-Adressfeld ohne Ende-Bit")
+    pos = end + 1
+    if pos + 2 > size:
+        raise ValueError("AX.25-Frame ohne Control/PID")
+    control = data[pos]
+    if control & 0xEF != CTRL_UI:
+        raise ValueError("kein AX.25-UI-Frame")
+    # Ganzes Adressfeld in einem Schritt über die Tabelle dekodieren
+    text = data[:pos].translate(_CALL_TABLE).decode("latin-1")
+    dest = AX25Address(text[0:6].rstrip(), (data[6] >> 1) & 0x0F)
+    src = AX25Address(text[7:13].rstrip(), (data[13] >> 1) & 0x0F)
+    path = tuple([AX25Address(text[p:p + 6].rstrip(), (data[p + 6] >> 1) & 0x0F, data[p + 6] & 0x80 != 0)
+                  for p in range(2 * ADDR_LEN, pos, ADDR_LEN)])
+    return AX25Frame(dest, src, path, control, data[pos + 1], bytes(data[pos + 2:]))
+
+
+def encode_address(addr, last=False):
+    call = addr.call.upper().ljust(6)[:6].encode("ascii")
+    flags = 0x60 | (addr.ssid & 0x0F) << 1 | (0x80 if addr.repeated else 0) | (0x01 if last else 0)
+    return bytes(c << 1 for c in call) + bytes((flags,))
+
+
+def encode_header(src, dest, path=()):
+    # Adressfeld, Control und PID eines UI-Frames; für eigene Baken einmal vorab
+    # src, dest und path dürfen AX25Address oder TNC2-Text ("WIDE2-1") sein
+    addrs = [a if isinstance(a, AX25Address) else AX25Address.parse(a) for a in (dest, src, *path)]
+    header = b''.join(encode_address(a, last=(i == len(addrs) - 1)) for i, a in enumerate(addrs))
+    return header + bytes((CTRL_UI, PID_NO_L3))
+
+
+def encode_ui(src, dest, path=(), info=b''):
+    return encode_header(src, dest, path) + info
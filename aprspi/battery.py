@@ -0,0 +1,156 @@
+# APRS Pi – INA219-Akkuüberwachung (UPS HAT D)
+#
+# sample() wird vom Sampler mit fester Rate aufgerufen (z. B. 10 Hz) und legt
+# Spannung/Strom in kompakten array('f')-Ringpuffern ab. Daraus ergeben sich
+# gleitende Mittelwerte, per Coulomb-Zählung der Ladezustand und die
+# Restlaufzeit sowie ein Verlauf für die Grafik auf der Akku-Seite.
+
+import time
+from array import array
+
+REG_BUSVOLTAGE = 0x02
+REG_CURRENT = 0x04
+REG_CALIBRATION = 0x05
+
+# Werte wie im Waveshare-Beispiel für den UPS HAT (D)
+CALIBRATION = 26868
+CURRENT_LSB = 0.1524
+
+EMPTY_VOLTAGE = 3.0
+FULL_VOLTAGE = 4.2
+# Voll geladen: Spannung oben und kaum noch Ladestrom
+FULL_ANCHOR_VOLTAGE = 4.15
+FULL_ANCHOR_CURRENT = 50.0
+# Längere Lücken (Sampler hing) nicht integrieren
+MAX_GAP = 5.0
+
+
+def voltage_percent(voltage):
+    return max(0.0, min(100.0, (voltage - EMPTY_VOLTAGE) / (FULL_VOLTAGE - EMPTY_VOLTAGE) * 100))
+
+
+def battery_state(current):
+    return "CHG" if current > 10 else "DSCH" if current < -10 else "---"
+
+
+class INA219Battery:
+    def __init__(self, bus, addr=0x43, window=50, capacity_mah=3000.0,
+                 history_len=128, history_interval=60.0):
+        self.bus = bus
+        self.addr = addr
+        self.window = window
+        self.capacity_mah = capacity_mah
+        self.history_interval = history_interval
+        self.charge_mah = 0.0
+        self.samples = 0
+        self._volts = array('f', bytes(4 * window))
+        self._amps = array('f', bytes(4 * window))
+        self._pos = 0
+        self._filled = 0
+        self._sum_v = 0.0
+        self._sum_i = 0.0
+        self._soc0 = None
+        self._last = None
+        self._last_current = 0.0
+        self._history = array('f', bytes(4 * history_len))
+        self._hist_pos = 0
+        self._hist_count = 0
+        self._hist_last = None
+        self._calibrated = False
+
+    # === Hardware ===
+    def _read(self, reg):
+        # INA219 ist big-endian, SMBus liefert little-endian
+        raw = self.bus.read_word_data(self.addr, reg)
+        return ((raw & 0xFF) << 8) | (raw >> 8)
+
+    def calibrate(self):
+        value = ((CALIBRATION & 0xFF) << 8) | (CALIBRATION >> 8)
+        self.bus.write_word_data(self.addr, REG_CALIBRATION, value)
+        self._calibrated = True
+
+    def sample(self, now=None):
+        if not self._calibrated:
+            # Kalibrierregister geht nach Stromausfall verloren, ohne ist der Strom 0
+            self.calibrate()
+        voltage = (self._read(REG_BUSVOLTAGE) >> 3) * 0.004
+        raw = self._read(REG_CURRENT)
+        current = (raw - 65536 if raw >= 32768 else raw) * CURRENT_LSB
+        self.add_sample(voltage, current, now)
+
+    # === Auswertung ===
+    def add_sample(self, voltage, current, now=None):
+        now = time.monotonic() if now is None else now
+        pos = self._pos
+        if self._filled == self.window:
+            self._sum_v -= self._volts[pos]
+            self._sum_i -= self._amps[pos]
+        else:
+            self._filled += 1
+        self._volts[pos] = voltage
+        self._amps[pos] = current
+        self._sum_v += voltage
+        self._sum_i += current
+        self._pos = (pos + 1) % self.window
+        if self._pos == 0:
+            # Rundungsfehler der laufenden Summen einmal pro Umlauf bereinigen
+            self._sum_v = sum(self._volts)
+            self._sum_i = sum(self._amps)
+        self.samples += 1
+
+        # Coulomb-Zählung (Trapezregel), Strom in mA -> mAh
+        if self._last is not None and 0 < now - self._last <= MAX_GAP:
+            self.charge_mah += (current + self._last_current) / 2 * (now - self._last) / 3600
+        self._last = now
+        self._last_current = current
+
+        if self._filled == self.window:
+            if self._soc0 is None:
+                # Startwert aus der gemittelten Ruhespannung
+                self._anchor(voltage_percent(self.voltage))
+            elif self.voltage >= FULL_ANCHOR_VOLTAGE and 0 <= self.current < FULL_ANCHOR_CURRENT:
+                self._anchor(100.0)
+
+        if self._hist_last is None or now - self._hist_last >= self.history_interval:
+            self._hist_last = now
+            self._history[self._hist_pos] = self.percent
+            self._hist_pos = (self._hist_pos + 1) % len(self._history)
+            self._hist_count = min(self._hist_count + 1, len(self._history))
+
+    def _anchor(self, percent):
+        self._soc0 = percent
+        self.charge_mah = 0.0
+
+    @property
+    def voltage(self):
+        return self._sum_v / self._filled if self._filled else 0.0
+
+    @property
+    def current(self):
+        return self._sum_i / self._filled if self._filled else 0.0
+
+    @property
+    def percent(self):
+        if self._soc0 is None:
+            return voltage_percent(self.voltage)
+        return max(0.0, min(100.0, self._soc0 + self.charge_mah / self.capacity_mah * 100))
+
+    def runtime_hours(self):
+        # Restlaufzeit bei aktuellem (gemitteltem) Entladestrom, sonst None
+        current = self.current
+        if current >= -10:
+            return None
+        return self.percent / 100 * self.capacity_mah / -current
+
+    def status(self):
+        # Gleiches Tupel wie früher get_battery_status()
+        if not self._filled or time.monotonic() - self._last > MAX_GAP:
+            return 0, 0.0, 0.0, "Err"
+        current = self.current
+        return self.percent, self.voltage, current, battery_state(current)
+
+    def history(self):
+        # Ladezustände, älteste zuerst
+        size = len(self._history)
+        start = (self._hist_pos - self._hist_count) % size
+        return [self._history[(start + i) % size] for i in range(self._hist_count)]
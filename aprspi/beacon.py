@@ -0,0 +1,99 @@
+# APRS Pi – eigene Positionsbaken mit SmartBeaconing
+#
+# SmartBeaconing (nach HamHUD/Direwolf): im Stand alle slow_rate Sekunden,
+# ab fast_speed alle fast_rate Sekunden, dazwischen umgekehrt proportional
+# zur Geschwindigkeit. Richtungswechsel über turn_angle + turn_slope/Tempo
+# lösen sofort eine Bake aus ("Corner Pegging"), frühestens nach turn_time.
+# Geschwindigkeiten in km/h; Direwolfs turn_slope=255 (mph) entspricht 410.
+#
+# Die Bake ist eine komprimierte Position (aprspi/aprs.py). Adressfeld mit
+# Rufzeichen und Pfad sowie der KISS-Kopf werden einmal vorab kodiert, je
+# Bake wird nur noch das Infofeld escaped und angehängt und über
+# KISSListener.send_kiss() an den TNC geschrieben.
+#
+#   python3 -m aprspi --beacon --beacon-path WIDE1-1,WIDE2-1
+
+import time
+
+from aprspi.ax25 import encode_header
+from aprspi.aprs import encode_compressed
+from aprspi.kiss import kiss_escape, CMD_DATA
+
+# Experimentelles Ziel (APZxxx) statt eines registrierten Tocalls
+BEACON_DEST = "APZAPI"
+BEACON_PATH = ("WIDE1-1", "WIDE2-1")
+
+
+class SmartBeacon:
+    def __init__(self, fast_speed=90.0, fast_rate=60.0, slow_speed=5.0, slow_rate=1800.0,
+                 turn_time=15.0, turn_angle=30.0, turn_slope=410.0):
+        self.fast_speed = fast_speed
+        self.fast_rate = fast_rate
+        self.slow_speed = slow_speed
+        self.slow_rate = slow_rate
+        self.turn_time = turn_time
+        self.turn_angle = turn_angle
+        self.turn_slope = turn_slope
+        self.last_time = None
+        self.last_course = None
+
+    def rate(self, speed):
+        if speed < self.slow_speed:
+            return self.slow_rate
+        if speed >= self.fast_speed:
+            return self.fast_rate
+        return self.fast_rate * self.fast_speed / speed
+
+    def due(self, now, speed, course=None):
+        # True, wenn jetzt eine Bake fällig ist; merkt sich dann Zeit und Kurs
+        if self.last_time is None:
+            return self._sent(now, course)
+        elapsed = now - self.last_time
+        if elapsed >= self.rate(speed):
+            return self._sent(now, course)
+        if speed >= self.slow_speed and course is not None and self.last_course is not None:
+            turn = abs((course - self.last_course + 180) % 360 - 180)
+            if turn > self.turn_angle + self.turn_slope / speed and elapsed >= self.turn_time:
+                return self._sent(now, course)
+        return False
+
+    def _sent(self, now, course):
+        self.last_time = now
+        self.last_course = course
+        return True
+
+
+class Beacon:
+    def __init__(self, listener, mycall, path=BEACON_PATH, symbol="/>", comment="", smart=None,
+                 endpoint=None, port=0):
+        self.listener = listener
+        self.symbol = symbol
+        self.comment = comment.encode("latin-1")
+        self.smart = smart or SmartBeacon()
+        self.endpoint = endpoint
+        # FEND, Typbyte und Adressfeld einmal vorab, KISS-escaped
+        self._prefix = b'\xC0' + kiss_escape(bytes(((port & 0x0F) << 4 | CMD_DATA,))
+                                             + encode_header(mycall, BEACON_DEST, path))
+        self.sent = 0
+        self.last_sent = None
+        self.last_info = None
+
+    def frame(self, info):
+        return self._prefix + kiss_escape(info) + b'\xC0'
+
+    def position(self, lat, lon, course=None, speed=None):
+        info = encode_compressed(lat, lon, self.symbol, course, speed) + self.comment
+        self.listener.send_kiss(self.frame(info), self.endpoint)
+        self.sent += 1
+        self.last_sent = time.monotonic()
+        self.last_info = info
+
+    def update(self, tpv, now=None):
+        # Abnehmer für GPSListener.tpv_handlers; gpsd liefert m/s und Kurs in Grad
+        now = time.monotonic() if now is None else now
+        speed = tpv.get('speed')
+        speed = speed * 3.6 if speed is not None else 0.0
+        course = tpv.get('track')
+        if self.smart.due(now, speed, course):
+            moving = speed >= self.smart.slow_speed and course is not None
+            self.position(tpv['lat'], tpv['lon'], course if moving else None, speed if moving else None)
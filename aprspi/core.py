@@ -0,0 +1,101 @@
+# APRS Pi – gemeinsames Datenmodell für alle Anzeigen
+#
+# Monitor bündelt Listener, Sampler, NTP und (falls vorhanden) den Akku
+# sowie die GPS-Hilfsfunktionen, die früher in jedem Skript doppelt standen.
+# Hardware wird hier nicht angefasst; Akku und Display kommen aus
+# aprspi/hardware.py und werden erst beim Start geöffnet.
+
+import time
+
+from aprspi import sensors
+from aprspi.sampler import Sampler
+from aprspi.ntp import NTPQuery, FAILED
+from aprspi.listeners import GPSListener, KISSListener
+
+MYCALL = "OE5ITH"
+NO_BATTERY = (0, 0.0, 0.0, "Err")
+
+
+class Monitor:
+    # kiss: Liste von KISSEndpoint (aprspi/endpoints.py), None = 127.0.0.1:8001
+    # gpsd: (host, port); beides z.B. auf aprspi.simulator umleitbar
+    def __init__(self, mycall=MYCALL, battery=None, kiss=None, gpsd=("127.0.0.1", 2947)):
+        self.mycall = mycall
+        self.gps = GPSListener(*gpsd)
+        self.aprs = KISSListener(mycall, endpoints=kiss)
+        # Entfernungen folgen der eigenen Position
+        self.geo = self.aprs.stations.geo
+        self.gps.tpv_handlers.append(lambda tpv: self.geo.set_origin(tpv['lat'], tpv['lon']))
+        self.sampler = Sampler()
+        self.ntp = NTPQuery()
+        # INA219Battery oder None (kein UPS-HAT, kein I2C)
+        self.battery = battery
+        # GPXLogger (aprspi/gpx.py) oder None
+        self.gpx = None
+        # Beacon (aprspi/beacon.py) oder None
+        self.beacon = None
+        # Messenger (aprspi/messaging.py) oder None
+        self.messages = None
+
+    @property
+    def values(self):
+        return self.sampler.cache
+
+    # === GPS ===
+    def gps_status(self):
+        tpv = self.gps.last_tpv
+        return "OK" if tpv and hasattr(tpv, 'lat') else "No Fix"
+
+    def gps_coords(self):
+        tpv = self.gps.last_tpv
+        if tpv:
+            return getattr(tpv, 'lat', 0.0), getattr(tpv, 'lon', 0.0), getattr(tpv, 'alt', 0.0)
+        return 0.0, 0.0, 0.0
+
+    def gps_sats(self):
+        sky = self.gps.last_sky
+        if sky and hasattr(sky, 'satellites'):
+            return sum(1 for sat in sky.satellites if hasattr(sat, 'used') and sat.used)
+        return 0
+
+    # === Ablauf ===
+    def setup_sampler(self):
+        # Intervall je Quelle in Sekunden; die Seiten lesen nur noch den Cache
+        sampler = self.sampler
+        sampler.add("cpu", sensors.cpu_percent, 2, default=0.0)
+        sampler.add("temp", sensors.cpu_temp, 5, default="N/A")
+        sampler.add("mem", sensors.mem_percent, 10, default=0.0)
+        sampler.add("disk", sensors.disk_percent, 60, default=0.0)
+        if self.battery is not None:
+            # Eigener Thread: feste 10 Hz auch, wenn ntp bis zum Timeout hängt
+            sampler.add("ina219", self.battery.sample, 0.1, own_thread=True)
+            sampler.add("battery", self.battery.status, 1, default=NO_BATTERY)
+        else:
+            sampler.cache.define("battery", None, NO_BATTERY)
+        sampler.add("ntp", self.ntp.query, 30, default=FAILED)
+        sampler.add("boot_time", sensors.boot_time, 3600, default=time.time())
+        # NTP kann bis zum Timeout blockieren, das erledigt der Sampler-Thread
+        sampler.prime(exclude=("ntp",))
+
+    def start(self):
+        self.gps.start()
+        self.aprs.start()
+        self.sampler.start()
+        if self.messages is not None:
+            self.messages.start()
+
+    def stop(self):
+        self.aprs.stop()
+        self.gps.stop()
+        self.sampler.stop()
+        if self.messages is not None:
+            self.messages.stop()
+        if self.gpx is not None:
+            # Gepufferte Punkte schreiben und fsync
+            self.gpx.close()
+        if self.aprs.log is not None:
+            # Listener-Thread erst auslaufen lassen, ein letztes append() nach
+            # close() würde sonst eine neue Datei anlegen
+            if self.aprs.is_alive():
+                self.aprs.join(2)
+            self.aprs.log.close()
@@ -0,0 +1,76 @@
+# APRS Pi – Duplikaterkennung mit Zeitfenster (wie das 30-s-Dupe-Fenster von APRS-IS)
+#
+# Durch Digipeater kommt dasselbe Paket innerhalb weniger Sekunden mehrfach
+# an. Schlüssel ist das Tupel aus Quelle, Ziel und Info, der Pfad zählt nicht.
+# Einträge liegen in Einfügereihenfolge im OrderedDict: Nachschlagen und
+# Einfügen O(1), abgelaufene Einträge werden vorne abgeschnitten, mehr als
+# max_entries verdrängen den ältesten. Das Fenster beginnt mit der ersten
+# Kopie und wird durch weitere Kopien nicht verlängert.
+
+import time
+from collections import OrderedDict
+
+DUPE_WINDOW = 30.0
+# Pfade je Eintrag (Kopie 1 ... n), mehr braucht die Anzeige nicht
+MAX_PATHS = 8
+
+
+class DupeEntry:
+    __slots__ = ("first_seen", "count", "paths")
+
+    def __init__(self, now):
+        self.first_seen = now
+        self.count = 0
+        self.paths = []
+
+
+class DupeCache:
+    def __init__(self, window=DUPE_WINDOW, max_entries=4096):
+        self.window = window
+        self.max_entries = max_entries
+        self.duplicates = 0
+        self.evicted = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(frame):
+        # Das Tupel selbst, nicht sein Hash: bei einer Hash-Kollision vergleicht
+        # das dict die Tupel, zwei verschiedene Pakete bleiben verschieden
+        return (frame.src.call, frame.src.ssid, frame.dest.call, frame.dest.ssid, frame.info)
+
+    def check(self, frame, digis=None, now=None):
+        # Liefert den Eintrag; count > 1 heißt Duplikat. digis: relayed_by(frame.path)
+        now = time.monotonic() if now is None else now
+        self.expire(now)
+        key = self.key(frame)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = DupeEntry(now)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+        else:
+            self.duplicates += 1
+        entry.count += 1
+        if len(entry.paths) < MAX_PATHS:
+            entry.paths.append(relayed_by(frame.path) if digis is None else digis)
+        return entry
+
+    def expire(self, now):
+        entries = self._entries
+        limit = now - self.window
+        while entries:
+            entry = next(iter(entries.values()))
+            if entry.first_seen > limit:
+                break
+            entries.popitem(last=False)
+
+
+def relayed_by(path):
+    # Digipeater mit gesetztem H-Bit, ohne Alias wie WIDE1/WIDE2 (die tragen
+    # das H-Bit nur, wenn der Digipeater sich nicht eingetragen hat)
+    return tuple(d.call if not d.ssid else f"{d.call}-{d.ssid}"
+                 for d in path if d.repeated and not d.call.startswith(("WIDE", "TRACE", "RELAY")))
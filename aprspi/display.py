@@ -0,0 +1,129 @@
+# APRS Pi – ereignisgesteuerte Anzeige
+#
+# Statt fest alle 10 s umzuschalten wartet die Anzeige auf Ereignisse: neues
+# APRS-Frame, Wechsel des GPS-Fix, Taster an GPIO17 und der Timer für den
+# automatischen Seitenwechsel. Ereignisse kurz hintereinander werden zu einem
+# Neuzeichnen zusammengefasst (min_interval), damit eine Paketflut den
+# SPI-Bus nicht dauerhaft belegt.
+
+import time
+import threading
+from collections import Counter
+
+from aprspi.metrics import Histogram, RENDER_BUCKETS
+
+BUTTON_GPIO = 17
+
+FRAME = "frame"
+OWN_FRAME = "own"
+MESSAGE = "message"
+FIX = "fix"
+BUTTON = "button"
+
+
+def watch_button(callback, pin=BUTTON_GPIO, bouncetime=200):
+    # Flankeninterrupt wie in V2.1; ohne RPi.GPIO (PC, dummy) kein Taster
+    try:
+        import RPi.GPIO as GPIO
+    except (ImportError, RuntimeError):
+        return False
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+    GPIO.add_event_detect(pin, GPIO.FALLING, callback=callback, bouncetime=bouncetime)
+    return True
+
+
+class DisplayScheduler(threading.Thread):
+    def __init__(self, render, pages, rotate=10.0, hold=30.0, min_interval=0.25, home=0, inbox=None):
+        super().__init__(daemon=True)
+        # render(page) zeichnet eine Seite
+        self.render = render
+        self.pages = pages
+        # Automatischer Seitenwechsel; nach Tastendruck oder eigenem Frame
+        # bleibt die Seite hold Sekunden stehen
+        self.rotate = rotate
+        self.hold = hold
+        self.min_interval = min_interval
+        # Seite, auf die ein Frame vom eigenen Rufzeichen springt
+        self.home = home
+        # Seite, auf die eine neue Nachricht an MYCALL springt (None = keine)
+        self.inbox = inbox
+        self.page = 0
+        self.events = 0
+        self.renders = 0
+        self.render_time = Histogram(RENDER_BUCKETS)
+        self.running = True
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        # asyncio-Laufzeit ersetzt das durch call_soon_threadsafe
+        self.wake = self._wakeup.set
+        self._last_render = None
+        self._next_rotate = None
+
+    # === Ereignisse (aus beliebigen Threads) ===
+    def notify(self, event):
+        with self._lock:
+            self._pending[event] += 1
+            self.events += 1
+        self.wake()
+
+    def packet(self, packet, own):
+        self.notify(OWN_FRAME if own else FRAME)
+
+    def message(self, entry):
+        self.notify(MESSAGE)
+
+    def fix_changed(self, fix):
+        self.notify(FIX)
+
+    def button(self, channel=None):
+        self.notify(BUTTON)
+
+    # === Ablauf ===
+    def step(self, now=None):
+        # Fällige Ereignisse abarbeiten, liefert Sekunden bis zum nächsten Termin
+        now = time.monotonic() if now is None else now
+        if self._next_rotate is None:
+            self._next_rotate = now
+        rotate_due = now >= self._next_rotate
+        with self._lock:
+            if not self._pending and not rotate_due:
+                return self._next_rotate - now
+            if self._pending and not rotate_due and self._last_render is not None:
+                wait = self._last_render + self.min_interval - now
+                if wait > 0:
+                    # Rate-Limit: weitere Ereignisse sammeln sich bis dahin an
+                    return min(wait, self._next_rotate - now)
+            events = self._pending
+            self._pending = Counter()
+
+        if events[BUTTON]:
+            self.page = (self.page + events[BUTTON]) % self.pages
+            self._next_rotate = now + self.hold
+        elif events[MESSAGE] and self.inbox is not None:
+            self.page = self.inbox
+            self._next_rotate = now + self.hold
+        elif events[OWN_FRAME]:
+            self.page = self.home
+            self._next_rotate = now + self.hold
+        elif rotate_due:
+            if self._last_render is not None:
+                self.page = (self.page + 1) % self.pages
+            self._next_rotate = now + self.rotate
+        start = time.perf_counter()
+        self.render(self.page)
+        self.render_time.observe(time.perf_counter() - start)
+        self.renders += 1
+        self._last_render = now
+        return max(self._next_rotate - now, 0.0)
+
+    def run(self):
+        while self.running:
+            self._wakeup.clear()
+            delay = self.step()
+            self._wakeup.wait(delay)
+
+    def stop(self):
+        self.running = False
+        self._wakeup.set()
@@ -0,0 +1,168 @@
+# APRS Pi – KISS-Endpunkte: TCP (Direwolf, zweiter TNC) und serielle Schnittstellen/pty
+#
+# Ein Endpunkt kapselt Verbindung, eigenen Deframer (Ströme verschiedener TNCs
+# dürfen sich nicht mischen), Backoff und Zähler. KISSListener wartet auf alle
+# Endpunkte mit einem einzigen Selector; Frames tragen Endpunkt und KISS-Port
+# (Funkkanal bei Direwolf mit mehreren Kanälen).
+#
+#   127.0.0.1:8001          TCP
+#   vhf=127.0.0.1:8001      TCP mit Namen
+#   /dev/ttyUSB0@9600       seriell mit Baudrate (Standard 9600)
+#   /dev/pts/3              pty (z.B. Direwolf -p, kissattach)
+
+import os
+import time
+import errno
+import socket
+from collections import deque
+
+from aprspi.kiss import KISSDeframer
+from aprspi.gpsd import Backoff
+
+CONNECT_TIMEOUT = 10.0
+# Zu sendende Frames, solange der TNC nicht erreichbar ist (älteste fallen weg)
+TX_QUEUE = 64
+
+
+class ChannelStats:
+    __slots__ = ("endpoint", "channel", "frames", "decoded", "rejected", "duplicates", "last_heard")
+
+    def __init__(self, endpoint, channel):
+        self.endpoint = endpoint
+        self.channel = channel
+        self.frames = 0
+        self.decoded = 0
+        self.rejected = 0
+        self.duplicates = 0
+        self.last_heard = None
+
+    @property
+    def label(self):
+        return f"{self.endpoint}:{self.channel}"
+
+
+class KISSEndpoint:
+    def __init__(self, name=None, host=None, port=None, device=None, baud=9600):
+        self.host = host
+        self.port = port
+        self.device = device
+        self.baud = baud
+        self.name = name or (device if device else f"{host}:{port}")
+        # Position im Listener, bestimmt die oberen 4 Bit des Ports im Paketlog
+        self.index = 0
+        self.deframer = KISSDeframer()
+        self.backoff = Backoff(1.0, 30.0)
+        self.retry_at = 0.0
+        self.deadline = None
+        self.connecting = False
+        self.connected = False
+        self.bytes_received = 0
+        self.reconnects = 0
+        self.connect_failures = 0
+        self.frames_sent = 0
+        # Fertige KISS-Frames aus beliebigen Threads; _out ist der Rest eines
+        # nur teilweise geschriebenen Puffers
+        self.tx = deque(maxlen=TX_QUEUE)
+        self.writing = False
+        self._out = b''
+        self._sock = None
+        self._fd = None
+
+    @property
+    def serial(self):
+        return self.device is not None
+
+    @property
+    def closed(self):
+        return self._sock is None and self._fd is None
+
+    def open(self):
+        # Nicht blockierend: TCP meldet den Verbindungsaufbau über EVENT_WRITE
+        self.deframer.reset()
+        if self.serial:
+            self._fd = open_serial(self.device, self.baud)
+            self.connected = True
+            return self._fd
+        self._sock = socket.socket(socket.AF_INET6 if ":" in self.host else socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setblocking(False)
+        err = self._sock.connect_ex((self.host, self.port))
+        if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            self._sock.close()
+            self._sock = None
+            raise OSError(err, os.strerror(err))
+        self.connecting = True
+        self.deadline = time.monotonic() + CONNECT_TIMEOUT
+        return self._sock
+
+    def finish_connect(self):
+        err = self._sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if err:
+            raise OSError(err, os.strerror(err))
+        self.connecting = False
+        self.connected = True
+
+    def fileno(self):
+        return self._fd if self._fd is not None else self._sock.fileno()
+
+    def read(self):
+        if self._fd is not None:
+            return os.read(self._fd, 4096)
+        return self._sock.recv(4096)
+
+    def write_pending(self):
+        # Schreibt, was der Socket/die Schnittstelle annimmt; True wenn noch etwas übrig ist
+        if not self._out and self.tx:
+            frames = []
+            while self.tx:
+                frames.append(self.tx.popleft())
+            self.frames_sent += len(frames)
+            self._out = b''.join(frames)
+        if self._out and self.connected:
+            try:
+                if self._fd is not None:
+                    written = os.write(self._fd, self._out)
+                else:
+                    written = self._sock.send(self._out)
+            except BlockingIOError:
+                written = 0
+            self._out = self._out[written:]
+        return bool(self._out or self.tx)
+
+    def close(self, delay=None):
+        if self._sock is not None:
+            self._sock.close()
+        if self._fd is not None:
+            os.close(self._fd)
+        self._sock = self._fd = None
+        # Angefangener Puffer wäre nach dem Reconnect ein halbes Frame
+        self._out = b''
+        self.connecting = self.connected = self.writing = False
+        self.retry_at = time.monotonic() + (self.backoff.next() if delay is None else delay)
+
+
+def open_serial(device, baud=9600):
+    fd = os.open(device, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+    if os.isatty(fd):
+        # Rohmodus: KISS ist binär, kein Echo, keine Zeilenpufferung
+        import tty
+        import termios
+        tty.setraw(fd)
+        attrs = termios.tcgetattr(fd)
+        speed = getattr(termios, f"B{baud}", None)
+        if speed is not None:
+            attrs[4] = attrs[5] = speed
+        termios.tcsetattr(fd, termios.TCSANOW, attrs)
+    return fd
+
+
+def parse_endpoint(text):
+    name, sep, spec = text.partition("=")
+    if not sep:
+        name, spec = None, text
+    if spec.startswith("/"):
+        device, _, baud = spec.partition("@")
+        return KISSEndpoint(name, device=device, baud=int(baud) if baud else 9600)
+    host, _, port = spec.rpartition(":")
+    if not port.isdigit():
+        raise ValueError(f"KISS-Endpunkt ohne Port: {text}")
+    return KISSEndpoint(name, host.strip("[]") or "127.0.0.1", int(port))
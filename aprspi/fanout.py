@@ -0,0 +1,234 @@
+# APRS Pi – KISS-Verteiler: mehrere Programme teilen sich eine TNC-Verbindung
+#
+# APRS-Pi hält die Verbindung zu Direwolf und bietet selbst einen KISS-TCP-Port
+# an (Standard 8101). Jeder Client bekommt die dekodierbaren Frames eines
+# Endpunkts, KISS-Frames von Clients gehen an den TNC (Sendepfad).
+#
+# Der Empfang wartet nie auf einen Client: jeder hat eine begrenzte
+# Warteschlange, ein langsamer Client verliert die ältesten Frames und wird
+# nach max_stall Sekunden ohne Fortschritt getrennt. Im Thread-Betrieb laufen
+# Server und Clients im Selector des KISSListener, mit --asyncio als
+# Coroutinen in derselben Event-Loop.
+#
+#   python3 -m aprspi --fanout 8101        ->  Xastir/aprx/kissutil auf :8101
+
+import time
+import socket
+import selectors
+from collections import deque
+
+from aprspi.kiss import KISSDeframer, kiss_frame, CMD_RETURN
+
+FANOUT_PORT = 8101
+
+
+class FanoutClient:
+    def __init__(self, addr, max_queue):
+        self.addr = addr
+        self.max_queue = max_queue
+        self.queue = deque()
+        self.deframer = KISSDeframer()
+        self.frames = 0
+        self.dropped = 0
+        self.tx = 0
+        # Seit wann Frames verworfen werden, ohne dass der Client etwas abnimmt
+        self.stalled = None
+        self.sock = None
+        self.out = b''
+        self.writing = False
+        # asyncio: StreamWriter und Event für den Sende-Task
+        self.writer = None
+        self.ready = None
+
+    def push(self, frame, now):
+        # True, wenn dafür das älteste Frame verworfen wurde
+        full = len(self.queue) >= self.max_queue
+        if full:
+            self.queue.popleft()
+            self.dropped += 1
+            if self.stalled is None:
+                self.stalled = now
+        self.queue.append(frame)
+        self.frames += 1
+        return full
+
+    def take(self):
+        data = b''.join(self.queue)
+        self.queue.clear()
+        return data
+
+
+class KISSFanout:
+    def __init__(self, listener, host="127.0.0.1", port=FANOUT_PORT, endpoint=None, max_queue=256, max_stall=30.0):
+        self.listener = listener
+        # Endpunkt, dessen Frames verteilt werden und an den gesendet wird
+        self.endpoint = endpoint or listener.endpoints[0]
+        self.host = host
+        self.port = port
+        self.max_queue = max_queue
+        self.max_stall = max_stall
+        self.clients = []
+        self.accepted = 0
+        self.dropped = 0
+        self.slow_disconnects = 0
+        self.tx_frames = 0
+        self.tx_rejected = 0
+        self._sel = None
+        self._server = None
+        listener.fanout = self
+
+    # === Empfangspfad (Thread des Listeners bzw. Event-Loop) ===
+    def publish(self, endpoint, port, data):
+        if endpoint is not self.endpoint or not self.clients:
+            return
+        frame = kiss_frame(data, port)
+        now = time.monotonic()
+        for client in list(self.clients):
+            if client.push(frame, now):
+                self.dropped += 1
+            if client.stalled is not None and now - client.stalled > self.max_stall:
+                self.slow_disconnects += 1
+                self.drop(client)
+            elif client.writer is not None:
+                self._write(client)
+            else:
+                self._flush(client)
+
+    # === Sendepfad: KISS von Clients an den TNC ===
+    def receive(self, client, data):
+        for frame in client.deframer.feed(data):
+            if frame.port == 0x0F and frame.cmd == CMD_RETURN:
+                # Ein Client darf den TNC nicht für alle aus dem KISS-Modus holen
+                self.tx_rejected += 1
+                continue
+            self.listener.transmit(frame.data, frame.port, self.endpoint, frame.cmd)
+            client.tx += 1
+            self.tx_frames += 1
+
+    def drop(self, client):
+        if client in self.clients:
+            self.clients.remove(client)
+        if client.writer is not None:
+            client.writer.close()
+            return
+        self._sel.unregister(client.sock)
+        client.sock.close()
+
+    # === Thread-Betrieb: Sockets im Selector des KISSListener ===
+    def open(self, sel):
+        self._sel = sel
+        self._server = socket.create_server((self.host, self.port))
+        self._server.setblocking(False)
+        self.port = self._server.getsockname()[1]
+        sel.register(self._server, selectors.EVENT_READ, self._accept)
+
+    def _accept(self, mask):
+        try:
+            sock, addr = self._server.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client = FanoutClient(addr, self.max_queue)
+        client.sock = sock
+        self.clients.append(client)
+        self.accepted += 1
+        self._sel.register(sock, selectors.EVENT_READ, lambda mask: self._event(client, mask))
+
+    def _event(self, client, mask):
+        if mask & selectors.EVENT_WRITE:
+            self._flush(client)
+        if mask & selectors.EVENT_READ and client in self.clients:
+            try:
+                data = client.sock.recv(4096)
+            except BlockingIOError:
+                return
+            except OSError:
+                data = b''
+            if not data:
+                self.drop(client)
+                return
+            self.receive(client, data)
+
+    def _flush(self, client):
+        if not client.out:
+            client.out = client.take()
+        if client.out:
+            try:
+                sent = client.sock.send(client.out)
+            except BlockingIOError:
+                sent = 0
+            except OSError:
+                self.drop(client)
+                return
+            if sent:
+                client.stalled = None
+            client.out = client.out[sent:]
+        pending = bool(client.out or client.queue)
+        if pending != client.writing:
+            client.writing = pending
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if pending else 0)
+            self._sel.modify(client.sock, events, self._sel.get_key(client.sock).data)
+
+    def close(self):
+        for client in list(self.clients):
+            self.drop(client)
+        if self._server is not None:
+            self._sel.unregister(self._server)
+            self._server.close()
+            self._server = None
+
+    # === asyncio-Betrieb ===
+    async def serve(self):
+        import asyncio
+        server = await asyncio.start_server(self._client_task, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for client in list(self.clients):
+                self.drop(client)
+
+    def _write(self, client):
+        # Der Empfang liest gepufferte Daten ohne die Loop abzugeben, deshalb
+        # direkt schreiben, solange der Transport-Puffer unter der Grenze liegt
+        transport = client.writer.transport
+        if transport.get_write_buffer_size() < transport.get_write_buffer_limits()[1]:
+            client.writer.write(client.take())
+            client.stalled = None
+        else:
+            client.ready.set()
+
+    async def _client_task(self, reader, writer):
+        import asyncio
+        client = FanoutClient(writer.get_extra_info("peername"), self.max_queue)
+        client.writer = writer
+        client.ready = asyncio.Event()
+        self.clients.append(client)
+        self.accepted += 1
+
+        async def sender():
+            # Puffer voll: warten, bis der Client abnimmt, dann den Rest nachschieben
+            while True:
+                await client.ready.wait()
+                client.ready.clear()
+                await writer.drain()
+                if client.queue:
+                    writer.write(client.take())
+                    client.stalled = None
+
+        task = asyncio.create_task(sender())
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                self.receive(client, data)
+        except OSError:
+            pass
+        finally:
+            task.cancel()
+            if client in self.clients:
+                self.clients.remove(client)
+            writer.close()
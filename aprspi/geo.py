@@ -0,0 +1,214 @@
+# APRS Pi – Entfernung und Richtung zu gehörten Stationen
+#
+# Positionen liegen in NumPy-Arrays (Bogenmaß), Entfernung und Peilung zur
+# eigenen Position werden für alle Stationen auf einmal berechnet, aber nur
+# neu, wenn wir uns um mehr als move_km bewegt haben. Neue Positionen
+# bekommen ihre Werte einzeln beim Eintragen. Ein Gitter aus cell_deg großen
+# Zellen beantwortet "nächste N" und "im Umkreis R" ohne alle Stationen
+# anzufassen. NumPy wird erst mit der ersten Position importiert (Startzeit).
+
+import math
+import threading
+
+EARTH_KM = 6371.0088
+KM_PER_DEG = EARTH_KM * math.pi / 180
+COMPASS = ("N", "NO", "O", "SO", "S", "SW", "W", "NW")
+
+
+def distance_bearing(lat1, lon1, lat2, lon2):
+    # Großkreis (Haversine) in km und Anfangspeilung in Grad, Eingabe in Grad
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dlat = p2 - p1
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dlon / 2) ** 2
+    dist = 2 * EARTH_KM * math.asin(min(1.0, math.sqrt(a)))
+    y = math.sin(dlon) * math.cos(p2)
+    x = math.cos(p1) * math.sin(p2) - math.sin(p1) * math.cos(p2) * math.cos(dlon)
+    return dist, math.degrees(math.atan2(y, x)) % 360
+
+
+def compass(bearing):
+    return COMPASS[int((bearing + 22.5) % 360 // 45)]
+
+
+class GeoIndex:
+    def __init__(self, cell_deg=0.25, move_km=0.5, capacity=64):
+        self.cell_deg = cell_deg
+        self.move_km = move_km
+        self.origin = None
+        self.recomputes = 0
+        # Slot -> Rufzeichen (None = frei) und umgekehrt
+        self.calls = []
+        self._slots = {}
+        self._free = []
+        self._capacity = capacity
+        self._np = None
+        self._lat = self._lon = self._dist = self._bearing = None
+        # (Zeile, Spalte) -> Slots, Slot -> Zelle
+        self._grid = {}
+        self._cell_of = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._slots)
+
+    # === Eintragen ===
+    def update(self, call, lat, lon):
+        with self._lock:
+            if self._np is None:
+                self._alloc()
+            slot = self._slots.get(call)
+            if slot is None:
+                slot = self._free.pop() if self._free else self._append(call)
+                self._slots[call] = slot
+                self.calls[slot] = call
+            else:
+                self._ungrid(slot)
+            plat, plon = math.radians(lat), math.radians(lon)
+            self._lat[slot] = plat
+            self._lon[slot] = plon
+            cell = self._cell(lat, lon)
+            self._grid.setdefault(cell, set()).add(slot)
+            self._cell_of[slot] = cell
+            if self.origin is not None:
+                self._dist[slot], self._bearing[slot] = distance_bearing(*self.origin, lat, lon)
+
+    def remove(self, call):
+        with self._lock:
+            slot = self._slots.pop(call, None)
+            if slot is None:
+                return
+            self._ungrid(slot)
+            self.calls[slot] = None
+            self._lat[slot] = self._lon[slot] = self._dist[slot] = self._bearing[slot] = self._np.nan
+            self._free.append(slot)
+
+    def set_origin(self, lat, lon):
+        # True, wenn neu gerechnet wurde; kleine Bewegungen ändern nichts
+        with self._lock:
+            if self.origin is not None and distance_bearing(*self.origin, lat, lon)[0] < self.move_km:
+                return False
+            self.origin = (lat, lon)
+            if self._np is not None:
+                self._recompute()
+            return True
+
+    # === Abfragen: Listen von (Rufzeichen, km, Grad), nächste zuerst ===
+    def get(self, call):
+        with self._lock:
+            slot = self._slots.get(call)
+            if slot is None or self.origin is None:
+                return None
+            return float(self._dist[slot]), float(self._bearing[slot])
+
+    def nearest(self, n):
+        with self._lock:
+            if self.origin is None or not self._slots or n <= 0:
+                return []
+            found = []
+            for k, slots in self._rings():
+                found.extend(slots)
+                if len(found) >= n:
+                    # Außerhalb von Ring k liegt niemand näher als k Zellen
+                    nth = self._np.partition(self._dist[found], n - 1)[n - 1]
+                    if nth <= k * self._cell_km():
+                        break
+            return self._result(found, n)
+
+    def within(self, radius_km):
+        with self._lock:
+            if self.origin is None or not self._slots:
+                return []
+            k = int(radius_km / self._cell_km()) + 1
+            row, col = self._cell(*self.origin)
+            if (2 * k + 1) ** 2 > len(self._grid):
+                found = list(self._slots.values())
+            else:
+                found = [s for r in range(row - k, row + k + 1) for c in range(col - k, col + k + 1)
+                         for s in self._grid.get((r, c), ())]
+            np = self._np
+            found = np.array(found, dtype=np.intp)
+            found = found[self._dist[found] <= radius_km]
+            return self._result(found, len(found))
+
+    # === Intern ===
+    def _alloc(self):
+        import numpy
+        self._np = numpy
+        self._lat, self._lon, self._dist, self._bearing = (numpy.full(self._capacity, numpy.nan) for _ in range(4))
+        if self.origin is not None:
+            self._recompute()
+
+    def _append(self, call):
+        slot = len(self.calls)
+        self.calls.append(call)
+        if slot >= len(self._lat):
+            # Verdoppeln statt bei jeder neuen Station umkopieren
+            np = self._np
+            grow = np.full(len(self._lat), np.nan)
+            self._lat, self._lon, self._dist, self._bearing = (
+                np.concatenate((a, grow)) for a in (self._lat, self._lon, self._dist, self._bearing))
+        return slot
+
+    def _recompute(self):
+        np = self._np
+        lat0, lon0 = (math.radians(v) for v in self.origin)
+        lat, lon = self._lat, self._lon
+        dlon = lon - lon0
+        cos_lat = np.cos(lat)
+        a = np.sin((lat - lat0) / 2) ** 2 + math.cos(lat0) * cos_lat * np.sin(dlon / 2) ** 2
+        self._dist = 2 * EARTH_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        y = np.sin(dlon) * cos_lat
+        x = math.cos(lat0) * np.sin(lat) - math.sin(lat0) * cos_lat * np.cos(dlon)
+        self._bearing = np.degrees(np.arctan2(y, x)) % 360
+        self.recomputes += 1
+
+    def _cell(self, lat, lon):
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg))
+
+    def _cell_km(self):
+        # Kleinste Zellkante am eigenen Standort (Längengrade werden nach Norden schmaler)
+        return self.cell_deg * KM_PER_DEG * max(math.cos(math.radians(self.origin[0])), 0.01)
+
+    def _ungrid(self, slot):
+        cell = self._cell_of.pop(slot)
+        slots = self._grid[cell]
+        slots.discard(slot)
+        if not slots:
+            del self._grid[cell]
+
+    def _rings(self):
+        # Zellen ringförmig um die eigene Zelle; sobald ein Ring mehr Zellen
+        # hätte als belegt sind, kommt der Rest auf einmal
+        row, col = self._cell(*self.origin)
+        seen = 0
+        k = 0
+        while seen < len(self._slots):
+            if 8 * k > len(self._grid):
+                yield k, [s for (r, c), slots in self._grid.items()
+                          if max(abs(r - row), abs(c - col)) >= k for s in slots]
+                return
+            if k == 0:
+                cells = [(row, col)]
+            else:
+                cells = [(row - k, c) for c in range(col - k, col + k + 1)]
+                cells += [(row + k, c) for c in range(col - k, col + k + 1)]
+                cells += [(r, col - k) for r in range(row - k + 1, row + k)]
+                cells += [(r, col + k) for r in range(row - k + 1, row + k)]
+            slots = [s for cell in cells for s in self._grid.get(cell, ())]
+            seen += len(slots)
+            yield k, slots
+            k += 1
+
+    def _result(self, found, n):
+        np = self._np
+        found = np.asarray(found, dtype=np.intp)
+        if not len(found):
+            return []
+        dist = self._dist[found]
+        if n < len(found):
+            part = np.argpartition(dist, n - 1)[:n]
+            found, dist = found[part], dist[part]
+        order = np.argsort(dist, kind="stable")
+        return [(self.calls[s], float(d), float(b))
+                for s, d, b in zip(found[order], dist[order], self._bearing[found[order]])]
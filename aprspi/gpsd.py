@@ -0,0 +1,116 @@
+# APRS Pi – gpsd-JSON-Protokoll (?WATCH) ohne das gps-Modul
+#
+# gpsd schickt eine JSON-Zeile pro Meldung, immer beginnend mit
+# {"class":"XYZ", ... Die Klasse wird direkt aus den Bytes gelesen, so dass
+# nur TPV/SKY/PPS überhaupt durch json.loads gehen.
+
+import json
+import time
+
+GPSD_WATCH = b'?WATCH={"enable":true,"json":true,"pps":true};\n'
+WANTED_CLASSES = (b'TPV', b'SKY', b'PPS')
+MAX_LINE = 64 * 1024
+
+_PREFIX = b'{"class":"'
+
+
+class GPSReport(dict):
+    # gpsd-JSON mit Attributzugriff wie bei gps.gps (tpv.lat, sky.satellites)
+    def __getattr__(self, name):
+        try:
+            value = self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        if isinstance(value, list):
+            return [GPSReport(v) if isinstance(v, dict) else v for v in value]
+        return value
+
+
+def report_class(line):
+    # Schneller Weg: Klasse ohne JSON-Parser bestimmen
+    if line.startswith(_PREFIX):
+        end = line.find(b'"', len(_PREFIX))
+        if end > 0:
+            return line[len(_PREFIX):end]
+    return None
+
+
+class RateMeter:
+    # Meldungen pro Sekunde, gemittelt über ein festes Zeitfenster
+    def __init__(self, window=10.0):
+        self.window = window
+        self._start = time.monotonic()
+        self._count = 0
+        self._rate = 0.0
+
+    def tick(self, now=None):
+        now = time.monotonic() if now is None else now
+        self._count += 1
+        elapsed = now - self._start
+        if elapsed >= self.window:
+            self._rate = self._count / elapsed
+            self._start = now
+            self._count = 0
+
+    def value(self, now=None):
+        now = time.monotonic() if now is None else now
+        if now - self._start >= 2 * self.window:
+            # Seit mindestens einem ganzen Fenster keine Meldung mehr
+            return 0.0
+        return self._rate
+
+
+class Backoff:
+    def __init__(self, initial=0.5, maximum=30.0):
+        self.initial = initial
+        self.maximum = maximum
+        self._delay = initial
+
+    def next(self):
+        delay = self._delay
+        self._delay = min(self._delay * 2, self.maximum)
+        return delay
+
+    def reset(self):
+        self._delay = self.initial
+
+
+class GpsdStream:
+    def __init__(self, classes=WANTED_CLASSES):
+        self.classes = classes
+        self.messages = 0
+        self.skipped = 0
+        self.errors = 0
+        self.rate = RateMeter()
+        self._buf = bytearray()
+
+    def reset(self):
+        self._buf.clear()
+
+    def feed(self, data):
+        self._buf += data
+        end = self._buf.rfind(b'\n')
+        if end < 0:
+            if len(self._buf) > MAX_LINE:
+                self._buf.clear()
+                self.errors += 1
+            return []
+        lines = bytes(self._buf[:end]).split(b'\n')
+        del self._buf[:end + 1]
+        reports = []
+        for line in lines:
+            cls = report_class(line)
+            if cls is None:
+                if line.strip():
+                    self.errors += 1
+                continue
+            self.messages += 1
+            self.rate.tick()
+            if cls not in self.classes:
+                self.skipped += 1
+                continue
+            try:
+                reports.append(GPSReport(json.loads(line)))
+            except ValueError:
+                self.errors += 1
+        return reports
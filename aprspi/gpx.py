@@ -0,0 +1,242 @@
+# APRS Pi – GPX-Aufzeichnung aus dem gpsd-TPV-Strom (ersetzt gpxlogger)
+#
+# gpxlogger schreibt jeden Fix sofort auf die SD-Karte. Hier landen die
+# Punkte erst im Speicher und werden gebündelt geschrieben (alle
+# flush_interval Sekunden oder flush_points Punkte), fsync nur alle
+# fsync_interval Sekunden und beim Tageswechsel/Beenden.
+#
+# Vereinfachung während der Fahrt: Punkte unter min_distance Meter vom
+# zuletzt behaltenen (Stillstand, GPS-Rauschen) fallen weg. Auf gerader
+# Strecke wird nur der jeweils letzte Punkt vorgemerkt; behalten wird er,
+# wenn die Richtung um mehr als max_heading Grad abknickt oder seit dem
+# letzten behaltenen Punkt max_interval Sekunden vergangen sind.
+#
+# Je UTC-Tag eine Datei track-YYYYMMDD.gpx. Die Datei ist nach jedem
+# Schreiben gültiges GPX: neue Punkte überschreiben das schließende
+# </trkseg></trk></gpx>, das danach neu angehängt wird. Nach einem Neustart
+# am selben Tag geht es in derselben Datei mit neuem Segment weiter.
+#
+#   python3 -m aprspi --gpx /var/log/aprspi/gpx
+
+import os
+import time
+import datetime
+import threading
+
+from aprspi.geo import distance_bearing
+
+HEAD = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<gpx version="1.1" creator="APRS Pi" xmlns="http://www.topografix.com/GPX/1/1">\n'
+        '<trk><name>{name}</name>\n<trkseg>\n')
+TAIL = '</trkseg></trk></gpx>\n'
+NEW_SEGMENT = '</trkseg>\n<trkseg>\n'
+
+
+class TrackPoint:
+    __slots__ = ("lat", "lon", "ele", "time", "when")
+
+    def __init__(self, lat, lon, ele, time, when):
+        self.lat = lat
+        self.lon = lon
+        self.ele = ele
+        # ISO-Zeit aus gpsd für <time>, when in Sekunden für die Schwellen
+        self.time = time
+        self.when = when
+
+    def xml(self):
+        ele = f"<ele>{self.ele:.1f}</ele>" if self.ele is not None else ""
+        return f'<trkpt lat="{self.lat:.7f}" lon="{self.lon:.7f}">{ele}<time>{self.time}</time></trkpt>\n'
+
+
+class TrackSimplifier:
+    def __init__(self, min_distance=5.0, max_heading=15.0, max_interval=60.0, max_gap=30.0):
+        self.min_distance = min_distance
+        self.max_heading = max_heading
+        self.max_interval = max_interval
+        # Längere Pause zwischen zwei Fixes beginnt ein neues Segment
+        self.max_gap = max_gap
+        self.last = None
+        self.pending = None
+        self._seen = None
+
+    def add(self, point):
+        # Liefert die zu behaltenden Punkte; None in der Liste = neues Segment
+        out = []
+        if self._seen is not None and point.when - self._seen > self.max_gap:
+            out.extend(self.end())
+            out.append(None)
+        self._seen = point.when
+        last = self.last
+        if last is None:
+            self.last = point
+            out.append(point)
+            return out
+        dist, bearing = distance_bearing(last.lat, last.lon, point.lat, point.lon)
+        if dist * 1000 < self.min_distance:
+            return out
+        pending = self.pending
+        if pending is not None:
+            course = distance_bearing(last.lat, last.lon, pending.lat, pending.lon)[1]
+            turn = abs((bearing - course + 180) % 360 - 180)
+            if turn > self.max_heading or point.when - last.when > self.max_interval:
+                # Der vorgemerkte Punkt ist die Ecke bzw. der letzte vor dem Zeitlimit
+                self.last = last = pending
+                out.append(pending)
+        self.pending = point
+        return out
+
+    def end(self):
+        # Segmentende: letzten vorgemerkten Punkt nicht verlieren
+        pending, self.pending = self.pending, None
+        self.last = None
+        self._seen = None
+        return [pending] if pending is not None else []
+
+
+class GPXLogger:
+    def __init__(self, directory, flush_interval=60.0, flush_points=120, fsync_interval=600.0, simplifier=None):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.flush_points = flush_points
+        self.fsync_interval = fsync_interval
+        self.simplifier = simplifier or TrackSimplifier()
+        # Kennzahlen
+        self.points_received = 0
+        self.points_written = 0
+        self.flushes = 0
+        self.fsyncs = 0
+        self.bytes_written = 0
+        self.errors = 0
+        self.path = None
+        self._buffer = []
+        self._day = None
+        self._file = None
+        self._tail_pos = 0
+        self._empty = True
+        self._resumed = False
+        self._flushed = time.monotonic()
+        self._synced = time.monotonic()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def add(self, tpv):
+        # Abnehmer für GPSListener.tpv_handlers (nur TPV mit Fix)
+        point = track_point(tpv)
+        with self._lock:
+            self.points_received += 1
+            day = point.time[:10].replace("-", "")
+            if day != self._day:
+                # Tageswechsel: Vorgemerktes gehört noch in die alte Datei
+                self._buffer.extend(self.simplifier.end())
+                self._write(sync=True)
+                self._day = day
+                self._close()
+            self._buffer.extend(self.simplifier.add(point))
+            now = time.monotonic()
+            if len(self._buffer) >= self.flush_points or now - self._flushed >= self.flush_interval:
+                self._write(sync=now - self._synced >= self.fsync_interval)
+
+    def flush(self, sync=False):
+        with self._lock:
+            self._write(sync)
+
+    def close(self):
+        with self._lock:
+            self._buffer.extend(self.simplifier.end())
+            self._write(sync=True)
+            self._close()
+
+    # === Schreiben ===
+    def _write(self, sync):
+        self._flushed = time.monotonic()
+        if not self._buffer and not (sync and self._file is not None):
+            return
+        try:
+            if self._file is None:
+                self._open()
+            chunks = [NEW_SEGMENT if p is None else p.xml() for p in self._buffer]
+            # Segmentwechsel ganz am Anfang einer Datei wäre ein leeres Segment
+            while chunks and chunks[0] is NEW_SEGMENT and self._empty:
+                chunks.pop(0)
+            if chunks and self._resumed:
+                # Fortgesetzte Datei: eigenes Segment nach dem Neustart
+                chunks.insert(0, NEW_SEGMENT)
+                self._resumed = False
+            if chunks:
+                data = "".join(chunks).encode()
+                f = self._file
+                f.seek(self._tail_pos)
+                f.write(data)
+                self._tail_pos += len(data)
+                f.write(TAIL.encode())
+                f.flush()
+                self.bytes_written += len(data)
+                self.points_written += sum(1 for p in self._buffer if p is not None)
+                self.flushes += 1
+                self._empty = False
+            if sync:
+                os.fsync(self._file.fileno())
+                self.fsyncs += 1
+                self._synced = time.monotonic()
+        except OSError:
+            # Volle oder schreibgeschützte Karte darf den GPS-Empfang nicht stoppen
+            self.errors += 1
+        self._buffer.clear()
+
+    def _open(self):
+        self.path = os.path.join(self.directory, f"track-{self._day}.gpx")
+        tail = TAIL.encode()
+        try:
+            f = open(self.path, "r+b")
+        except FileNotFoundError:
+            f = None
+        if f is not None:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(size - len(tail), 0))
+            if f.read() == tail:
+                # Weiter in der vorhandenen Datei, neues Segment
+                self._file = f
+                self._tail_pos = size - len(tail)
+                self._empty = True
+                self._resumed = True
+                return
+            # Abgeschnittene Datei (Stromausfall vor fsync) nicht anfassen
+            f.close()
+            suffix = 1
+            while os.path.exists(self.path[:-4] + f"-{suffix}.gpx"):
+                suffix += 1
+            self.path = self.path[:-4] + f"-{suffix}.gpx"
+        f = open(self.path, "w+b")
+        head = HEAD.format(name=f"APRS Pi {self._day}").encode()
+        f.write(head + tail)
+        self._file = f
+        self._tail_pos = len(head)
+        self._empty = True
+        self._resumed = False
+
+    def _close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                self.errors += 1
+        self._file = None
+
+
+def track_point(tpv):
+    when = tpv.get('time')
+    if when is None:
+        when = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    ele = tpv.get('altMSL', tpv.get('alt'))
+    return TrackPoint(tpv['lat'], tpv['lon'], ele, when, iso_seconds(when))
+
+
+def iso_seconds(text):
+    # "2026-10-18T12:34:56.000Z" -> Unixzeit
+    try:
+        stamp = datetime.datetime.strptime(text[:19], "%Y-%m-%dT%H:%M:%S")
+    except ValueError:
+        return time.time()
+    frac = text[19:].rstrip("Z")
+    return stamp.replace(tzinfo=datetime.timezone.utc).timestamp() + (float(frac) if frac.startswith(".") else 0.0)
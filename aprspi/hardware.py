@@ -0,0 +1,31 @@
+# APRS Pi – Hardware-Backends, erst beim Start geöffnet
+#
+# smbus und luma werden nur importiert, wenn das jeweilige Gerät gebraucht
+# wird. Fehlt ein Modul oder das Gerät selbst, läuft der Rest weiter.
+
+from aprspi.battery import INA219Battery
+
+I2C_BUS = 1
+INA219_ADDR = 0x43
+
+
+def open_battery(bus=I2C_BUS, addr=INA219_ADDR):
+    # INA219 auf dem UPS-HAT; None ohne smbus oder ohne I2C-Gerät
+    try:
+        import smbus
+        battery = INA219Battery(smbus.SMBus(bus), addr)
+        battery.calibrate()
+    except (ImportError, OSError):
+        return None
+    return battery
+
+
+def open_oled(dummy=False):
+    # Waveshare 2.42" (SSD1309) an SPI0; dummy für Betrieb ohne Display
+    if dummy:
+        from luma.core.device import dummy as dummy_device
+        return dummy_device(width=128, height=64, mode="1")
+    from luma.core.interface.serial import spi
+    from luma.oled.device import ssd1309
+    serial = spi(device=0, port=0, gpio_DC=25, gpio_RST=24)
+    return ssd1309(serial, width=128, height=64)
@@ -0,0 +1,103 @@
+# APRS Pi – KISS-Deframer (inkrementell, mit FESC/TFEND/TFESC-Behandlung)
+
+from collections import namedtuple
+
+FEND = 0xC0
+FESC = 0xDB
+TFEND = 0xDC
+TFESC = 0xDD
+
+CMD_DATA = 0x00
+# Mit Port 0xF (Byte 0xFF): TNC verlässt den KISS-Modus
+CMD_RETURN = 0x0F
+
+# AX.25 erlaubt 256 Byte Info + Header/Pfad; großzügige Obergrenze gegen Müll
+MAX_FRAME = 1024
+
+KISSFrame = namedtuple("KISSFrame", "port cmd data")
+
+_ESCAPED = {TFEND: b'\xC0', TFESC: b'\xDB'}
+
+
+def kiss_unescape(raw):
+    # Nur Frames mit FESC werden zerlegt, alle anderen bleiben unverändert
+    if FESC not in raw:
+        return raw
+    parts = raw.split(b'\xDB')
+    out = bytearray(parts[0])
+    for part in parts[1:]:
+        if not part or part[0] not in _ESCAPED:
+            raise ValueError("ungültige KISS-Escape-Sequenz")
+        out += _ESCAPED[part[0]]
+        out += part[1:]
+    return bytes(out)
+
+
+def kiss_escape(data):
+    return data.replace(b'\xDB', b'\xDB\xDD').replace(b'\xC0', b'\xDB\xDC')
+
+
+def kiss_frame(data, port=0, cmd=CMD_DATA):
+    return b'\xC0' + kiss_escape(bytes(((port & 0x0F) << 4 | (cmd & 0x0F),)) + data) + b'\xC0'
+
+
+class KISSDeframer:
+    def __init__(self, max_frame=MAX_FRAME):
+        self.max_frame = max_frame
+        self.frames = 0
+        self.dropped = 0
+        self._buf = bytearray()
+        self._overflow = False
+
+    def reset(self):
+        self._buf.clear()
+        self._overflow = False
+
+    def feed(self, data):
+        # Jedes empfangene Byte wird genau einmal (in C) gescannt; nur der
+        # unvollständige Rest eines Frames bleibt im bytearray-Puffer liegen
+        parts = bytes(data).split(b'\xC0')
+        frames = []
+        if len(parts) == 1:
+            self._append(parts[0])
+            return frames
+        if self._buf or self._overflow:
+            self._append(parts[0])
+            if self._overflow:
+                self._overflow = False
+            else:
+                self._emit(bytes(self._buf), frames)
+            self._buf.clear()
+        else:
+            self._emit(parts[0], frames)
+        for raw in parts[1:-1]:
+            self._emit(raw, frames)
+        self._append(parts[-1])
+        return frames
+
+    def _append(self, chunk):
+        if self._overflow or not chunk:
+            return
+        if len(self._buf) + len(chunk) > self.max_frame:
+            # Frame zu lang: bis zum nächsten FEND verwerfen
+            self._overflow = True
+            self._buf.clear()
+            self.dropped += 1
+            return
+        self._buf += chunk
+
+    def _emit(self, raw, frames):
+        if not raw:
+            # FEND FEND ist nur ein Füllzeichen
+            return
+        if len(raw) > self.max_frame:
+            self.dropped += 1
+            return
+        if FESC in raw:
+            try:
+                raw = kiss_unescape(raw)
+            except ValueError:
+                self.dropped += 1
+                return
+        self.frames += 1
+        frames.append(KISSFrame(raw[0] >> 4, raw[0] & 0x0F, raw[1:]))
@@ -0,0 +1,361 @@
+# APRS Pi – GPS- und KISS-Listener (Thread-Variante)
+#
+# Die eigentliche Verarbeitung steckt in feed() bzw. handle_report(), damit
+# die asyncio-Laufzeit (aprspi/aio.py) dieselben Objekte befüllen kann.
+
+import time
+import socket
+import selectors
+import threading
+
+from aprspi.kiss import CMD_DATA, kiss_frame
+from aprspi.gpsd import GpsdStream, Backoff, GPSD_WATCH
+from aprspi.ax25 import decode_ax25
+from aprspi.aprs import APRSPacket
+from aprspi.stations import StationStore
+from aprspi.dedup import DupeCache, relayed_by
+from aprspi.endpoints import KISSEndpoint, ChannelStats
+from aprspi.metrics import Histogram, DECODE_BUCKETS
+
+
+# === GPS Listener ===
+class GPSListener(threading.Thread):
+    def __init__(self, host="127.0.0.1", port=2947):
+        super().__init__(daemon=True)
+        self.host = host
+        self.port = port
+        self.stream = GpsdStream()
+        self.backoff = Backoff()
+        self.last_tpv = None
+        self.last_sky = None
+        self.last_pps = None
+        self.fix_time = None
+        self.has_fix = False
+        # on_fix(fix) wird bei Wechsel Fix/kein Fix aufgerufen
+        self.on_fix = None
+        # Abnehmer für jeden TPV mit Fix (Entfernungen, GPX, Baken), Aufruf mit dem TPV
+        self.tpv_handlers = []
+        self.reconnects = 0
+        self.running = True
+        self._wakeup = threading.Event()
+
+    @property
+    def fix_age(self):
+        # Sekunden seit dem letzten TPV mit 2D/3D-Fix, None ohne Fix
+        if self.fix_time is None:
+            return None
+        return time.monotonic() - self.fix_time
+
+    @property
+    def message_rate(self):
+        return self.stream.rate.value()
+
+    def handle_report(self, report):
+        if report['class'] == 'TPV':
+            self.last_tpv = report
+            fix = report.get('mode', 0) >= 2
+            if fix:
+                self.fix_time = time.monotonic()
+                if 'lat' in report and 'lon' in report:
+                    for handler in self.tpv_handlers:
+                        handler(report)
+            if fix != self.has_fix:
+                self.has_fix = fix
+                if self.on_fix:
+                    self.on_fix(fix)
+        elif report['class'] == 'SKY':
+            self.last_sky = report
+        elif report['class'] == 'PPS':
+            self.last_pps = report
+
+    def feed(self, data):
+        for report in self.stream.feed(data):
+            self.handle_report(report)
+
+    def run(self):
+        while self.running:
+            try:
+                sock = socket.create_connection((self.host, self.port), timeout=5)
+            except OSError:
+                self._wakeup.wait(self.backoff.next())
+                continue
+            self.stream.reset()
+            sel = selectors.DefaultSelector()
+            try:
+                sock.sendall(GPSD_WATCH)
+                sock.setblocking(False)
+                sel.register(sock, selectors.EVENT_READ)
+                while self.running:
+                    # Kurzer Timeout nur, damit stop() wirkt; sonst wartet der Thread im epoll
+                    if not sel.select(timeout=1.0):
+                        continue
+                    data = sock.recv(4096)
+                    if not data:
+                        break
+                    self.backoff.reset()
+                    self.feed(data)
+            except OSError:
+                pass
+            finally:
+                sel.close()
+                sock.close()
+            self.reconnects += 1
+            self._wakeup.wait(self.backoff.next())
+
+    def stop(self):
+        self.running = False
+        self._wakeup.set()
+
+
+# === APRS KISS Listener ===
+class KISSListener(threading.Thread):
+    # Ein Thread für alle TNCs: endpoints ist eine Liste von KISSEndpoint
+    # (aprspi/endpoints.py), ohne Angabe wie bisher nur host:port
+    def __init__(self, mycall="OE5ITH", host="127.0.0.1", port=8001, endpoints=None):
+        super().__init__(daemon=True)
+        self.endpoints = list(endpoints) if endpoints else [KISSEndpoint(None, host, port)]
+        for index, endpoint in enumerate(self.endpoints):
+            endpoint.index = index
+        self.mycall = mycall
+        self.latest_frame = "APRS: No Frame"
+        self.latest_packet = None
+        self.stations = StationStore()
+        # DupeCache (aprspi/dedup.py) oder None: Kopien über Digipeater nur als Pfad zählen
+        self.dupes = DupeCache()
+        # (Endpunkt, KISS-Port) -> ChannelStats
+        self.channels = {}
+        # on_packet(packet, own) nach jedem dekodierten Frame
+        self.on_packet = None
+        # PacketLog für die rohen Frames (aprspi/packetlog.py) oder None
+        self.log = None
+        self.log_errors = 0
+        # KISSFanout (aprspi/fanout.py) oder None
+        self.fanout = None
+        # Messenger (aprspi/messaging.py) oder None: Nachrichten an MYCALL und Acks
+        self.messages = None
+        # Weckt die Selector-Schleife nach transmit(); asyncio ersetzt das
+        self.wake = self._wake
+        self._wake_socks = None
+        # Kennzahlen für aprspi/metrics.py
+        self.bytes_received = 0
+        self.frames_rejected = 0
+        self.reconnects = 0
+        self.connect_failures = 0
+        self.decode_time = Histogram(DECODE_BUCKETS)
+        self.running = True
+
+    @property
+    def deframer(self):
+        return self.endpoints[0].deframer
+
+    @property
+    def frames_received(self):
+        return sum(e.deframer.frames for e in self.endpoints)
+
+    @property
+    def frames_dropped(self):
+        return sum(e.deframer.dropped for e in self.endpoints)
+
+    def channel(self, endpoint, port):
+        key = (endpoint.name, port)
+        stats = self.channels.get(key)
+        if stats is None:
+            stats = self.channels[key] = ChannelStats(endpoint.name, port)
+        return stats
+
+    def feed(self, data, endpoint=None):
+        endpoint = endpoint or self.endpoints[0]
+        self.bytes_received += len(data)
+        endpoint.bytes_received += len(data)
+        for frame in endpoint.deframer.feed(data):
+            if frame.cmd != CMD_DATA:
+                continue
+            channel = self.channel(endpoint, frame.port)
+            channel.frames += 1
+            start = time.perf_counter()
+            try:
+                ax25 = decode_ax25(frame.data)
+            except ValueError:
+                self._log(frame, endpoint)
+                self.frames_rejected += 1
+                channel.rejected += 1
+                continue
+            if self.fanout is not None:
+                # Clients bekommen jede Kopie, wie direkt vom TNC
+                self.fanout.publish(endpoint, frame.port, frame.data)
+            digis = relayed_by(ax25.path)
+            if self.dupes is not None and self.dupes.check(ax25, digis).count > 1:
+                self.stations.relayed(str(ax25.src), digis)
+                if self.messages is not None and ax25.info[:1] == b":":
+                    # Wiederholt die Gegenstelle, weil unser Ack verloren ging, muss
+                    # sie es erneut bekommen, auch innerhalb des Dupe-Fensters
+                    self.messages.handle(APRSPacket(ax25, endpoint.name, frame.port))
+                self.decode_time.observe(time.perf_counter() - start)
+                channel.duplicates += 1
+                continue
+            self._log(frame, endpoint)
+            packet = APRSPacket(ax25, endpoint.name, frame.port)
+            self.latest_packet = packet
+            self.stations.add(packet, digis=digis)
+            self.decode_time.observe(time.perf_counter() - start)
+            channel.decoded += 1
+            channel.last_heard = time.time()
+            src = packet.source
+            own = self.mycall in src
+            if own:
+                dest = str(packet.frame.dest)
+                self.latest_frame = f"{src} > {dest} | {packet.text}"
+            else:
+                self.latest_frame = f"{src} RX"
+            if self.messages is not None and packet.kind == "message":
+                self.messages.handle(packet)
+            if self.on_packet:
+                self.on_packet(packet, own)
+
+    def _log(self, frame, endpoint):
+        if self.log is not None:
+            try:
+                # Oberes Nibble: Endpunkt, unteres: KISS-Port
+                self.log.append(frame.data, endpoint.index << 4 | frame.port)
+            except OSError:
+                # Volle SD-Karte darf den Empfang nicht stoppen
+                self.log_errors += 1
+
+    def connection_failed(self, endpoint=None):
+        self.connect_failures += 1
+        if endpoint is not None:
+            endpoint.connect_failures += 1
+        if not any(e.connected for e in self.endpoints):
+            self.latest_frame = "APRS: Verbindung fehlgeschlagen"
+
+    def connection_lost(self, endpoint=None):
+        self.reconnects += 1
+        if endpoint is not None:
+            endpoint.reconnects += 1
+
+    def transmit(self, data, port=0, endpoint=None, cmd=CMD_DATA):
+        # AX.25-Frame an den TNC, aus beliebigem Thread; geschrieben wird im Listener
+        self.send_kiss(kiss_frame(data, port, cmd), endpoint)
+
+    def send_kiss(self, frame, endpoint=None):
+        # Fertiges KISS-Frame (z.B. mit vorab kodiertem Kopf aus aprspi/beacon.py)
+        endpoint = endpoint or self.endpoints[0]
+        endpoint.tx.append(frame)
+        self.wake()
+
+    # === Selector-Schleife ===
+    def _wake(self):
+        if self._wake_socks is not None:
+            try:
+                self._wake_socks[1].send(b'\0')
+            except (BlockingIOError, OSError):
+                pass
+
+    def _drain_wake(self, mask):
+        try:
+            self._wake_socks[0].recv(4096)
+        except BlockingIOError:
+            pass
+
+    def _flush(self, sel, endpoint):
+        # Schreibinteresse nur, solange etwas im Puffer liegt
+        try:
+            pending = endpoint.write_pending()
+        except OSError:
+            self._close(sel, endpoint, failed=False)
+            return
+        if pending != endpoint.writing:
+            endpoint.writing = pending
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if pending else 0)
+            sel.modify(endpoint.fileno(), events, endpoint)
+
+    def _open(self, sel, endpoint):
+        try:
+            endpoint.open()
+        except OSError:
+            self.connection_failed(endpoint)
+            endpoint.close()
+            return
+        events = selectors.EVENT_WRITE if endpoint.connecting else selectors.EVENT_READ
+        sel.register(endpoint.fileno(), events, endpoint)
+
+    def _close(self, sel, endpoint, failed):
+        sel.unregister(endpoint.fileno())
+        if failed:
+            endpoint.close()
+            self.connection_failed(endpoint)
+        else:
+            # Abbruch einer laufenden Verbindung: gleich wieder versuchen
+            endpoint.close(delay=1.0)
+            self.connection_lost(endpoint)
+
+    def poll(self, sel, timeout):
+        for key, mask in sel.select(timeout):
+            if callable(key.data):
+                # Weck-Socket und KISS-Verteiler
+                key.data(mask)
+                continue
+            endpoint = key.data
+            if endpoint.connecting:
+                try:
+                    endpoint.finish_connect()
+                except OSError:
+                    self._close(sel, endpoint, failed=True)
+                    continue
+                sel.modify(key.fd, selectors.EVENT_READ, endpoint)
+                continue
+            if mask & selectors.EVENT_WRITE:
+                self._flush(sel, endpoint)
+                if not mask & selectors.EVENT_READ:
+                    continue
+            try:
+                data = endpoint.read()
+            except (BlockingIOError, InterruptedError):
+                continue
+            except OSError:
+                # pty ohne Gegenseite liefert EIO
+                data = b''
+            if not data:
+                self._close(sel, endpoint, failed=False)
+                continue
+            endpoint.backoff.reset()
+            self.feed(data, endpoint)
+
+    def run(self):
+        sel = selectors.DefaultSelector()
+        self._wake_socks = socket.socketpair()
+        for sock in self._wake_socks:
+            sock.setblocking(False)
+        sel.register(self._wake_socks[0], selectors.EVENT_READ, self._drain_wake)
+        if self.fanout is not None:
+            self.fanout.open(sel)
+        try:
+            while self.running:
+                now = time.monotonic()
+                timeout = 1.0
+                for endpoint in self.endpoints:
+                    if endpoint.closed:
+                        if now >= endpoint.retry_at:
+                            self._open(sel, endpoint)
+                        else:
+                            timeout = min(timeout, endpoint.retry_at - now)
+                    elif endpoint.connecting and now > endpoint.deadline:
+                        self._close(sel, endpoint, failed=True)
+                    elif endpoint.connected and (endpoint.tx or endpoint.writing):
+                        self._flush(sel, endpoint)
+                self.poll(sel, max(timeout, 0.0))
+        finally:
+            if self.fanout is not None:
+                self.fanout.close()
+            for endpoint in self.endpoints:
+                if not endpoint.closed:
+                    sel.unregister(endpoint.fileno())
+                    endpoint.close()
+            sel.close()
+            for sock in self._wake_socks:
+                sock.close()
+            self._wake_socks = None
+
+    def stop(self):
+        self.running = False
+        self.wake()
@@ -0,0 +1,228 @@
+# APRS Pi – APRS-Nachrichten: Posteingang, automatische Acks, Wiederholungen
+#
+# Eingehende Nachrichten an MYCALL landen im Posteingang und werden sofort
+# bestätigt (":ABSENDER:ackNR"). Sendet die Gegenstelle nochmal, weil unser
+# Ack verloren ging, wird erneut bestätigt, die Nachricht aber nur einmal
+# angezeigt (Schlüssel Absender + Nummer, SEEN_WINDOW Sekunden). Der
+# KISSListener reicht solche Wiederholungen auch innerhalb seines
+# Dupe-Fensters durch; Kopien über Digipeater (innerhalb ACK_HOLDOFF)
+# bekommen kein weiteres Ack.
+#
+# Ausgehende Nachrichten gehen sofort raus und werden bis zum Ack nach
+# RETRY_SCHEDULE wiederholt (30 s, 60 s, 120 s, ...). Alle Wiederholungen
+# liegen in einem Heap (Fälligkeit, Nummer), abgearbeitet von einem Thread
+# wie beim Sampler statt eines Timers je Nachricht. Ein Ack entfernt nichts
+# aus dem Heap, der Eintrag wird beim Abholen nur übersprungen.
+#
+#   python3 -m aprspi --messages --send OE5XYZ:Hallo
+
+import time
+import heapq
+import threading
+from collections import deque, OrderedDict
+
+from aprspi.ax25 import encode_header
+from aprspi.beacon import BEACON_DEST, BEACON_PATH
+
+# Wartezeit nach der 1., 2., ... Aussendung in Sekunden; ohne Ack nach der
+# letzten gilt die Nachricht als gescheitert (5 Aussendungen in 15,5 Minuten)
+RETRY_SCHEDULE = (30.0, 60.0, 120.0, 240.0, 480.0)
+SEEN_WINDOW = 1800.0
+# Kopien derselben Aussendung über Digipeater kommen innerhalb weniger
+# Sekunden, eine Wiederholung der Gegenstelle frühestens nach ~30 s
+ACK_HOLDOFF = 10.0
+MAX_TEXT = 67
+INBOX_SIZE = 50
+
+
+class InboxEntry:
+    __slots__ = ("src", "text", "msgno", "received", "copies", "acked")
+
+    def __init__(self, src, text, msgno, received):
+        self.src = src
+        self.text = text
+        self.msgno = msgno
+        self.received = received
+        # Wiederholungen der Gegenstelle, die nicht erneut angezeigt wurden
+        self.copies = 1
+        # Zeitpunkt des letzten Acks (Digipeater-Kopien innerhalb ack_holdoff nicht erneut)
+        self.acked = received
+
+
+class OutgoingMessage:
+    __slots__ = ("addressee", "text", "msgno", "info", "tries", "state", "created", "finished")
+
+    def __init__(self, addressee, text, msgno, info, created):
+        self.addressee = addressee
+        self.text = text
+        self.msgno = msgno
+        self.info = info
+        self.tries = 0
+        # pending, acked, rejected oder failed
+        self.state = "pending"
+        self.created = created
+        self.finished = None
+
+
+class Messenger(threading.Thread):
+    def __init__(self, listener, mycall, path=BEACON_PATH, schedule=RETRY_SCHEDULE, inbox_size=INBOX_SIZE,
+                 ack_holdoff=ACK_HOLDOFF):
+        super().__init__(daemon=True)
+        self.listener = listener
+        self.mycall = mycall.upper()
+        self.schedule = schedule
+        self.ack_holdoff = ack_holdoff
+        self.inbox = deque(maxlen=inbox_size)
+        self.unread = 0
+        # on_message(entry) nach jeder neuen Nachricht im Posteingang
+        self.on_message = None
+        # Nummer -> OutgoingMessage, auch abgeschlossene bis zum Verdrängen (Anzeige)
+        self.outbox = OrderedDict()
+        self.outbox_size = inbox_size
+        # Kennzahlen
+        self.received = 0
+        self.retransmissions = 0
+        self.acks_sent = 0
+        self.sent = 0
+        self.retries = 0
+        self.acked = 0
+        self.rejected = 0
+        self.failed = 0
+        self.running = True
+        # Adressfeld einmal vorab wie bei den Baken
+        self._header = encode_header(mycall, BEACON_DEST, path)
+        self._seen = OrderedDict()
+        self._next_msgno = 1
+        self._heap = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    # === Empfang (Listener-Thread) ===
+    def handle(self, packet, now=None):
+        # Von KISSListener.feed für jedes Paket der Art "message" aufgerufen
+        data = packet.data
+        msg_type = data.get("msg_type")
+        if msg_type is None or data["addressee"].upper() != self.mycall:
+            return
+        src = packet.source
+        if msg_type in ("ack", "rej"):
+            self._acked(src, data["msgno"], msg_type)
+            return
+        if msg_type != "message":
+            return
+        now = time.time() if now is None else now
+        msgno = data.get("msgno")
+        if "reply_ack" in data:
+            # Neues Reply-Ack-Format "{MM}AA": AA bestätigt eine unserer Nachrichten
+            self._acked(src, data["reply_ack"], "ack")
+        with self._lock:
+            key = (src, msgno or data["text"])
+            entry = self._seen.get(key)
+            if entry is not None and now - entry.received < SEEN_WINDOW:
+                if now - entry.acked < self.ack_holdoff:
+                    # Dieselbe Aussendung über einen weiteren Digipeater
+                    return
+                entry.copies += 1
+                entry.acked = now
+                self.retransmissions += 1
+                new = False
+            else:
+                entry = InboxEntry(src, data["text"], msgno, now)
+                self._seen[key] = entry
+                self._seen.move_to_end(key)
+                while self._seen:
+                    oldest = next(iter(self._seen.values()))
+                    if now - oldest.received < SEEN_WINDOW and len(self._seen) <= 4 * self.inbox.maxlen:
+                        break
+                    self._seen.popitem(last=False)
+                self.inbox.appendleft(entry)
+                self.unread += 1
+                self.received += 1
+                new = True
+        if msgno:
+            self.send_info(f":{src:<9}:ack{msgno}")
+            self.acks_sent += 1
+        if new and self.on_message:
+            self.on_message(entry)
+
+    def _acked(self, src, msgno, state):
+        with self._lock:
+            message = self.outbox.get(msgno.strip())
+            if message is None or message.state != "pending" or message.addressee != src.upper():
+                return
+            message.finished = time.time()
+            if state == "ack":
+                message.state = "acked"
+                self.acked += 1
+            else:
+                message.state = "rejected"
+                self.rejected += 1
+
+    # === Senden ===
+    def send(self, addressee, text):
+        # Nachricht einreihen und sofort senden; liefert die OutgoingMessage
+        addressee = addressee.upper()
+        if not 1 <= len(addressee) <= 9:
+            raise ValueError("Empfänger: 1 bis 9 Zeichen")
+        if len(text) > MAX_TEXT or any(c in text for c in "|~{"):
+            raise ValueError(f"Text: höchstens {MAX_TEXT} Zeichen, ohne | ~ {{")
+        with self._lock:
+            msgno = str(self._next_msgno)
+            self._next_msgno = self._next_msgno % 99999 + 1
+            message = OutgoingMessage(addressee, text, msgno, f":{addressee:<9}:{text}{{{msgno}", time.time())
+            self.outbox[msgno] = message
+            while len(self.outbox) > self.outbox_size:
+                self.outbox.popitem(last=False)
+            heapq.heappush(self._heap, (time.monotonic(), msgno))
+        self._wakeup.set()
+        return message
+
+    def send_info(self, info):
+        self.listener.transmit(self._header + info.encode("latin-1"))
+
+    def pending(self):
+        with self._lock:
+            return sum(1 for m in self.outbox.values() if m.state == "pending")
+
+    def mark_read(self):
+        self.unread = 0
+
+    # === Wiederholungen ===
+    def run_due(self):
+        # Fällige Aussendungen abarbeiten, liefert die Wartezeit bis zur nächsten
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                if not self._heap:
+                    return 1.0
+                due, msgno = self._heap[0]
+                if due > now:
+                    return due - now
+                heapq.heappop(self._heap)
+                message = self.outbox.get(msgno)
+                if message is None or message.state != "pending":
+                    # Inzwischen bestätigt oder verdrängt
+                    continue
+                if message.tries >= len(self.schedule):
+                    # Auch nach der letzten Wartezeit kein Ack
+                    message.state = "failed"
+                    message.finished = time.time()
+                    self.failed += 1
+                    continue
+                if message.tries:
+                    self.retries += 1
+                else:
+                    self.sent += 1
+                heapq.heappush(self._heap, (now + self.schedule[message.tries], msgno))
+                message.tries += 1
+            self.send_info(message.info)
+
+    def run(self):
+        while self.running:
+            delay = self.run_due()
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+
+    def stop(self):
+        self.running = False
+        self._wakeup.set()
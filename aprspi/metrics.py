@@ -0,0 +1,271 @@
+# APRS Pi – Kennzahlen für /metrics (Prometheus-Textformat) und die Statistikseite
+#
+# Auf dem Empfangsweg wird nur gezählt: Zähler sind einfache Attribute der
+# Listener, Laufzeiten landen per bisect in festen Histogramm-Buckets. Der
+# Text für /metrics und die Raten für die Konsole entstehen erst beim Abruf.
+#
+#   python3 -m aprspi --metrics 9110        ->  curl http://127.0.0.1:9110/metrics
+
+import os
+import time
+import bisect
+import threading
+
+METRICS_PORT = 9110
+
+# Sekunden, wie bei Prometheus üblich
+DECODE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01)
+RENDER_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # Letzter Eintrag: über dem größten Bucket (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        # Obergrenze des Buckets, in dem das Quantil liegt (für die Anzeige genau genug)
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Rates:
+    # Zähler -> Rate pro Sekunde seit der letzten Abfrage (mind. window Sekunden)
+    def __init__(self, window=1.0):
+        self.window = window
+        self._last = {}
+        self._rates = {}
+
+    def update(self, name, value, now=None):
+        now = time.monotonic() if now is None else now
+        last = self._last.get(name)
+        if last is None or value < last[1]:
+            self._last[name] = (now, value)
+            return self._rates.get(name, 0.0)
+        if now - last[0] >= self.window:
+            self._rates[name] = (value - last[1]) / (now - last[0])
+            self._last[name] = (now, value)
+        return self._rates.get(name, 0.0)
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+# === Prometheus-Textformat ===
+class _Writer:
+    def __init__(self):
+        self.lines = []
+
+    def metric(self, name, kind, text, samples):
+        # samples: Wert oder Liste von (Labels-Dict, Wert)
+        name = "aprspi_" + name
+        self.lines.append(f"# HELP {name} {text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        if not isinstance(samples, list):
+            samples = [({}, samples)]
+        for labels, value in samples:
+            if value is not None:
+                self.lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histogram(self, name, text, hist, labels=None):
+        name = "aprspi_" + name
+        self.lines.append(f"# HELP {name} {text}")
+        self.lines.append(f"# TYPE {name} histogram")
+        labels = labels or {}
+        total = 0
+        for bound, n in zip(hist.buckets + (float("inf"),), hist.counts):
+            total += n
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            self.lines.append(f"{name}_bucket{_labels(dict(labels, le=le))} {total}")
+        self.lines.append(f"{name}_sum{_labels(labels)} {_number(hist.sum)}")
+        self.lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+
+    def summary(self, name, text, samples):
+        # samples: Liste von (Labels-Dict, Summe, Anzahl)
+        name = "aprspi_" + name
+        self.lines.append(f"# HELP {name} {text}")
+        self.lines.append(f"# TYPE {name} summary")
+        for labels, total, count in samples:
+            self.lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+            self.lines.append(f"{name}_count{_labels(labels)} {count}")
+
+    def text(self):
+        return "\n".join(self.lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def collect(monitor, scheduler=None, renderer=None):
+    out = _Writer()
+    aprs = monitor.aprs
+    out.metric("kiss_bytes_received_total", "counter", "Bytes von allen KISS-Endpunkten", aprs.bytes_received)
+    out.metric("kiss_frames_total", "counter", "Vollständige KISS-Frames", aprs.frames_received)
+    out.metric("kiss_frames_dropped_total", "counter", "Verworfene KISS-Frames (zu lang, Escape-Fehler)",
+               aprs.frames_dropped)
+    out.metric("frames_decoded_total", "counter", "Dekodierte AX.25/APRS-Frames ohne Duplikate", aprs.stations.total)
+    if aprs.dupes is not None:
+        out.metric("frames_duplicate_total", "counter", "Kopien desselben Pakets im Dupe-Fenster",
+                   aprs.dupes.duplicates)
+        out.metric("dupe_cache_entries", "gauge", "Pakete im Dupe-Fenster", len(aprs.dupes))
+    out.metric("frames_rejected_total", "counter", "Frames, die nicht als AX.25 dekodierbar waren",
+               aprs.frames_rejected)
+    out.histogram("decode_seconds", "Dekodierzeit je Frame (AX.25, APRS, Stationstabelle)", aprs.decode_time)
+    out.metric("kiss_reconnects_total", "counter", "Abgebrochene KISS-Verbindungen", aprs.reconnects)
+    out.metric("kiss_connect_failures_total", "counter", "Fehlgeschlagene Verbindungsaufbauten zu Direwolf",
+               aprs.connect_failures)
+    endpoints = aprs.endpoints
+    out.metric("endpoint_connected", "gauge", "1 wenn der KISS-Endpunkt verbunden ist",
+               [({"endpoint": e.name}, e.connected) for e in endpoints])
+    out.metric("endpoint_bytes_received_total", "counter", "Bytes je KISS-Endpunkt",
+               [({"endpoint": e.name}, e.bytes_received) for e in endpoints])
+    out.metric("endpoint_reconnects_total", "counter", "Abgebrochene Verbindungen je Endpunkt",
+               [({"endpoint": e.name}, e.reconnects) for e in endpoints])
+    out.metric("endpoint_connect_failures_total", "counter", "Fehlversuche je Endpunkt",
+               [({"endpoint": e.name}, e.connect_failures) for e in endpoints])
+    channels = list(aprs.channels.values())
+    out.metric("channel_frames_total", "counter", "KISS-Datenframes je Endpunkt und Kanal",
+               [({"endpoint": c.endpoint, "channel": c.channel}, c.frames) for c in channels])
+    out.metric("channel_rejected_total", "counter", "Nicht dekodierbare Frames je Endpunkt und Kanal",
+               [({"endpoint": c.endpoint, "channel": c.channel}, c.rejected) for c in channels])
+    out.metric("channel_duplicates_total", "counter", "Duplikate je Endpunkt und Kanal",
+               [({"endpoint": c.endpoint, "channel": c.channel}, c.duplicates) for c in channels])
+    out.metric("endpoint_frames_sent_total", "counter", "An den TNC gesendete Frames je Endpunkt",
+               [({"endpoint": e.name}, e.frames_sent) for e in endpoints])
+    fanout = aprs.fanout
+    if fanout is not None:
+        out.metric("fanout_clients", "gauge", "Verbundene Clients am KISS-Verteiler", len(fanout.clients))
+        out.metric("fanout_accepted_total", "counter", "Angenommene Client-Verbindungen", fanout.accepted)
+        out.metric("fanout_dropped_total", "counter", "Für langsame Clients verworfene Frames",
+                   fanout.dropped)
+        out.metric("fanout_slow_disconnects_total", "counter", "Wegen Stillstand getrennte Clients",
+                   fanout.slow_disconnects)
+        out.metric("fanout_tx_frames_total", "counter", "Frames von Clients an den TNC", fanout.tx_frames)
+    beacon = monitor.beacon
+    if beacon is not None:
+        out.metric("beacons_sent_total", "counter", "Gesendete eigene Positionsbaken", beacon.sent)
+        out.metric("beacon_age_seconds", "gauge", "Sekunden seit der letzten eigenen Bake",
+                   time.monotonic() - beacon.last_sent if beacon.last_sent is not None else None)
+    messages = monitor.messages
+    if messages is not None:
+        out.metric("messages_received_total", "counter", "Nachrichten an MYCALL (ohne Wiederholungen)",
+                   messages.received)
+        out.metric("message_retransmissions_received_total", "counter",
+                   "Erneut empfangene, schon angezeigte Nachrichten", messages.retransmissions)
+        out.metric("message_acks_sent_total", "counter", "Gesendete Acks", messages.acks_sent)
+        out.metric("messages_sent_total", "counter", "Eigene Nachrichten, erste Aussendung", messages.sent)
+        out.metric("message_retries_total", "counter", "Wiederholte Aussendungen eigener Nachrichten",
+                   messages.retries)
+        out.metric("messages_acked_total", "counter", "Bestätigte eigene Nachrichten", messages.acked)
+        out.metric("messages_rejected_total", "counter", "Abgelehnte eigene Nachrichten", messages.rejected)
+        out.metric("messages_failed_total", "counter", "Eigene Nachrichten ohne Ack", messages.failed)
+        out.metric("messages_pending", "gauge", "Eigene Nachrichten, die noch auf ein Ack warten",
+                   messages.pending())
+    out.metric("stations", "gauge", "Gehörte Stationen", len(aprs.stations))
+    if aprs.log is not None:
+        out.metric("packetlog_errors_total", "counter", "Schreibfehler im Paketlog", aprs.log_errors)
+
+    gps = monitor.gps
+    stream = gps.stream
+    out.metric("gpsd_messages_total", "counter", "gpsd-Meldungen", stream.messages)
+    out.metric("gpsd_errors_total", "counter", "Unlesbare gpsd-Zeilen", stream.errors)
+    out.metric("gpsd_message_rate", "gauge", "gpsd-Meldungen pro Sekunde", gps.message_rate)
+    out.metric("gpsd_reconnects_total", "counter", "Abgebrochene gpsd-Verbindungen", gps.reconnects)
+    out.metric("gps_fix", "gauge", "1 bei 2D/3D-Fix", gps.has_fix)
+    out.metric("gps_fix_age_seconds", "gauge", "Sekunden seit dem letzten Fix", gps.fix_age)
+    gpx = monitor.gpx
+    if gpx is not None:
+        out.metric("gpx_points_received_total", "counter", "TPV mit Fix an die GPX-Aufzeichnung", gpx.points_received)
+        out.metric("gpx_points_written_total", "counter", "Nach der Vereinfachung geschriebene Punkte",
+                   gpx.points_written)
+        out.metric("gpx_bytes_written_total", "counter", "In GPX-Dateien geschriebene Bytes", gpx.bytes_written)
+        out.metric("gpx_flushes_total", "counter", "Gebündelte Schreibvorgänge", gpx.flushes)
+        out.metric("gpx_fsyncs_total", "counter", "fsync-Aufrufe", gpx.fsyncs)
+        out.metric("gpx_errors_total", "counter", "Schreibfehler", gpx.errors)
+
+    sources = monitor.sampler.sources.values()
+    out.summary("sampler_duration_seconds", "Abfragezeit je Sensorquelle",
+                [({"source": s.name}, s.total_ms / 1000, s.runs) for s in sources])
+    out.metric("sampler_duration_max_seconds", "gauge", "Längste Abfrage je Quelle",
+               [({"source": s.name}, s.max_ms / 1000) for s in sources])
+    out.metric("sampler_errors_total", "counter", "Fehlgeschlagene Abfragen je Quelle",
+               [({"source": s.name}, s.errors) for s in sources])
+
+    if scheduler is not None:
+        out.histogram("render_seconds", "Zeichenzeit je Seite", scheduler.render_time)
+        out.metric("display_events_total", "counter", "Ereignisse an die Anzeige", scheduler.events)
+    oled = getattr(renderer, "renderer", None)
+    if oled is not None:
+        out.metric("oled_bytes_sent_total", "counter", "Bytes über SPI an das OLED", oled.bytes_sent)
+    out.metric("process_resident_memory_bytes", "gauge", "Speicherbedarf (RSS)", rss_bytes())
+    return out.text()
+
+
+class MetricsServer(threading.Thread):
+    # GET /metrics in einem eigenen Thread; http.server erst hier importiert
+    def __init__(self, monitor, scheduler=None, renderer=None, host="127.0.0.1", port=METRICS_PORT):
+        super().__init__(daemon=True)
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = collect(owner.monitor, owner.scheduler, owner.renderer).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.monitor = monitor
+        self.scheduler = scheduler
+        self.renderer = renderer
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.host, self.port = self.server.server_address[:2]
+
+    def run(self):
+        self.server.serve_forever(poll_interval=0.5)
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,186 @@
+# APRS Pi – NTP-Status direkt über das Steuerprotokoll statt "ntpq -p"
+#
+# ntpd: Mode-6-Control-Messages über UDP 123 (READSTAT liefert die
+# Assoziationen mit Peer-Status, READVAR die Variablen des Systempeers).
+# chronyd: Fallback über den cmdmon-Port (UDP 323, Anfrage TRACKING).
+
+import time
+import struct
+import socket
+
+NTP_PORT = 123
+CHRONY_PORT = 323
+
+# === ntpd Mode 6 ===
+MODE6_HEADER = struct.Struct("!BBHHHHH")
+OP_READSTAT = 1
+OP_READVAR = 2
+FLAG_RESPONSE = 0x80
+FLAG_ERROR = 0x40
+FLAG_MORE = 0x20
+
+SEL_SYSPEER = 6
+SEL_PPSPEER = 7
+# Auswahlstatus -> Tally-Zeichen wie in ntpq -p
+TALLY = " x.-+#*o"
+
+PEER_VARS = b"srcadr,srchost,refid,offset,jitter,stratum"
+
+# Referenzuhren erscheinen als 127.127.<Typ>.<Einheit>
+REFCLOCKS = {1: "LOCAL", 20: "NMEA", 22: "PPS", 28: "SHM", 46: "GPSD_JSON"}
+
+# === chronyd cmdmon ===
+CHRONY_REQ = struct.Struct("!BBBBHHIII")
+CHRONY_REPLY = struct.Struct("!BBBBHHHHHHIII")
+CHRONY_VERSION = 6
+REQ_TRACKING = 33
+RPY_TRACKING = 5
+# Anfrage muss mindestens so lang wie die Antwort sein (Schutz vor Verstärkung)
+TRACKING_REPLY_LEN = CHRONY_REPLY.size + 76
+
+NO_SYNC = ("NoSync", "-", "-", "-")
+FAILED = ("NTP", "?", "?", "?")
+
+
+def parse_vars(text):
+    # "srcadr=127.127.28.0, refid=\"GPS\", offset=-0.123" -> dict
+    result = {}
+    for item in text.replace("\r\n", "").split(","):
+        key, sep, value = item.strip().partition("=")
+        if sep:
+            result[key] = value.strip().strip('"')
+    return result
+
+
+def peer_name(variables):
+    host = variables.get("srchost")
+    if host:
+        return host
+    addr = variables.get("srcadr", "?")
+    parts = addr.split(".")
+    if len(parts) == 4 and parts[:2] == ["127", "127"]:
+        kind = REFCLOCKS.get(int(parts[2]), f"REFCLK{parts[2]}")
+        return f"{kind}({parts[3]})"
+    return addr
+
+
+def chrony_float(raw):
+    # chrony: 7 Bit Exponent, 25 Bit Koeffizient, beide mit Vorzeichen
+    exp = raw >> 25
+    if exp >= 64:
+        exp -= 128
+    coef = raw & 0x1FFFFFF
+    if coef >= 1 << 24:
+        coef -= 1 << 25
+    return coef * 2.0 ** (exp - 25)
+
+
+class NTPQuery:
+    def __init__(self, host="127.0.0.1", port=NTP_PORT, chrony_port=CHRONY_PORT, timeout=1.0, ttl=10.0):
+        self.host = host
+        self.port = port
+        self.chrony_port = chrony_port
+        self.timeout = timeout
+        self.ttl = ttl
+        self.backend = None
+        self._sequence = 0
+        self._peer = None
+        self._result = None
+        self._stamp = 0.0
+
+    def query(self):
+        # Ergebnis wie bisher get_ntpq_info(): (Quelle, RefID, Offset ms, Jitter ms)
+        now = time.monotonic()
+        if self._result is not None and now - self._stamp < self.ttl:
+            return self._result
+        result = None
+        for backend, func in (("ntpd", self._query_ntpd), ("chrony", self._query_chrony)):
+            try:
+                result = func()
+            except (OSError, ValueError, struct.error):
+                continue
+            self.backend = backend
+            break
+        self._result = result or FAILED
+        self._stamp = now
+        return self._result
+
+    # === ntpd ===
+    def _request(self, sock, opcode, assoc=0, data=b''):
+        self._sequence = (self._sequence + 1) & 0xFFFF
+        packet = MODE6_HEADER.pack(0x16, opcode, self._sequence, 0, assoc, 0, len(data)) + data
+        packet += b'\0' * (-len(packet) % 4)
+        sock.sendto(packet, (self.host, self.port))
+        # Antwort kann in mehreren Fragmenten kommen (M-Bit, Offset)
+        fragments = {}
+        status = 0
+        while True:
+            reply, _ = sock.recvfrom(4096)
+            if len(reply) < MODE6_HEADER.size:
+                raise ValueError("NTP-Antwort zu kurz")
+            _, flags, seq, status, _, offset, count = MODE6_HEADER.unpack_from(reply)
+            if seq != self._sequence or not flags & FLAG_RESPONSE or flags & 0x1F != opcode:
+                continue
+            if flags & FLAG_ERROR:
+                raise ValueError(f"NTP-Fehler {status >> 8}")
+            fragments[offset] = reply[MODE6_HEADER.size:MODE6_HEADER.size + count]
+            if not flags & FLAG_MORE:
+                break
+        return status, b''.join(fragments[k] for k in sorted(fragments))
+
+    def _find_peer(self, sock):
+        _, data = self._request(sock, OP_READSTAT)
+        for i in range(0, len(data) - 3, 4):
+            assoc, status = struct.unpack_from("!HH", data, i)
+            if (status >> 8) & 0x07 in (SEL_SYSPEER, SEL_PPSPEER):
+                return assoc
+        return None
+
+    def _query_ntpd(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(self.timeout)
+            # Zwischengespeicherten Systempeer zuerst direkt abfragen
+            for attempt in range(2):
+                if self._peer is None or attempt:
+                    self._peer = self._find_peer(sock)
+                    if self._peer is None:
+                        return NO_SYNC
+                status, data = self._request(sock, OP_READVAR, self._peer, PEER_VARS)
+                select = (status >> 8) & 0x07
+                if select in (SEL_SYSPEER, SEL_PPSPEER):
+                    break
+            else:
+                return NO_SYNC
+        variables = parse_vars(data.decode("ascii", "replace"))
+        return (TALLY[select] + peer_name(variables), variables.get("refid", "-"),
+                variables.get("offset", "?"), variables.get("jitter", "?"))
+
+    # === chronyd ===
+    def _query_chrony(self):
+        self._sequence = (self._sequence + 1) & 0xFFFF
+        request = CHRONY_REQ.pack(CHRONY_VERSION, 1, 0, 0, REQ_TRACKING, 0, self._sequence, 0, 0)
+        request += b'\0' * (TRACKING_REPLY_LEN - len(request))
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.sendto(request, (self.host, self.chrony_port))
+            reply, _ = sock.recvfrom(4096)
+        if len(reply) < TRACKING_REPLY_LEN:
+            raise ValueError("chrony-Antwort zu kurz")
+        fields = CHRONY_REPLY.unpack_from(reply)
+        version, _, _, _, _, rpy, status = fields[:7]
+        if version != CHRONY_VERSION or rpy != RPY_TRACKING or status != 0 or fields[10] != self._sequence:
+            raise ValueError("ungültige chrony-Antwort")
+        data = reply[CHRONY_REPLY.size:]
+        ref_id = struct.unpack_from("!I", data, 0)[0]
+        family = struct.unpack_from("!H", data, 20)[0]
+        stratum, leap = struct.unpack_from("!HH", data, 24)
+        if ref_id == 0 or leap == 3:
+            return NO_SYNC
+        last_offset, rms_offset = (chrony_float(v) for v in struct.unpack_from("!II", data, 44))
+        if family == 1:
+            source = socket.inet_ntoa(data[4:8])
+        else:
+            # Referenzuhr: RefID enthält den Namen (z. B. "PPS", "GPS")
+            source = data[0:4].rstrip(b'\0').decode("ascii", "replace")
+        refid = data[0:4].rstrip(b'\0').decode("ascii", "replace") if stratum <= 1 else socket.inet_ntoa(data[0:4])
+        return "*" + source, refid, f"{last_offset * 1000:.3f}", f"{rms_offset * 1000:.3f}"
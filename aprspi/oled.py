@@ -0,0 +1,179 @@
+# APRS Pi – OLED-Renderer mit Frame-Diff
+#
+# Seiten werden in ein 1-Bit-Bild außerhalb des Displays gezeichnet. Vor dem
+# Senden wird das Bild in das GDDRAM-Format des SSD1306/SSD1309 umgerechnet
+# (8 Pages à 128 Byte, ein Byte = 8 Pixel senkrecht) und mit dem zuletzt
+# gesendeten Stand verglichen. Über SPI gehen nur geänderte Pages, und davon
+# nur der Spaltenbereich, der sich tatsächlich geändert hat.
+
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from PIL import Image, ImageDraw, ImageFont
+from luma.oled.device import ssd1306
+
+COLUMNADDR = 0x21
+PAGEADDR = 0x22
+
+# Bitreihenfolge umdrehen: PIL packt das linke Pixel ins MSB, im GDDRAM
+# gehört das oberste Pixel ins LSB
+_REVERSE = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
+def to_pages(image):
+    # Transponiert liegt jede Displayspalte in einer Bildzeile; tobytes()
+    # packt dann je 8 senkrechte Pixel in ein Byte
+    width, height = image.size
+    data = image.transpose(Image.TRANSPOSE).tobytes().translate(_REVERSE)
+    pages = height // 8
+    return [data[p::pages] for p in range(pages)]
+
+
+def changed_columns(old, new):
+    # Erste und letzte geänderte Spalte über XOR der Page als Ganzzahl
+    diff = int.from_bytes(old, "little") ^ int.from_bytes(new, "little")
+    if not diff:
+        return None
+    first = ((diff & -diff).bit_length() - 1) >> 3
+    last = (diff.bit_length() - 1) >> 3
+    return first, last
+
+
+class DiffRenderer:
+    def __init__(self, device, full_refresh=600):
+        self.device = device
+        self.image = Image.new("1", device.size)
+        self.draw = ImageDraw.Draw(self.image)
+        # Alle n Frames komplett senden, falls das Display einmal Müll bekommen hat
+        self.full_refresh = full_refresh
+        # Nur SSD1306-Familie kann direkt ins GDDRAM schreiben; der luma-dummy
+        # bekommt das fertige Bild, die Bytes werden trotzdem gezählt
+        self.raw = isinstance(device, ssd1306)
+        self.frames = 0
+        self.pages_sent = 0
+        self.bytes_sent = 0
+        self.unchanged = 0
+        self._pages = None
+
+    def invalidate(self):
+        self._pages = None
+
+    @contextmanager
+    def canvas(self):
+        self.draw.rectangle((0, 0) + self.image.size, fill=0)
+        yield self.draw
+        self.push()
+
+    def push(self):
+        self.frames += 1
+        image = self.device.preprocess(self.image)
+        pages = to_pages(image)
+        if self.full_refresh and self.frames % self.full_refresh == 0:
+            self._pages = None
+        old = self._pages
+        self._pages = pages
+        sent = 0
+        for index, page in enumerate(pages):
+            if old is None:
+                span = (0, len(page) - 1)
+            else:
+                span = changed_columns(old[index], page)
+                if span is None:
+                    continue
+            sent += 1
+            self._send(index, span[0], span[1], page)
+        if not sent:
+            self.unchanged += 1
+        elif not self.raw:
+            self.device.display(image)
+        self.pages_sent += sent
+
+    def _send(self, index, first, last, page):
+        data = page[first:last + 1]
+        self.bytes_sent += 6 + len(data)
+        if self.raw:
+            colstart = self.device._colstart
+            self.device.command(COLUMNADDR, colstart + first, colstart + last, PAGEADDR, index, index)
+            self.device.data(list(data))
+
+
+# === Text-Cache ===
+# Glyph-Atlas für alle Fonts, Schlüssel (Font, Zeichen) -> (Bitmap, Vorschub)
+_glyphs = {}
+GLYPH_PAD = 4
+
+
+def glyph(font, char):
+    key = (font, char)
+    entry = _glyphs.get(key)
+    if entry is None:
+        entry = _glyphs[key] = render(font, char)
+    return entry
+
+
+def render(font, text):
+    # Bitmap und Vorschub wie bei draw.text auf einem Bild im Modus "1":
+    # ohne mode="1" liefert FreeType die Metriken mit Antialiasing, die
+    # Zeilen würden 6-7 % schmaler als mit draw.text
+    _, _, right, bottom = font.getbbox(text, mode="1")
+    # Rand links/rechts, damit Überhänge nicht abgeschnitten werden
+    bitmap = Image.new("1", (int(right) + 2 * GLYPH_PAD, max(int(bottom), 1)))
+    ImageDraw.Draw(bitmap).text((GLYPH_PAD, 0), text, font=font, fill=255)
+    return bitmap, font.getlength(text, mode="1")
+
+
+class TextCache:
+    # Zeilen werden aus dem Glyph-Atlas zusammengesetzt statt jedes Mal von
+    # PIL gerastert. Label und Wert kommen als fertige Bitmaps aus einem
+    # LRU-Cache; Labels sind statisch, Werte wiederholen sich meist (Prozent,
+    # Temperatur), neu zusammengesetzt wird nur, was sich wirklich ändert.
+    # Abstände kommen aus den Vorschubbreiten der Glyphen (ohne Kerning).
+    # Beim Bitmap-Font älterer Pillow-Versionen ragen Glyphen in die
+    # Nachbarzelle und würden einzeln gerastert beschnitten; dort wird der
+    # ganze Text gerastert (draw.text ist mit diesem Font ohnehin schnell).
+    def __init__(self, font, size=256):
+        self.font = font
+        self.glyphs = isinstance(font, ImageFont.FreeTypeFont)
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._bitmaps = OrderedDict()
+
+    def bitmap(self, text):
+        entry = self._bitmaps.get(text)
+        if entry is not None:
+            self._bitmaps.move_to_end(text)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = self._bitmaps[text] = self._compose(text) if self.glyphs else render(self.font, text)
+        if len(self._bitmaps) > self.size:
+            self._bitmaps.popitem(last=False)
+        return entry
+
+    def _compose(self, text):
+        glyphs = [glyph(self.font, c) for c in text]
+        width = sum(advance for _, advance in glyphs)
+        height = max((g.height for g, _ in glyphs), default=1)
+        bitmap = Image.new("1", (int(width) + 2 * GLYPH_PAD, height))
+        draw = ImageDraw.Draw(bitmap)
+        x = GLYPH_PAD
+        for char, (g, advance) in zip(text, glyphs):
+            if char != " ":
+                draw.bitmap((round(x) - GLYPH_PAD, 0), g, fill=255)
+            x += advance
+        return bitmap, width
+
+    def width(self, text):
+        if not self.glyphs:
+            return self.font.getlength(text, mode="1")
+        return sum(glyph(self.font, c)[1] for c in text)
+
+    def text(self, draw, xy, label, value=""):
+        # Pixelgleich mit draw.text(xy, label + value, font=font, fill=255)
+        x, y = xy
+        for part in (label, value):
+            if part:
+                bitmap, width = self.bitmap(part)
+                draw.bitmap((x - GLYPH_PAD, y), bitmap, fill=255)
+                x += width
@@ -0,0 +1,246 @@
+# APRS Pi – Paketlog: rohe AX.25-Frames mit Zeitstempel
+#
+# Datendatei (*.log): Kopf MAGIC, danach je Frame ein Satz
+#   <Zeit float64><Port u8><Länge u16><AX.25-Bytes>
+# Port: unteres Nibble KISS-Port (Funkkanal), oberes Nibble Nummer des
+# KISS-Endpunkts (aprspi/endpoints.py, Reihenfolge der --kiss-Angaben).
+# Indexdatei (*.idx): je Frame <Zeit float64><Offset u64>, feste Breite.
+# Der Index wird per mmap gelesen, Zeitbereiche werden binär gesucht; aus
+# der Datendatei wird nur der gefundene Bereich gelesen.
+#
+# Rotation bei max_bytes und wenn die Uhr rückwärts springt (Pi ohne RTC
+# vor dem NTP-Sync), damit jede Datei zeitlich sortiert bleibt. Die
+# ältesten Dateien werden über max_files hinaus gelöscht.
+#
+#   python3 -m aprspi.packetlog list|dump|replay DIR [--from 2h] [--to ...]
+
+import os
+import sys
+import mmap
+import time
+import struct
+import argparse
+import datetime
+
+MAGIC = b"APRSLOG\x01"
+RECORD = struct.Struct("<dBH")
+INDEX = struct.Struct("<dQ")
+MAX_FRAME = 0xFFFF
+
+
+class PacketLog:
+    def __init__(self, directory, max_bytes=16 * 1024 * 1024, max_files=20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.records = 0
+        self._data = None
+        self._index = None
+        self._size = 0
+        self._last = None
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, data, port=0, now=None):
+        now = time.time() if now is None else now
+        if len(data) > MAX_FRAME:
+            raise ValueError("Frame zu lang")
+        if self._data is None or self._size >= self.max_bytes or now < self._last:
+            self._rotate(now)
+        offset = self._size
+        self._data.write(RECORD.pack(now, port, len(data)) + bytes(data))
+        self._data.flush()
+        # Index erst nach den Daten, damit jeder Indexeintrag gültig ist
+        self._index.write(INDEX.pack(now, offset))
+        self._index.flush()
+        self._size += RECORD.size + len(data)
+        self._last = now
+        self.records += 1
+
+    def _rotate(self, now):
+        self.close()
+        stamp = datetime.datetime.fromtimestamp(now).strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self.directory, f"packets-{stamp}")
+        suffix = 0
+        while os.path.exists(base + (f"-{suffix}" if suffix else "") + ".log"):
+            suffix += 1
+        base += f"-{suffix}" if suffix else ""
+        self._data = open(base + ".log", "wb")
+        self._index = open(base + ".idx", "wb")
+        self._data.write(MAGIC)
+        self._size = len(MAGIC)
+        self._prune()
+
+    def _prune(self):
+        # Nach Änderungszeit, nicht Name: nach einem Uhrsprung trägt die
+        # neueste Datei einen älteren Namen
+        files = sorted(log_files(self.directory), key=os.path.getmtime)
+        for path in files[:max(0, len(files) - self.max_files)]:
+            for name in (path, path[:-4] + ".idx"):
+                try:
+                    os.remove(name)
+                except OSError:
+                    pass
+
+    def close(self):
+        # Vor jeder Rotation und beim Beenden: Daten und Index auf die Karte
+        for f in (self._data, self._index):
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+                f.close()
+        self._data = self._index = None
+
+
+def log_files(directory):
+    # Dateinamen enthalten den Startzeitpunkt, sortiert = chronologisch
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return sorted(os.path.join(directory, n) for n in names if n.startswith("packets-") and n.endswith(".log"))
+
+
+class LogFile:
+    # Eine Daten-/Indexdatei; Index per mmap, Suche in O(log n)
+    def __init__(self, path):
+        self.path = path
+        self._mmap = None
+        self.count = 0
+        try:
+            with open(path[:-4] + ".idx", "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                # Halb geschriebener letzter Eintrag zählt nicht
+                self.count = size // INDEX.size
+                if self.count:
+                    self._mmap = mmap.mmap(f.fileno(), self.count * INDEX.size, access=mmap.ACCESS_READ)
+        except OSError:
+            pass
+
+    def entry(self, i):
+        return INDEX.unpack_from(self._mmap, i * INDEX.size)
+
+    @property
+    def first(self):
+        return self.entry(0)[0] if self.count else None
+
+    @property
+    def last(self):
+        return self.entry(self.count - 1)[0] if self.count else None
+
+    def bisect(self, when):
+        # Erster Eintrag mit Zeit >= when
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if INDEX.unpack_from(self._mmap, mid * INDEX.size)[0] < when:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def read(self, start=None, end=None):
+        if not self.count:
+            return
+        first = 0 if start is None else self.bisect(start)
+        stop = self.count if end is None else self.bisect(end)
+        if first >= stop:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self.entry(first)[1])
+            for _ in range(stop - first):
+                head = f.read(RECORD.size)
+                if len(head) < RECORD.size:
+                    return
+                when, port, length = RECORD.unpack(head)
+                data = f.read(length)
+                if len(data) < length:
+                    return
+                yield when, port, data
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+def read_log(directory, start=None, end=None):
+    # Alle Frames im Zeitfenster [start, end), Datei für Datei gestreamt
+    for path in log_files(directory):
+        log = LogFile(path)
+        try:
+            if not log.count or (start is not None and log.last < start) or (end is not None and log.first >= end):
+                continue
+            yield from log.read(start, end)
+        finally:
+            log.close()
+
+
+def replay(records, speed=1.0, sink=None, sleep=time.sleep):
+    # Frames im ursprünglichen Takt (geteilt durch speed) an sink(when, port, data)
+    previous = None
+    for when, port, data in records:
+        if previous is not None and speed > 0 and when > previous:
+            sleep((when - previous) / speed)
+        previous = when
+        sink(when, port, data)
+
+
+# === Kommandozeile ===
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_time(text):
+    # ISO-Zeit (2026-10-18T09:00) oder Zeitraum zurück: 30m, 2h, 1d
+    if text is None:
+        return None
+    if text[-1:] in UNITS:
+        try:
+            return time.time() - float(text[:-1].lstrip("-")) * UNITS[text[-1]]
+        except ValueError:
+            pass
+    return datetime.datetime.fromisoformat(text).timestamp()
+
+
+def format_record(when, port, data):
+    from aprspi.ax25 import decode_ax25
+    from aprspi.terminal import printable
+    stamp = datetime.datetime.fromtimestamp(when).strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        text = printable(str(decode_ax25(data)))
+    except ValueError:
+        text = f"<{len(data)} Byte, kein AX.25: {data[:16].hex()}>"
+    return f"{stamp} [{port}] {text}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="aprspi.packetlog", description="Paketlog anzeigen und abspielen")
+    parser.add_argument("command", choices=("list", "dump", "replay"))
+    parser.add_argument("directory")
+    parser.add_argument("--from", dest="start", help="ISO-Zeit oder Zeitraum zurück (30m, 2h, 1d)")
+    parser.add_argument("--to", dest="end")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay: Faktor, 0 = ohne Pause")
+    args = parser.parse_args(argv)
+    start, end = parse_time(args.start), parse_time(args.end)
+
+    if args.command == "list":
+        for path in log_files(args.directory):
+            log = LogFile(path)
+            if log.count:
+                span = " - ".join(datetime.datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M:%S")
+                                  for t in (log.first, log.last))
+                print(f"{os.path.basename(path)}  {log.count:>7} Frames  {span}")
+            log.close()
+        return
+    records = read_log(args.directory, start, end)
+    if args.command == "dump":
+        for record in records:
+            print(format_record(*record))
+    else:
+        replay(records, args.speed, lambda *record: print(format_record(*record), flush=True))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (KeyboardInterrupt, BrokenPipeError):
+        sys.exit(0)
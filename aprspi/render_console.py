@@ -0,0 +1,217 @@
+# APRS Pi – Anzeige in der Konsole
+#
+# Alle Seiten auf einmal. Im Terminal über den Diff-Renderer aus
+# aprspi/terminal.py mit Live-Paketliste und Aktualisierung jede Sekunde,
+# bei umgeleiteter Ausgabe (Log/Pipe) als normaler Text alle 10 s.
+
+import time
+import datetime
+
+from aprspi.terminal import Screen, PacketPane, layout, printable
+from aprspi.metrics import Rates
+from aprspi.geo import compass
+
+PACKET_ROWS = 6
+
+
+class ConsoleRenderer:
+    pages = 1
+
+    def __init__(self, monitor, out=None):
+        self.monitor = monitor
+        self.screen = Screen(out)
+        self.packets = PacketPane()
+        self.rates = Rates()
+        self.scheduler = None
+        self.rotate = 1 if self.screen.active else 10
+        # Umgeleitet nur im 10-s-Takt, sonst ein kompletter Block je Paket im Log
+        self.events = self.screen.active
+
+    def start(self, scheduler):
+        self.scheduler = scheduler
+        self.screen.start()
+
+    def stop(self):
+        self.screen.stop()
+
+    def packet(self, packet, own):
+        self.packets.add(packet, own)
+
+    def show(self, page):
+        values = self.monitor.values
+        sections = (self.page1, self.page2, self.page3, self.page4, self.page5, self.page6, self.page7,
+                    self.page8)
+        if not self.screen.active:
+            for section in sections:
+                section(values, lambda line: print(printable(line)))
+            return
+        blocks = []
+        for section in sections:
+            lines = []
+            section(values, lines.append)
+            blocks.append(lines)
+        width, height = self.screen.get_size()
+        rows = layout(blocks, width)
+        # Seiten oben, darunter der restliche Platz (mindestens PACKET_ROWS) für Live-Pakete
+        rows = rows[:max(height - PACKET_ROWS, 0)]
+        self.screen.render(rows + self.packets.render(height - len(rows), width), (width, height))
+
+    def page1(self, values, out):
+        monitor = self.monitor
+        out("=== Seite 1: System & Status ===")
+        out(f"CPU: {values['cpu']:.1f}% | Temp: {values['temp']}")
+        out(f"RAM: {values['mem']:.0f}% | Disk: {values['disk']:.0f}%")
+        out(f"GPS: {monitor.gps_status()} | Sats: {monitor.gps_sats()}")
+        bat_percent, bat_voltage, _, bat_state = values["battery"]
+        out(f"Bat: {bat_percent:.0f}% | {bat_voltage:.2f}V {bat_state}")
+        out(monitor.aprs.latest_frame)
+        uptime = time.strftime("%H:%M:%S", time.gmtime(time.time() - values["boot_time"]))
+        out(f"Uptime: {uptime}")
+        out("Sampler: " + " ".join(f"{name}:{avg:.1f}ms" for name, _, avg, _, _, _ in monitor.sampler.timings()))
+        out("-" * 50)
+
+    def page2(self, values, out):
+        monitor = self.monitor
+        out("=== Seite 2: GPS & Akku ===")
+        lat, lon, alt = monitor.gps_coords()
+        out(f"Lat: {lat:.5f} Lon: {lon:.5f}")
+        out(f"Alt: {alt:.0f}m | Sats: {monitor.gps_sats()}")
+        fix_age = monitor.gps.fix_age
+        fix = f"{fix_age:.0f}s" if fix_age is not None else "-"
+        out(f"Fix-Alter: {fix} | gpsd: {monitor.gps.message_rate:.1f} Meldungen/s | Reconnects: {monitor.gps.reconnects}")
+        out(f"Last: {monitor.aprs.latest_frame.strip()}")
+        packet = monitor.aprs.latest_packet
+        if packet and packet.position:
+            plat, plon = packet.position
+            out(f"Pos {packet.source}: {plat:.5f} {plon:.5f} ({packet.kind})")
+        _, voltage, current, _ = values["battery"]
+        out(f"Bat: {voltage:.2f}V  {current:.0f}mA")
+        out("-" * 50)
+
+    def page3(self, values, out):
+        monitor = self.monitor
+        out("=== Seite 3: Akkuverlauf ===")
+        battery = monitor.battery
+        if battery is None:
+            out("Kein INA219 gefunden")
+            out("-" * 50)
+            return
+        percent, voltage, current, state = values["battery"]
+        bar = int(percent // 5)
+        out(f"Akkuladung: {percent:.0f}% [{'█' * bar}{'.' * (20 - bar)}]")
+        runtime = battery.runtime_hours()
+        rest = f"{int(runtime)}h{int(runtime * 60) % 60:02d}m" if runtime is not None else "-"
+        out(f"{voltage:.2f}V {current:.0f}mA {state} | Zähler: {battery.charge_mah:+.0f}mAh | Restlaufzeit: {rest}")
+        history = battery.history()[-50:]
+        out("Verlauf: " + "".join(" ▁▂▃▄▅▆▇█"[min(8, int(p / 12.5))] for p in history))
+        out("-" * 50)
+
+    def page4(self, values, out):
+        monitor = self.monitor
+        out("=== Seite 4: Zeit & Quelle ===")
+        src, refid, offset, jitter = values["ntp"]
+        now = datetime.datetime.utcnow().strftime("%H:%M:%S")
+        out(f"Time src: {src} {refid}")
+        out(f"Offset: {offset} ms | Jitter: {jitter} ms")
+        out(f"SysTime: {now} UTC")
+        out(f"GPS: {monitor.gps_status()} | Sats: {monitor.gps_sats()}")
+        out("-" * 50)
+
+    def page5(self, values, out):
+        monitor = self.monitor
+        out("=== Seite 5: Gehörte Stationen ===")
+        stations = monitor.aprs.stations
+        now = time.time()
+        out(f"Stationen: {len(stations)} | Pakete: {stations.total} | {stations.rate():.1f}/min")
+        for station in stations.most_recent(8):
+            age = int(now - station.last_heard)
+            pos = f"{station.position[0]:.4f} {station.position[1]:.4f}" if station.position else "-"
+            dupes = f"+{station.duplicates}" if station.duplicates else ""
+            out(f"{station.call:<10} {station.count:>4}x{dupes:<4} vor {age // 60:>3}m{age % 60:02d}s  {pos:<20} {','.join(station.path)}")
+        active = ", ".join(f"{s.call} ({s.count})" for s in stations.most_active(5))
+        out(f"Aktivste: {active or '-'}")
+        out("-" * 50)
+
+    def page6(self, values, out):
+        # Dieselben Zähler wie unter /metrics (aprspi/metrics.py), hier als Raten
+        monitor = self.monitor
+        aprs = monitor.aprs
+        rate = self.rates.update
+        out("=== Seite 6: Statistik ===")
+        received = rate("received", aprs.frames_received)
+        decoded = rate("decoded", aprs.stations.total)
+        rejected = rate("rejected", aprs.frames_rejected + aprs.frames_dropped)
+        out(f"Frames/s: {received:.1f} empfangen | {decoded:.1f} dekodiert | {rejected:.1f} verworfen")
+        if aprs.dupes is not None:
+            out(f"Duplikate: {rate('dupes', aprs.dupes.duplicates):.1f}/s | {aprs.dupes.duplicates} gesamt | "
+                f"{len(aprs.dupes)} im {aprs.dupes.window:.0f}s-Fenster")
+        hist = aprs.decode_time
+        if hist.count:
+            out(f"Dekodierung: Mittel {hist.sum / hist.count * 1e6:.0f}µs | p95 <{hist.quantile(0.95) * 1e6:.0f}µs")
+        out(f"KISS: {aprs.reconnects} Abbrüche | {aprs.connect_failures} Fehlversuche | "
+            f"{rate('bytes', aprs.bytes_received) / 1024:.1f} KiB/s")
+        if len(aprs.endpoints) > 1 or len(aprs.channels) > 1:
+            now = time.time()
+            for c in sorted(aprs.channels.values(), key=lambda c: (c.endpoint, c.channel)):
+                age = f"vor {now - c.last_heard:.0f}s" if c.last_heard else "-"
+                out(f"  {c.label:<22} {rate('ch ' + c.label, c.frames):6.1f}/s {c.frames:>7} Frames "
+                    f"{c.rejected:>4} verworfen {c.duplicates:>5} Dup.  {age}")
+            down = [e.name for e in aprs.endpoints if not e.connected]
+            if down:
+                out("  getrennt: " + ", ".join(down))
+        fanout = aprs.fanout
+        if fanout is not None:
+            out(f"Verteiler :{fanout.port}: {len(fanout.clients)} Clients | {fanout.dropped} verworfen | "
+                f"{fanout.slow_disconnects} getrennt | {fanout.tx_frames} TX")
+        gps = monitor.gps
+        fix_age = gps.fix_age
+        fix = f"{fix_age:.0f}s" if fix_age is not None else "-"
+        out(f"gpsd: {gps.message_rate:.1f}/s | Fix-Alter {fix} | {gps.reconnects} Abbrüche | {gps.stream.errors} Fehler")
+        beacon = monitor.beacon
+        if beacon is not None:
+            age = f"vor {time.monotonic() - beacon.last_sent:.0f}s" if beacon.last_sent is not None else "-"
+            out(f"Baken: {beacon.sent} gesendet | letzte {age}")
+        gpx = monitor.gpx
+        if gpx is not None:
+            out(f"GPX: {gpx.points_written}/{gpx.points_received} Punkte | {gpx.bytes_written / 1024:.0f} KiB | "
+                f"{gpx.flushes} Schreibvorgänge | {gpx.fsyncs} fsync | {gpx.errors} Fehler")
+        slowest = sorted(monitor.sampler.sources.values(), key=lambda s: -s.max_ms)[:3]
+        out("Sampler max: " + " ".join(f"{s.name}:{s.max_ms:.1f}ms" for s in slowest))
+        scheduler = self.scheduler
+        if scheduler is not None and scheduler.render_time.count:
+            render = scheduler.render_time
+            out(f"Zeichnen: {scheduler.renders}x | Mittel {render.sum / render.count * 1000:.1f}ms | "
+                f"p95 <{render.quantile(0.95) * 1000:.1f}ms")
+        out("-" * 50)
+
+    def page7(self, values, out):
+        geo = self.monitor.geo
+        out("=== Seite 7: Umgebung ===")
+        if geo.origin is None:
+            out("Keine eigene Position (kein GPS-Fix)")
+        else:
+            lat, lon = geo.origin
+            out(f"Standort: {lat:.4f} {lon:.4f} | {len(geo)} Stationen mit Position | "
+                f"{len(geo.within(10))} <10km | {len(geo.within(50))} <50km")
+            for call, dist, bearing in geo.nearest(8):
+                out(f"{call:<10} {dist:>7.1f}km {bearing:>4.0f}° {compass(bearing)}")
+        out("-" * 50)
+
+    def page8(self, values, out):
+        messages = self.monitor.messages
+        if messages is None:
+            return
+        out("=== Seite 8: Nachrichten ===")
+        now = time.time()
+        out(f"Posteingang: {len(messages.inbox)} | {messages.unread} neu | {messages.acks_sent} Acks gesendet | "
+            f"{messages.retransmissions} Wiederholungen")
+        for entry in list(messages.inbox)[:8]:
+            when = datetime.datetime.fromtimestamp(entry.received).strftime("%H:%M")
+            copies = f" (x{entry.copies})" if entry.copies > 1 else ""
+            # Text kommt von beliebigen Stationen: keine Steuerzeichen ans Terminal
+            out(f"{when} {entry.src:<10} {printable(entry.text)}{copies}")
+        messages.mark_read()
+        for m in reversed(list(messages.outbox.values())[-4:]):
+            age = f"{now - m.created:.0f}s"
+            out(f"-> {m.addressee:<9} {m.state:<8} {m.tries}x {age:>6} {m.text}")
+        out("-" * 50)
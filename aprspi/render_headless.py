@@ -0,0 +1,30 @@
+# APRS Pi – Betrieb ohne Anzeige (z. B. als Dienst)
+#
+# Listener, Sampler und Stationstabelle laufen wie sonst; alle 60 s geht
+# eine Statuszeile nach stdout (journald).
+
+
+class HeadlessRenderer:
+    pages = 1
+    rotate = 60
+    # Kein Neuzeichnen je Frame, sonst eine Logzeile pro Paket
+    events = False
+
+    def __init__(self, monitor, out=None):
+        self.monitor = monitor
+        self.out = out
+
+    def start(self, scheduler):
+        pass
+
+    def stop(self):
+        pass
+
+    def show(self, page):
+        monitor = self.monitor
+        values = monitor.values
+        percent = values["battery"][0]
+        stations = monitor.aprs.stations
+        print(f"CPU:{values['cpu']:.0f}% T:{values['temp']} GPS:{monitor.gps_status()} Sats:{monitor.gps_sats()} "
+              f"BAT:{percent:.0f}% Stationen:{len(stations)} {stations.rate():.1f}/min | {monitor.aprs.latest_frame}",
+              file=self.out, flush=True)
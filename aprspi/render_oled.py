@@ -0,0 +1,127 @@
+# APRS Pi – Anzeige auf dem SPI-OLED (SSD1309, 128x64)
+#
+# Sieben Seiten, gezeichnet über DiffRenderer und TextCache aus aprspi/oled.py.
+# Neu gezeichnet wird bei neuem Frame, Fix-Wechsel, Tastendruck (GPIO17)
+# oder alle 10 s (DisplayScheduler).
+
+import time
+import datetime
+
+from PIL import ImageFont
+
+from aprspi.oled import DiffRenderer, TextCache
+from aprspi.display import watch_button
+from aprspi.geo import compass
+from aprspi.hardware import open_oled
+
+
+class OLEDRenderer:
+    pages = 7
+    rotate = 10
+    # Neue Nachricht an MYCALL springt auf den Posteingang
+    inbox_page = 6
+
+    def __init__(self, monitor, dummy=False):
+        self.monitor = monitor
+        # Nur geänderte Pages/Spalten gehen über SPI
+        self.renderer = DiffRenderer(open_oled(dummy))
+        # Labels und Werte als fertige Bitmaps statt jedes Mal neu gerastert
+        self.texts = TextCache(ImageFont.load_default())
+
+    def start(self, scheduler):
+        if not watch_button(scheduler.button):
+            print("Kein RPi.GPIO: Taster an GPIO17 deaktiviert")
+
+    def stop(self):
+        pass
+
+    def show(self, page):
+        with self.renderer.canvas() as draw:
+            self.draw_page(draw, page)
+
+    def draw_page(self, draw, page):
+        monitor = self.monitor
+        values = monitor.values
+        texts = self.texts
+        if page == 0:
+            cpu = values["cpu"]
+            temp = values["temp"]
+            mem = values["mem"]
+            disk = values["disk"]
+            gps = monitor.gps_status()
+            sats = monitor.gps_sats()
+            bat_percent, bat_voltage, _, bat_state = values["battery"]
+            uptime = time.strftime("%H:%M:%S", time.gmtime(time.time() - values["boot_time"]))
+
+            texts.text(draw, (0, 0), "CPU:", f"{cpu:.0f}% T:{temp}")
+            texts.text(draw, (0, 10), "RAM:", f"{mem:.0f}% DSK:{disk:.0f}%")
+            texts.text(draw, (0, 20), "GPS:", f"{gps} Sats:{sats}")
+            texts.text(draw, (0, 30), "BAT:", f"{bat_percent:.0f}% {bat_voltage:.2f}V")
+            texts.text(draw, (0, 40), monitor.aprs.latest_frame[:24])
+            texts.text(draw, (0, 50), "Uptime:", uptime)
+
+        elif page == 1:
+            lat, lon, alt = monitor.gps_coords()
+            sats = monitor.gps_sats()
+            texts.text(draw, (0, 0), "Lat:", f"{lat:.5f}")
+            texts.text(draw, (0, 10), "Lon:", f"{lon:.5f}")
+            texts.text(draw, (0, 20), "Alt:", f"{alt:.0f}m Sats:{sats}")
+            texts.text(draw, (0, 30), monitor.aprs.latest_frame[:24])
+            packet = monitor.aprs.latest_packet
+            if packet and packet.position:
+                plat, plon = packet.position
+                texts.text(draw, (0, 40), f"{packet.source[:9]} {plat:.2f} {plon:.2f}")
+            fix_age = monitor.gps.fix_age
+            fix = f"{fix_age:.0f}s" if fix_age is not None else "-"
+            texts.text(draw, (0, 50), "Fix:", f"{fix} gpsd:{monitor.gps.message_rate:.1f}/s")
+
+        elif page == 2:
+            battery = monitor.battery
+            if battery is None:
+                texts.text(draw, (0, 0), "Akku:", "kein INA219")
+                return
+            percent, voltage, current, _ = values["battery"]
+            runtime = battery.runtime_hours()
+            rest = f" {int(runtime)}h{int(runtime * 60) % 60:02d}" if runtime is not None else ""
+            texts.text(draw, (0, 0), "Akku:", f"{percent:.0f}%{rest}")
+            texts.text(draw, (0, 10), f"{voltage:.2f}V {current:.0f}mA")
+            # Verlauf: eine Spalte pro Messpunkt, 0-100% auf 40 Pixel (y 23..63)
+            history = battery.history()[-128:]
+            for x, p in enumerate(history, start=128 - len(history)):
+                draw.line((x, 63, x, 63 - int(p * 0.4)), fill=255)
+
+        elif page == 3:
+            src, refid, offset, jitter = values["ntp"]
+            now = datetime.datetime.utcnow().strftime("%H:%M:%S")
+            texts.text(draw, (0, 0), "SRC:", f"{src} REF:{refid}")
+            texts.text(draw, (0, 10), "Off:", f"{offset} Jit:{jitter}")
+            texts.text(draw, (0, 20), "UTC:", now)
+
+        elif page == 4:
+            stations = monitor.aprs.stations
+            now = time.time()
+            texts.text(draw, (0, 0), "Heard:", f"{len(stations)} {stations.rate():.0f}/min")
+            for i, station in enumerate(stations.most_recent(5)):
+                age = int(now - station.last_heard) // 60
+                texts.text(draw, (0, 10 + i * 10), f"{station.call[:9]:<9} {station.count:>3} {age:>3}m")
+
+        elif page == 5:
+            geo = monitor.geo
+            if geo.origin is None:
+                texts.text(draw, (0, 0), "Nah:", "kein GPS-Fix")
+                return
+            texts.text(draw, (0, 0), "Nah:", f"{len(geo)} <10km:{len(geo.within(10))}")
+            for i, (call, dist, bearing) in enumerate(geo.nearest(5)):
+                km = f"{dist:.1f}" if dist < 100 else f"{dist:.0f}"
+                texts.text(draw, (0, 10 + i * 10), f"{call[:9]:<9}{km:>6}km {compass(bearing)}")
+
+        elif page == 6:
+            messages = monitor.messages
+            if messages is None:
+                texts.text(draw, (0, 0), "Post:", "aus (--messages)")
+                return
+            texts.text(draw, (0, 0), "Post:", f"{len(messages.inbox)} neu:{messages.unread} out:{messages.pending()}")
+            # Je Nachricht Absender und Textanfang, neueste oben
+            for i, entry in enumerate(list(messages.inbox)[:5]):
+                texts.text(draw, (0, 10 + i * 10), f"{entry.src[:9]:<9} {entry.text[:12]}")
+            messages.mark_read()
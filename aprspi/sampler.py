@@ -0,0 +1,162 @@
+# APRS Pi – Sensor-Sampler mit TTL-Cache
+#
+# Jede Quelle (CPU-Temperatur, psutil, Akku, NTP, ...) hat ein eigenes
+# Intervall. Ein einziger Hintergrund-Thread arbeitet die fälligen Quellen
+# über einen Heap ab und legt die Werte im Cache ab; die Anzeige liest nur
+# noch aus dem Cache und blockiert nie auf I/O.
+#
+# Quellen mit own_thread=True (INA219 mit 10 Hz) laufen dagegen in einem
+# eigenen Thread mit fester Rate: eine NTP-Abfrage, die bis zum Timeout
+# hängt, verzögert sonst die Messungen, auf denen Mittelwerte und die
+# Ladungszählung beruhen.
+
+import time
+import heapq
+import threading
+
+
+class TTLCache:
+    def __init__(self):
+        self._entries = {}
+        self._ttl = {}
+        self._default = {}
+
+    def define(self, name, ttl, default=None):
+        self._ttl[name] = ttl
+        self._default[name] = default
+
+    def set(self, name, value, now=None):
+        self._entries[name] = (value, time.monotonic() if now is None else now)
+
+    def age(self, name, now=None):
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        return (time.monotonic() if now is None else now) - entry[1]
+
+    def get(self, name, default=None, now=None):
+        # Abgelaufene Werte gelten als nicht vorhanden
+        entry = self._entries.get(name)
+        if entry is None:
+            return default
+        ttl = self._ttl.get(name)
+        if ttl is not None and (time.monotonic() if now is None else now) - entry[1] > ttl:
+            return default
+        return entry[0]
+
+    def __getitem__(self, name):
+        return self.get(name, self._default.get(name))
+
+    def __contains__(self, name):
+        return name in self._entries
+
+
+class Source:
+    __slots__ = ("name", "func", "interval", "runs", "errors", "last_ms", "avg_ms", "max_ms", "total_ms")
+
+    def __init__(self, name, func, interval):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.runs = 0
+        self.errors = 0
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+
+    def record(self, ms):
+        self.runs += 1
+        self.last_ms = ms
+        self.max_ms = max(self.max_ms, ms)
+        self.total_ms += ms
+        # Gleitender Mittelwert, die ersten Läufe zählen voll
+        weight = max(1.0 / self.runs, 0.1)
+        self.avg_ms += (ms - self.avg_ms) * weight
+
+
+class Sampler(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.cache = TTLCache()
+        self.sources = {}
+        self.running = True
+        self._heap = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        # Quellen mit eigenem Thread (nicht im Heap)
+        self.dedicated = []
+
+    def add(self, name, func, interval, ttl=None, default=None, own_thread=False):
+        source = Source(name, func, interval)
+        self.sources[name] = source
+        self.cache.define(name, ttl if ttl is not None else 3 * interval, default)
+        if own_thread:
+            self.dedicated.append(source)
+            return source
+        with self._lock:
+            heapq.heappush(self._heap, (time.monotonic(), name))
+        self._wakeup.set()
+        return source
+
+    def sample(self, name):
+        source = self.sources[name]
+        start = time.perf_counter()
+        try:
+            value = source.func()
+        except Exception:
+            source.errors += 1
+        else:
+            self.cache.set(name, value)
+        source.record((time.perf_counter() - start) * 1000)
+
+    def prime(self, exclude=()):
+        # Einmal alles lesen, damit die erste Seite schon Werte hat
+        for name in self.sources:
+            if name not in exclude:
+                self.sample(name)
+
+    def run_due(self):
+        # Fällige Quellen abarbeiten, liefert die Wartezeit bis zur nächsten
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                if not self._heap:
+                    return 1.0
+                due, name = self._heap[0]
+                if due > now:
+                    return due - now
+                heapq.heappop(self._heap)
+            self.sample(name)
+            with self._lock:
+                heapq.heappush(self._heap, (max(due + self.sources[name].interval, now), name))
+
+    def timings(self):
+        return [(s.name, s.last_ms, s.avg_ms, s.max_ms, s.runs, s.errors) for s in self.sources.values()]
+
+    def run_fixed(self, source):
+        # Feste Rate ohne Drift; verpasste Termine werden nicht nachgeholt
+        due = time.monotonic()
+        while self.running:
+            self.sample(source.name)
+            now = time.monotonic()
+            due = max(due + source.interval, now)
+            self._stopped.wait(due - now)
+
+    def start(self):
+        for source in self.dedicated:
+            threading.Thread(target=self.run_fixed, args=(source,), name=f"sampler-{source.name}",
+                             daemon=True).start()
+        super().start()
+
+    def run(self):
+        while self.running:
+            delay = self.run_due()
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+
+    def stop(self):
+        self.running = False
+        self._wakeup.set()
+        self._stopped.set()
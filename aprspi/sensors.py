@@ -0,0 +1,34 @@
+# APRS Pi – Systemwerte ohne Prozessstart (für den Sampler)
+#
+# psutil wird erst beim ersten Abruf importiert (Startzeit).
+
+THERMAL_ZONE = "/sys/class/thermal/thermal_zone0/temp"
+
+
+def cpu_temp():
+    # Gleiches Format wie "vcgencmd measure_temp", aber ohne fork
+    try:
+        with open(THERMAL_ZONE) as f:
+            return f"{int(f.read()) / 1000:.1f}'C"
+    except (OSError, ValueError):
+        return "N/A"
+
+
+def cpu_percent():
+    import psutil
+    return psutil.cpu_percent()
+
+
+def mem_percent():
+    import psutil
+    return psutil.virtual_memory().percent
+
+
+def disk_percent(path='/'):
+    import psutil
+    return psutil.disk_usage(path).percent
+
+
+def boot_time():
+    import psutil
+    return psutil.boot_time()
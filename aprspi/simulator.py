@@ -0,0 +1,279 @@
+# APRS Pi – Simulatoren für Direwolf (KISS-TCP) und gpsd
+#
+# Für Last- und Benchmarktests ohne Funkgerät und GPS: KISSServer erzeugt
+# AX.25/APRS-Verkehr (Positionen, Status, Nachrichten, Digipeater-Pfade,
+# Bytes, die KISS-Escapes brauchen) oder spielt ein Paketlog ab, mit
+# einstellbarer Rate bis zu einigen tausend Frames/s und auf Wunsch in
+# zufällig zerteilten TCP-Segmenten. GpsdServer beantwortet ?WATCH und
+# schickt TPV/SKY/PPS einer Fahrt im Kreis.
+#
+#   python3 -m aprspi.simulator [--kiss-port 8001] [--gpsd-port 2947] [--rate 100]
+
+import json
+import math
+import time
+import random
+import select
+import socket
+import argparse
+import datetime
+import functools
+import threading
+import socketserver
+
+from aprspi.ax25 import AX25Address, encode_ui
+from aprspi.kiss import KISSDeframer, kiss_frame
+
+KISS_PORT = 8001
+GPSD_PORT = 2947
+CENTER = (48.2, 14.3)
+
+PATHS = ((), ("WIDE1-1",), ("WIDE1-1*", "WIDE2-1"), ("OE5XBL-10*", "WIDE2-1"), ("OE5XBL-10*", "OE3XUR*", "WIDE2*"))
+
+
+def _coord(value, width, hemispheres):
+    degrees = int(abs(value))
+    minutes = (abs(value) - degrees) * 60
+    return f"{degrees:0{width}d}{minutes:05.2f}{hemispheres[value < 0]}"
+
+
+def synth_info(rng, i, calls):
+    kind = rng.random()
+    if kind < 0.6:
+        lat = CENTER[0] + rng.uniform(-0.5, 0.5)
+        lon = CENTER[1] + rng.uniform(-0.8, 0.8)
+        symbol = rng.choice(">-k[")
+        return f"!{_coord(lat, 2, 'NS')}/{_coord(lon, 3, 'EW')}{symbol}Sim {i}".encode()
+    if kind < 0.75:
+        return f">Status {i} via Simulator".encode()
+    if kind < 0.9:
+        to = rng.choice(calls)
+        return f":{to:<9}:Nachricht {i}{{{i % 1000}".encode()
+    # Bytes 0xC0/0xDB im Info-Feld: Sender muss escapen, Empfänger zurückwandeln
+    return b">Escape " + bytes([0xC0, 0xDB, 0xC0]) + f" {i}".encode()
+
+
+def synth_frames(count=1000, stations=200, seed=1):
+    # Vorab erzeugter Vorrat an AX.25-Frames, wird im Kreis gesendet
+    rng = random.Random(seed)
+    calls = [f"OE{rng.randint(1, 9)}{''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(3))}"
+             f"{rng.choice(['', '-7', '-9', '-10'])}" for _ in range(stations)]
+    dest = AX25Address.parse("APRS")
+    frames = []
+    for i in range(count):
+        src = AX25Address.parse(rng.choice(calls))
+        path = tuple(AX25Address.parse(p) for p in rng.choice(PATHS))
+        frames.append(encode_ui(src, dest, path, synth_info(rng, i, calls)))
+    return frames
+
+
+def split_segments(data, rng, max_size=64):
+    # Zufällige Stücke, damit der Empfänger Frames über Segmentgrenzen zusammensetzen muss
+    pos = 0
+    while pos < len(data):
+        size = rng.randint(1, max_size)
+        yield data[pos:pos + size]
+        pos += size
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class SimulatorServer(threading.Thread):
+    def __init__(self, host, port):
+        super().__init__(daemon=True)
+        owner = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                owner.clients += 1
+                try:
+                    owner.serve(self.request)
+                except OSError:
+                    pass
+                finally:
+                    owner.clients -= 1
+
+        self.server = _Server((host, port), Handler)
+        self.host, self.port = self.server.server_address
+        self.clients = 0
+        self.running = True
+
+    def run(self):
+        self.server.serve_forever(poll_interval=0.2)
+
+    def stop(self):
+        self.running = False
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class KISSServer(SimulatorServer):
+    # rate: Frames/s je Client, 0 = so schnell wie möglich
+    # frames: Liste von AX.25-Frames oder None für synthetischen Verkehr
+    # records: Funktion, die je Client ein neues Iterable (Zeit, Port, Daten)
+    # liefert (z. B. read_log des Paketlogs), oder eine Liste; abgespielt mit speed
+    def __init__(self, host="127.0.0.1", port=KISS_PORT, rate=10.0, frames=None, records=None,
+                 speed=1.0, split=True, limit=None, seed=1, channels=1):
+        super().__init__(host, port)
+        self.rate = rate
+        self.records = records
+        self.speed = speed
+        self.split = split
+        self.limit = limit
+        self.seed = seed
+        # Mehrere Funkkanäle wie Direwolf: Frames reihum auf KISS-Port 0..channels-1
+        self.kiss = [kiss_frame(f, i % channels) for i, f in enumerate(frames or synth_frames(seed=seed))]
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        # Vom Client gesendete KISS-Frames (Sendepfad, Baken, Nachrichten)
+        self.received = []
+
+    def _receive(self, sock, deframer, timeout=0):
+        while select.select([sock], [], [], timeout)[0]:
+            data = sock.recv(4096)
+            if not data:
+                raise OSError("Client getrennt")
+            self.received.extend(deframer.feed(data))
+            timeout = 0
+
+    def _send(self, sock, rng, data):
+        if self.split:
+            for segment in split_segments(data, rng):
+                sock.sendall(segment)
+        else:
+            sock.sendall(data)
+        self.bytes_sent += len(data)
+
+    def serve(self, sock):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        rng = random.Random(self.seed)
+        if self.records is not None:
+            self._replay(sock, rng)
+            return
+        deframer = KISSDeframer()
+        start = time.monotonic()
+        sent = 0
+        while self.running and (self.limit is None or sent < self.limit):
+            self._receive(sock, deframer)
+            if self.rate > 0:
+                due = int((time.monotonic() - start) * self.rate) - sent
+                if due <= 0:
+                    time.sleep(min(1.0 / self.rate, 0.01))
+                    continue
+            else:
+                due = 64
+            if self.limit is not None:
+                due = min(due, self.limit - sent)
+            # Fällige Frames gesammelt senden, auch bei hoher Rate nur ein Durchlauf pro ms
+            batch = b''.join(self.kiss[(sent + i) % len(self.kiss)] for i in range(due))
+            self._send(sock, rng, batch)
+            sent += due
+            self.frames_sent += due
+        # Nach limit offen bleiben, sonst verbindet der Listener neu und bekommt alles noch einmal
+        while self.running:
+            self._receive(sock, deframer, 0.1)
+
+    def _replay(self, sock, rng):
+        from aprspi.packetlog import replay
+
+        def sink(when, port, data):
+            if not self.running:
+                raise OSError("gestoppt")
+            self._send(sock, rng, kiss_frame(data, port))
+            self.frames_sent += 1
+
+        # Jeder Client bekommt das ganze Log, ein gemeinsamer Generator
+        # würde die Frames auf die Clients verteilen
+        replay(self.records() if callable(self.records) else self.records, self.speed, sink)
+
+
+class GpsdServer(SimulatorServer):
+    # rate: TPV/SKY-Zyklen pro Sekunde (echter Empfänger: 1-10 Hz)
+    def __init__(self, host="127.0.0.1", port=GPSD_PORT, rate=1.0, satellites=12, radius=0.01, pps=True):
+        super().__init__(host, port)
+        self.rate = rate
+        self.satellites = satellites
+        self.radius = radius
+        self.pps = pps
+        self.reports_sent = 0
+
+    def reports(self, step, now):
+        angle = step / max(self.rate, 1e-3) / 60 * 2 * math.pi
+        lat = CENTER[0] + self.radius * math.sin(angle)
+        lon = CENTER[1] + self.radius * math.cos(angle)
+        stamp = datetime.datetime.fromtimestamp(now, datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        tpv = {"class": "TPV", "device": "/dev/ttyAMA0", "mode": 3, "time": stamp, "lat": round(lat, 7),
+               "lon": round(lon, 7), "alt": 270.0, "speed": 13.9, "track": round(math.degrees(-angle) % 360, 1)}
+        sats = [{"PRN": prn, "el": (prn * 7) % 90, "az": (prn * 37) % 360, "ss": 20 + prn % 25, "used": prn % 3 != 0}
+                for prn in range(1, self.satellites + 1)]
+        lines = [tpv, {"class": "SKY", "device": "/dev/ttyAMA0", "satellites": sats}]
+        if self.pps:
+            lines.append({"class": "PPS", "device": "/dev/pps0", "real_sec": int(now), "real_nsec": 0,
+                          "clock_sec": int(now), "clock_nsec": 1200})
+        return "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in lines).encode()
+
+    def serve(self, sock):
+        sock.sendall(b'{"class":"VERSION","release":"3.22","rev":"aprspi-sim","proto_major":3,"proto_minor":14}\n')
+        # Gestreamt wird erst nach ?WATCH, wie beim echten gpsd
+        sock.settimeout(5)
+        request = b''
+        while b'?WATCH' not in request:
+            data = sock.recv(1024)
+            if not data:
+                return
+            request += data
+        sock.sendall(b'{"class":"DEVICES","devices":[{"class":"DEVICE","path":"/dev/ttyAMA0"}]}\n'
+                     b'{"class":"WATCH","enable":true,"json":true,"pps":true}\n')
+        start = time.monotonic()
+        step = 0
+        while self.running:
+            delay = start + step / self.rate - time.monotonic() if self.rate > 0 else 0
+            if delay > 0:
+                time.sleep(delay)
+            sock.sendall(self.reports(step, time.time()))
+            self.reports_sent += 1
+            step += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="aprspi.simulator", description="KISS-TCP- und gpsd-Simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--kiss-port", type=int, default=KISS_PORT, help="0 = kein KISS-Server")
+    parser.add_argument("--gpsd-port", type=int, default=GPSD_PORT, help="0 = kein gpsd")
+    parser.add_argument("--rate", type=float, default=10.0, help="Frames/s je Client, 0 = Maximum")
+    parser.add_argument("--gps-rate", type=float, default=1.0, help="TPV/SKY pro Sekunde")
+    parser.add_argument("--replay", metavar="DIR", help="Paketlog abspielen statt synthetischer Frames")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay-Faktor, 0 = ohne Pause")
+    parser.add_argument("--channels", type=int, default=1, help="KISS-Ports (Funkkanäle) reihum")
+    parser.add_argument("--no-split", action="store_true", help="Frames nicht auf TCP-Segmente verteilen")
+    args = parser.parse_args(argv)
+
+    servers = []
+    if args.kiss_port:
+        records = None
+        if args.replay:
+            from aprspi.packetlog import read_log
+            records = functools.partial(read_log, args.replay)
+        servers.append(KISSServer(args.host, args.kiss_port, args.rate, records=records,
+                                  speed=args.speed, split=not args.no_split, channels=args.channels))
+    if args.gpsd_port:
+        servers.append(GpsdServer(args.host, args.gpsd_port, args.gps_rate))
+    for server in servers:
+        server.start()
+        print(f"{type(server).__name__} auf {server.host}:{server.port}")
+    try:
+        while True:
+            time.sleep(5)
+            stats = [f"{type(s).__name__}: {s.clients} Clients, "
+                     f"{getattr(s, 'frames_sent', getattr(s, 'reports_sent', 0))} gesendet" for s in servers]
+            print(" | ".join(stats), flush=True)
+    except KeyboardInterrupt:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
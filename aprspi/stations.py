@@ -0,0 +1,163 @@
+# APRS Pi – Tabelle gehörter Stationen
+#
+# Ringpuffer der letzten Frames plus Index nach Rufzeichen. Der Index ist
+# nach letztem Empfang sortiert (LRU) und zusätzlich nach Paketanzahl in
+# Buckets gruppiert, damit "zuletzt gehört" und "am aktivsten" ohne
+# Sortieren der ganzen Tabelle beantwortet werden können.
+
+import time
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from aprspi.geo import GeoIndex
+
+POSITION_KINDS = ("position", "mic-e")
+
+
+class Station:
+    __slots__ = ("call", "first_heard", "last_heard", "count", "position", "path", "last_packet",
+                 "duplicates", "digis")
+
+    def __init__(self, call, now):
+        self.call = call
+        self.first_heard = now
+        self.last_heard = now
+        self.count = 0
+        self.position = None
+        self.path = ()
+        self.last_packet = None
+        # Kopien über Digipeater: Anzahl und Digipeater -> weitergeleitete Kopien
+        self.duplicates = 0
+        self.digis = {}
+
+    def __repr__(self):
+        return f"Station({self.call}, {self.count} Pakete)"
+
+
+class StationStore:
+    def __init__(self, capacity=256, max_stations=500):
+        self.capacity = capacity
+        self.max_stations = max_stations
+        self.total = 0
+        self._ring = [None] * capacity
+        self._head = 0
+        self._stations = OrderedDict()
+        # Paketanzahl -> Rufzeichen mit genau dieser Anzahl, plus sortierte Liste der Anzahlen
+        self._buckets = {}
+        self._counts = []
+        # Entfernung/Richtung zur eigenen Position (aprspi/geo.py)
+        self.geo = GeoIndex()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._stations)
+
+    def add(self, packet, now=None, digis=()):
+        now = time.time() if now is None else now
+        call = packet.source
+        with self._lock:
+            self._ring[self._head] = (now, packet)
+            self._head = (self._head + 1) % self.capacity
+            self.total += 1
+
+            station = self._stations.get(call)
+            if station is None:
+                station = Station(call, now)
+                self._stations[call] = station
+                if len(self._stations) > self.max_stations:
+                    self._evict()
+            else:
+                self._stations.move_to_end(call)
+                self._unbucket(station)
+            station.count += 1
+            self._bucket(station)
+            station.last_heard = now
+            station.path = tuple(str(d) for d in packet.frame.path)
+            station.last_packet = packet
+            self._count_digis(station, digis)
+            if packet.kind in POSITION_KINDS and packet.position:
+                station.position = packet.position
+                self.geo.update(call, *packet.position)
+        return station
+
+    def relayed(self, call, digis):
+        # Duplikat (aprspi/dedup.py): kein neues Paket, nur Pfadinformation
+        with self._lock:
+            station = self._stations.get(call)
+            if station is not None:
+                station.duplicates += 1
+                self._count_digis(station, digis)
+            return station
+
+    def get(self, call):
+        return self._stations.get(call)
+
+    def most_recent(self, n):
+        with self._lock:
+            result = []
+            for station in reversed(self._stations.values()):
+                if len(result) == n:
+                    break
+                result.append(station)
+            return result
+
+    def most_active(self, n):
+        with self._lock:
+            result = []
+            for count in reversed(self._counts):
+                for station in reversed(self._buckets[count].values()):
+                    if len(result) == n:
+                        return result
+                    result.append(station)
+            return result
+
+    def recent_frames(self, n):
+        # Neueste zuerst: (Zeitpunkt, APRSPacket)
+        with self._lock:
+            result = []
+            pos = self._head
+            for _ in range(min(n, self.capacity)):
+                pos = (pos - 1) % self.capacity
+                entry = self._ring[pos]
+                if entry is None:
+                    break
+                result.append(entry)
+            return result
+
+    def rate(self, window=60.0, now=None):
+        # Pakete pro Minute innerhalb des Fensters (begrenzt durch den Ringpuffer)
+        now = time.time() if now is None else now
+        count = 0
+        for ts, _ in self.recent_frames(self.capacity):
+            if now - ts > window:
+                break
+            count += 1
+        return count * 60.0 / window
+
+    # === Interne Verwaltung ===
+    @staticmethod
+    def _count_digis(station, digis):
+        for digi in digis:
+            station.digis[digi] = station.digis.get(digi, 0) + 1
+
+    def _bucket(self, station):
+        bucket = self._buckets.get(station.count)
+        if bucket is None:
+            bucket = self._buckets[station.count] = OrderedDict()
+            insort(self._counts, station.count)
+        bucket[station.call] = station
+
+    def _unbucket(self, station):
+        bucket = self._buckets[station.count]
+        del bucket[station.call]
+        if not bucket:
+            del self._buckets[station.count]
+            del self._counts[bisect_left(self._counts, station.count)]
+
+    def _evict(self):
+        _, station = self._stations.popitem(last=False)
+        if station.position is not None:
+            self.geo.remove(station.call)
+        if station.count:
+            self._unbucket(station)
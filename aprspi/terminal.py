@@ -0,0 +1,117 @@
+# APRS Pi – Terminal-Renderer für die Konsolenversion
+#
+# Statt os.system("clear") und alles neu zu drucken hält Screen ein Abbild
+# des Bildschirms. Pro Frame wird jede Zeile mit dem Abbild verglichen und
+# nur der geänderte Spaltenbereich per ANSI-Cursorpositionierung neu
+# geschrieben, alles in einem einzigen write(). Bei geänderter
+# Terminalgröße wird einmal komplett neu gezeichnet.
+
+import os
+import sys
+import time
+import shutil
+from collections import deque
+
+CSI = "\x1b["
+CLEAR = CSI + "2J"
+ALT_SCREEN = CSI + "?1049h"
+MAIN_SCREEN = CSI + "?1049l"
+HIDE_CURSOR = CSI + "?25l"
+SHOW_CURSOR = CSI + "?25h"
+
+# Steuerzeichen aus empfangenen Paketen nie ans Terminal durchreichen
+_PRINTABLE = {i: "." for i in list(range(32)) + list(range(127, 160))}
+
+
+def printable(text):
+    return text.translate(_PRINTABLE)
+
+
+def changed_span(old, new):
+    # Erste und letzte abweichende Spalte zweier gleich langer Zeilen
+    first = len(os.path.commonprefix((old, new)))
+    last = len(new) - len(os.path.commonprefix((old[::-1], new[::-1])))
+    return first, last
+
+
+def layout(blocks, width, min_width=52):
+    # Seiten nebeneinander, wenn das Terminal breit genug ist; jede Seite
+    # kommt in die gerade kürzeste Spalte
+    count = max(1, min(len(blocks), width // min_width))
+    col_width = width // count
+    columns = [[] for _ in range(count)]
+    for block in blocks:
+        min(columns, key=len).extend(block)
+    rows = max(len(c) for c in columns)
+    return ["".join((c[i][:col_width - 1] if i < len(c) else "").ljust(col_width) for c in columns).rstrip()
+            for i in range(rows)]
+
+
+class Screen:
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        # Umleitung in Datei/Pipe: normale Ausgabe statt Cursorsteuerung
+        self.active = self.out.isatty()
+        self.size = None
+        self.rows = []
+        self.frames = 0
+        self.bytes_written = 0
+
+    def get_size(self):
+        return shutil.get_terminal_size()
+
+    def start(self):
+        if self.active:
+            self._write(ALT_SCREEN + HIDE_CURSOR)
+
+    def stop(self):
+        if self.active:
+            self._write(SHOW_CURSOR + MAIN_SCREEN)
+
+    def render(self, lines, size=None):
+        width, height = size or self.get_size()
+        parts = []
+        if (width, height) != self.size:
+            self.size = (width, height)
+            self.rows = [" " * width] * height
+            parts.append(CLEAR)
+        for y in range(height):
+            # Letzte Spalte der letzten Zeile frei lassen, sonst scrollt das Terminal
+            limit = width - 1 if y == height - 1 else width
+            # Zeilen enthalten Rufzeichen, Pfade und Text aus dem Funk: Steuerzeichen
+            # hier für alle Seiten entschärfen statt in jedem Aufrufer
+            line = printable((lines[y] if y < len(lines) else "")[:limit]).ljust(width)
+            old = self.rows[y]
+            if line == old:
+                continue
+            first, last = changed_span(old, line)
+            parts.append(f"{CSI}{y + 1};{first + 1}H{line[first:last]}")
+            self.rows[y] = line
+        self.frames += 1
+        if parts:
+            self._write("".join(parts))
+
+    def _write(self, text):
+        self.bytes_written += len(text)
+        self.out.write(text)
+        self.out.flush()
+
+
+class PacketPane:
+    # Laufende Liste empfangener Frames; add() passt als on_packet-Callback
+    def __init__(self, size=200):
+        self.lines = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, packet, own=False):
+        self.count += 1
+        mark = "*" if own else " "
+        self.lines.append(f"{time.strftime('%H:%M:%S')}{mark}{printable(str(packet.frame))}")
+
+    def render(self, height, width):
+        if height <= 0:
+            return []
+        title = f"=== Live-Pakete ({self.count}) "
+        lines = [title + "=" * max(0, min(width, 50) - len(title))]
+        lines.extend(list(self.lines)[-(height - 1):] if height > 1 else [])
+        return lines